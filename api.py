@@ -0,0 +1,467 @@
+# api.py
+"""
+Headless HTTP API for the calculations and the executive summary PDF.
+
+A plain ASGI application, so other tools get the numbers without the
+Streamlit UI. Inputs use the same keys as user_inputs.json.
+
+Endpoints:
+    GET  /health                   - status and report queue occupancy
+    POST /q1, /q2, /q3             - results of one question for one set of inputs
+    POST /q1/batch, /q2/batch, ... - results for a list of inputs, in one vectorized pass
+    POST /report                   - executive summary PDF, large reports are streamed from disk
+    GET  /metrics                  - span histograms in the Prometheus text format (TAC_METRICS=1)
+
+Calculations run on the event loop, large batches on a thread. PDFs are
+rendered on a bounded process pool: once `max_pending` reports are queued
+or rendering, /report answers 503 with Retry-After instead of queueing more.
+
+Usage:
+    python api.py --port 8000 --workers 4
+    uvicorn api:app             # configured with TAC_API_WORKERS and TAC_API_MAX_PENDING
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import metrics
+from utils.calculations import INPUT_KEYS, answered_questions, calculate_all, projection_months
+from utils.pdf_cache import get_pdf_cache, report_key
+from utils.pdf_generator import CHUNK_SIZE, SPOOL_MAX_BYTES, write_executive_summary
+from utils.simulation import DISTRIBUTIONS, MAX_SPREAD
+from utils.translations import LANGUAGES, format_number, get_text
+
+QUESTIONS = ('q1', 'q2', 'q3')
+
+# Largest accepted request body, and items in a batch request
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_ITEMS = 10_000
+
+# Batches up to this size are computed on the event loop, larger ones on a thread
+INLINE_BATCH_ITEMS = 1_000
+
+
+class HTTPError(Exception):
+    """
+    Raised by a handler to answer with an error status and message.
+    """
+
+    def __init__(self, status, message, headers=()):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = tuple(headers)
+
+
+def _number(value):
+    """
+    JSON-safe float: NaN and infinity (no break-even, no tests) become None.
+    """
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def _parse_inputs(item):
+    """
+    Validate a set of inputs from a request.
+
+    Args:
+        item (dict): Input values keyed as in user_inputs.json, missing keys count as 0
+
+    Returns:
+        dict: Numeric input values of INPUT_KEYS
+    """
+    if not isinstance(item, dict):
+        raise HTTPError(400, 'inputs must be a JSON object')
+    inputs = {}
+    for key in INPUT_KEYS:
+        value = item.get(key, 0)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise HTTPError(400, f'{key} must be a finite number')
+        inputs[key] = value
+    return inputs
+
+
+def _parse_settings(item):
+    """
+    Validate the uncertainty settings of a set of inputs from a request.
+
+    Args:
+        item (dict): Input values and settings keyed as in user_inputs.json
+
+    Returns:
+        dict: The settings given (see utils.simulation.SETTINGS_KEYS), validated
+    """
+    settings = {}
+    if 'simulation_spread' in item:
+        spread = item['simulation_spread']
+        if isinstance(spread, bool) or not isinstance(spread, (int, float)) or not 0 <= spread <= MAX_SPREAD:
+            raise HTTPError(400, f'simulation_spread must be a number from 0 to {MAX_SPREAD}')
+        settings['simulation_spread'] = spread
+    if 'simulation_distribution' in item:
+        distribution = item['simulation_distribution']
+        if distribution not in DISTRIBUTIONS:
+            raise HTTPError(400, f"simulation_distribution must be one of {', '.join(DISTRIBUTIONS)}")
+        settings['simulation_distribution'] = distribution
+    return settings
+
+
+def _message(language, question, result):
+    """
+    The result message shown on the question's page, in the given language.
+    """
+    if question == 'q1':
+        return get_text(language, 'question1', 'result_message').format(
+            time=format_number(result['time_savings'], 2, language))
+    if question == 'q2':
+        if result['runs_to_break_even'] is None:
+            return None
+        return get_text(language, 'question2', 'result_message').format(runs=result['runs_to_break_even'])
+    if result['potential'][0] is None:
+        return None
+    if not result['can_afford']:
+        return get_text(language, 'question3', 'warning_message')
+    return get_text(language, 'question3', 'success_message').format(count=int(result['tests_added_per_month']))
+
+
+def calculate(question, items, language=None):
+    """
+    Compute the results of one question for many sets of inputs at once.
+
+    Args:
+        question (str): 'q1', 'q2' or 'q3'
+        items (list): Validated inputs, see _parse_inputs
+        language (str): Also return the page's result message in this language, if given
+
+    Returns:
+        list: One result dict per item
+    """
+    if not items:
+        return []
+    # The projection covers the longest horizon asked for, each item gets its own months
+    horizons = [projection_months(item) for item in items]
+    columns = {key: [item[key] for item in items] for key in INPUT_KEYS}
+    results = calculate_all(columns, max(horizons) if question == 'q3' else 1)
+
+    answers = []
+    if question == 'q1':
+        for savings in results['q1_time_savings'].tolist():
+            answers.append({'time_savings': savings})
+    elif question == 'q2':
+        for runs in results['q2_runs_to_break_even'].tolist():
+            answers.append({'runs_to_break_even': int(runs) if math.isfinite(runs) else None})
+    else:
+        rows = results['q3_potential'].tolist()
+        for item, row, months in zip(items, rows, horizons):
+            potential = [_number(value) for value in row[:months]]
+            answers.append({
+                'potential': potential,
+                'can_afford': potential[0] is not None and potential[0] > 0,
+                'horizon_months': months,
+                'tests_added_per_month': item['q3_a'],
+            })
+    if language:
+        for answer in answers:
+            answer['message'] = _message(language, question, answer)
+    return answers
+
+
+def _render_report(language, inputs, with_charts, path):
+    """
+    Generate an executive summary in a worker process.
+
+    The PDF is written to a file rather than sent back to the service, so
+    it isn't copied between processes and can be streamed from disk.
+
+    Args:
+        path (str): File to write the PDF to
+    """
+    from utils.charts import build_questions_data
+
+    # Charts are descriptions, Matplotlib figures only live while a heatmap is rendered
+    questions_data = build_questions_data(language, inputs, with_charts)
+    with open(path, 'wb') as f:
+        write_executive_summary(language, questions_data, f, max_workers=1)
+
+
+class API:
+    """
+    The ASGI application.
+
+    Args:
+        workers (int): Processes rendering PDFs, defaults to the CPU count
+        max_pending (int): Reports queued or rendering at once before /report answers 503.
+            Defaults to 2 per worker
+    """
+
+    def __init__(self, workers=None, max_pending=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+        self._pending = 0
+        self._executor = None
+        self._routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/metrics'): self.metrics,
+            ('POST', '/report'): self.report,
+        }
+        for question in QUESTIONS:
+            self._routes['POST', f'/{question}'] = self._single(question)
+            self._routes['POST', f'/{question}/batch'] = self._batch(question)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                metrics.configure_from_environment()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def close(self):
+        """
+        Shut the PDF worker pool down.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def _http(self, scope, receive, send):
+        started = time.perf_counter()
+        method, path = scope['method'], scope['path'].rstrip('/') or '/'
+        handler = self._routes.get((method, path))
+        try:
+            if handler is None:
+                if any(route_path == path for _, route_path in self._routes):
+                    raise HTTPError(405, f'{method} not allowed on {path}')
+                raise HTTPError(404, f'no endpoint {path}')
+            body = await self._read_body(receive) if method == 'POST' else b''
+            status, content_type, payload, headers = await handler(body)
+        except HTTPError as e:
+            status, content_type, headers = e.status, 'application/json', e.headers
+            payload = json.dumps({'error': e.message}).encode('utf-8')
+        except Exception as e:
+            print(f"Error handling {method} {path}: {e}")
+            status, content_type, headers = 500, 'application/json', ()
+            payload = json.dumps({'error': 'internal error'}).encode('utf-8')
+
+        response_headers = [(b'content-type', content_type.encode('latin-1'))]
+        if isinstance(payload, bytes):
+            response_headers.append((b'content-length', str(len(payload)).encode('latin-1')))
+        response_headers.extend((name.encode('latin-1'), value.encode('latin-1')) for name, value in headers)
+        await send({'type': 'http.response.start', 'status': status, 'headers': response_headers})
+        if isinstance(payload, bytes):
+            await send({'type': 'http.response.body', 'body': payload})
+        else:
+            # An async generator of chunks, e.g. a large report streamed from disk
+            try:
+                async for chunk in payload:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                await send({'type': 'http.response.body', 'body': b''})
+            finally:
+                await payload.aclose()
+        metrics.record(f'api.{method} {path}' if handler else 'api.unrouted', time.perf_counter() - started)
+
+    async def _read_body(self, receive):
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                raise HTTPError(400, 'client disconnected')
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                raise HTTPError(413, f'request body larger than {MAX_BODY_BYTES} bytes')
+            chunks.append(chunk)
+            if not message.get('more_body', False):
+                return b''.join(chunks)
+
+    @staticmethod
+    def _json_body(body):
+        try:
+            return json.loads(body or b'{}')
+        except ValueError as e:
+            raise HTTPError(400, f'invalid JSON: {e}')
+
+    @staticmethod
+    def _json_response(payload, status=200):
+        return status, 'application/json', json.dumps(payload).encode('utf-8'), ()
+
+    @staticmethod
+    def _language(request):
+        language = request.get('language') if isinstance(request, dict) else None
+        if language is not None and language not in LANGUAGES:
+            raise HTTPError(400, f"unsupported language {language!r}, use one of {', '.join(LANGUAGES)}")
+        return language
+
+    # Endpoints
+
+    async def health(self, body):
+        return self._json_response({
+            'status': 'ok',
+            'reports_pending': self._pending,
+            'max_pending': self.max_pending,
+            'workers': self.workers,
+        })
+
+    async def metrics(self, body):
+        if not metrics.is_enabled():
+            raise HTTPError(404, 'metrics are disabled, set TAC_METRICS=1')
+        return 200, 'text/plain; version=0.0.4; charset=utf-8', metrics.prometheus_text().encode('utf-8'), ()
+
+    def _single(self, question):
+        async def handler(body):
+            """
+            Body: {<input key>: number, ..., 'language': optional language code}
+            """
+            request = self._json_body(body)
+            language = self._language(request)
+            return self._json_response(calculate(question, [_parse_inputs(request)], language)[0])
+        return handler
+
+    def _batch(self, question):
+        async def handler(body):
+            """
+            Body: {'items': [{<input key>: number, ...}, ...], 'language': optional language code}
+            """
+            request = self._json_body(body)
+            items = request.get('items') if isinstance(request, dict) else None
+            if not isinstance(items, list):
+                raise HTTPError(400, "body must be an object with an 'items' list")
+            if len(items) > MAX_BATCH_ITEMS:
+                raise HTTPError(413, f'at most {MAX_BATCH_ITEMS} items per batch')
+            language = self._language(request)
+            items = [_parse_inputs(item) for item in items]
+            if len(items) <= INLINE_BATCH_ITEMS:
+                results = calculate(question, items, language)
+            else:
+                # NumPy releases the GIL, so a thread keeps the event loop responsive
+                results = await asyncio.get_running_loop().run_in_executor(
+                    None, calculate, question, items, language)
+            return self._json_response({'results': results})
+        return handler
+
+    async def report(self, body):
+        """
+        Body: {'inputs': {<key>: value, ...}, 'language': 'en', 'charts': true}
+
+        The inputs may also hold the uncertainty settings (utils.simulation.SETTINGS_KEYS).
+        """
+        request = self._json_body(body)
+        if not isinstance(request, dict):
+            raise HTTPError(400, 'body must be a JSON object')
+        language = self._language(request) or 'en'
+        raw_inputs = request.get('inputs', {})
+        inputs = _parse_inputs(raw_inputs)
+        inputs.update(_parse_settings(raw_inputs))
+        with_charts = bool(request.get('charts', True))
+        if not any(answered_questions(inputs)):
+            raise HTTPError(422, 'no question is answered by these inputs')
+
+        headers = (('content-disposition', 'attachment; filename="executive_summary.pdf"'),)
+        cache_key = report_key(language, {**inputs, 'charts': with_charts})
+        pdf = get_pdf_cache().get(cache_key)
+        if pdf is not None:
+            return 200, 'application/pdf', pdf, headers
+
+        path = await self._render(language, inputs, with_charts)
+        size = os.path.getsize(path)
+        if size > SPOOL_MAX_BYTES:
+            # Large reports are streamed from disk instead of being held in memory and cached
+            return 200, 'application/pdf', _stream_file(path), headers + (('content-length', str(size)),)
+        try:
+            pdf = await asyncio.get_running_loop().run_in_executor(None, _read_file, path)
+        finally:
+            os.remove(path)
+        get_pdf_cache().put(cache_key, pdf)
+        return 200, 'application/pdf', pdf, headers
+
+    async def _render(self, language, inputs, with_charts):
+        # The event loop is single-threaded, so the counter needs no lock
+        if self._pending >= self.max_pending:
+            raise HTTPError(503, 'report queue is full, retry later', (('retry-after', '1'),))
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        fd, path = tempfile.mkstemp(prefix='report_', suffix='.pdf')
+        os.close(fd)
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, _render_report, language, inputs, with_charts, path)
+            return path
+        except BaseException:
+            os.remove(path)
+            raise
+        finally:
+            self._pending -= 1
+            metrics.record('api.report.render', time.perf_counter() - started)
+
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+async def _stream_file(path, chunk_size=CHUNK_SIZE):
+    """
+    Stream a report file in chunks and remove it afterwards.
+
+    The file is read on a thread, so the event loop keeps serving other
+    requests while the disk is busy.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = await loop.run_in_executor(None, f.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.remove(path)
+
+
+def _environment_int(name):
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+app = API(_environment_int('TAC_API_WORKERS'), _environment_int('TAC_API_MAX_PENDING'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the calculations and the PDF report over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='Port to listen on (default: 8000)')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='PDF worker processes (default: CPU count)')
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help='Reports queued or rendering before /report answers 503 (default: 2 per worker)')
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("Error: the API needs an ASGI server, install uvicorn")
+        return 1
+    uvicorn.run(API(args.workers, args.max_pending), host=args.host, port=args.port, log_level='warning')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
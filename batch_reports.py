@@ -0,0 +1,325 @@
+# batch_reports.py
+"""
+Headless batch generation of executive summary PDFs, one per team.
+
+The input is a CSV or JSONL file with one team per row/line, using the same
+keys as user_inputs.json plus a team id column. Reports are generated on a
+process pool and streamed into a directory or a zip file as they finish, so
+memory stays bounded regardless of the number of teams.
+
+With --portfolio, a single portfolio PDF covering all teams is written
+instead, with a table of contents, a roll-up table and one section per team.
+
+Usage:
+    python batch_reports.py teams.csv --output reports.zip --language en,de
+    python batch_reports.py teams.csv --portfolio --output portfolio.pdf
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from utils.calculations import INPUT_KEYS
+from utils.simulation import DISTRIBUTIONS, MAX_SPREAD
+from utils.translations import LANGUAGES
+
+
+def _parse_record(record, id_column, number):
+    """
+    Validate one row of a team file.
+
+    Returns:
+        tuple: (team_id, inputs)
+
+    Raises:
+        ValueError: With the reason the row is invalid
+    """
+    if not isinstance(record, dict):
+        raise ValueError('not an object')
+    team_id = str(record.get(id_column) or number)
+    inputs = {}
+    for key in INPUT_KEYS:
+        try:
+            inputs[key] = float(record.get(key) or 0)
+        except (TypeError, ValueError):
+            inputs[key] = math.nan
+        if not math.isfinite(inputs[key]):
+            raise ValueError(f"{key} {record.get(key)!r} is not a number")
+    if record.get('simulation_spread'):
+        try:
+            spread = float(record['simulation_spread'])
+        except (TypeError, ValueError):
+            spread = None
+        if spread is None or not 0 <= spread <= MAX_SPREAD:
+            raise ValueError(f"simulation_spread {record['simulation_spread']!r} is not a number from 0 to {MAX_SPREAD}")
+        inputs['simulation_spread'] = spread
+    if record.get('simulation_distribution'):
+        if record['simulation_distribution'] not in DISTRIBUTIONS:
+            raise ValueError(f"simulation_distribution {record['simulation_distribution']!r} "
+                             f"is not one of {', '.join(DISTRIBUTIONS)}")
+        inputs['simulation_distribution'] = record['simulation_distribution']
+    return team_id, inputs
+
+
+def read_teams(path, id_column='team', errors=None):
+    """
+    Lazily read team inputs from a CSV or JSONL file.
+
+    Args:
+        path (str): Input file, '.csv' or '.jsonl'
+        id_column (str): Column holding the team id, the row number is used if missing
+        errors (list): Invalid rows are skipped and (row number, reason) appended here.
+            If None, an invalid row raises ValueError
+
+    Yields:
+        tuple: (row number, team_id, inputs dict keyed as in user_inputs.json, with the uncertainty settings if given)
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            lines = csv.DictReader(f)
+        else:
+            lines = (line for line in f if line.strip())
+        for number, line in enumerate(lines, 1):
+            try:
+                record = line if isinstance(line, dict) else json.loads(line)
+                team_id, inputs = _parse_record(record, id_column, number)
+            except ValueError as e:
+                if errors is None:
+                    raise ValueError(f"row {number}: {e}") from None
+                errors.append((number, str(e)))
+                continue
+            yield number, team_id, inputs
+
+
+def _safe_filename(name):
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', name).strip('_') or 'team'
+
+
+def _unique_filename(team_id, number, used):
+    """
+    File name stem of a team's reports, unique among the names in `used` (lower case, updated).
+
+    Duplicate team ids, and ids that only differ in characters not allowed in
+    file names, get the row number appended.
+    """
+    base = _safe_filename(team_id)
+    name, suffix = base, 0
+    while name.lower() in used:
+        suffix += 1
+        name = f"{base}_row{number}" if suffix == 1 else f"{base}_row{number}_{suffix}"
+    used.add(name.lower())
+    return name
+
+
+def _generate_report(name, language, inputs, with_charts):
+    """
+    Generate one report in a worker process.
+
+    Returns:
+        tuple: (file name, PDF bytes), PDF bytes is None if no question was answered
+    """
+    from utils.charts import build_questions_data
+    from utils.pdf_generator import generate_executive_summary
+
+    filename = f"{name}_{language}.pdf"
+    questions_data = build_questions_data(language, inputs, with_charts)
+    if not questions_data:
+        return filename, None
+    pdf = generate_executive_summary(language, questions_data, max_workers=1).getvalue()
+    return filename, pdf
+
+
+class _DirectoryWriter:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, filename, data):
+        with open(os.path.join(self.path, filename), 'wb') as f:
+            f.write(data)
+
+    def close(self):
+        pass
+
+
+class _ZipWriter:
+    def __init__(self, path):
+        # PDFs are already compressed, so store them as they are
+        self._zip = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED)
+
+    def write(self, filename, data):
+        self._zip.writestr(filename, data)
+
+    def close(self):
+        self._zip.close()
+
+
+def generate_batch(input_path, output, languages=('en',), workers=None, id_column='team',
+                   with_charts=True, max_in_flight=None, progress=None):
+    """
+    Generate one report per team and language.
+
+    Args:
+        input_path (str): CSV or JSONL file with team inputs
+        output (str): Output directory, or a '.zip' file
+        languages (tuple): Language codes to generate each report in
+        workers (int): Worker processes, defaults to the CPU count
+        id_column (str): Column holding the team id
+        with_charts (bool): Include the charts in the reports
+        max_in_flight (int): Reports queued at once, bounds memory. Defaults to 4 per worker
+        progress (callable): Called with (reports done, seconds elapsed) after each report
+
+    Returns:
+        dict: {'reports': int, 'skipped': int, 'seconds': float, 'reports_per_second': float,
+            'invalid': [(row number, reason)] of rows left out,
+            'failed': [(team id, language, error)] of reports that could not be generated}
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    writer = _ZipWriter(output) if output.lower().endswith('.zip') else _DirectoryWriter(output)
+    done = skipped = 0
+    invalid, failed = [], []
+    used_names = set()
+    submitted = {}
+    started = time.perf_counter()
+
+    def collect(futures):
+        nonlocal done, skipped
+        for future in futures:
+            team_id, language = submitted.pop(future)
+            try:
+                filename, pdf = future.result()
+            except Exception as e:
+                # One failing team doesn't stop the batch
+                failed.append((team_id, language, f"{type(e).__name__}: {e}"))
+                continue
+            if pdf is None:
+                skipped += 1
+                continue
+            writer.write(filename, pdf)
+            done += 1
+            if progress:
+                progress(done, time.perf_counter() - started)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for number, team_id, inputs in read_teams(input_path, id_column, invalid):
+                name = _unique_filename(team_id, number, used_names)
+                for language in languages:
+                    if len(pending) >= max_in_flight:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(finished)
+                    future = executor.submit(_generate_report, name, language, inputs, with_charts)
+                    submitted[future] = (team_id, language)
+                    pending.add(future)
+            collect(pending)
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - started
+    return {
+        'reports': done,
+        'skipped': skipped,
+        'seconds': seconds,
+        'reports_per_second': done / seconds if seconds else 0.0,
+        'invalid': invalid,
+        'failed': failed,
+    }
+
+
+def generate_portfolio(input_path, output, languages=('en',), id_column='team'):
+    """
+    Generate one portfolio report of all teams per language.
+
+    Args:
+        input_path (str): CSV or JSONL file with team inputs
+        output (str): PDF file, '_<language>' is added to its name if there are several languages
+        languages (tuple): Language codes to generate the report in
+        id_column (str): Column holding the team id
+
+    Returns:
+        dict: {'reports': int, 'teams': int, 'seconds': float, 'files': list of paths,
+            'invalid': [(row number, reason)] of rows left out}
+    """
+    from utils.pdf_generator import generate_portfolio_report
+
+    invalid = []
+    teams = [(team_id, inputs) for _, team_id, inputs in read_teams(input_path, id_column, invalid)]
+    root, extension = os.path.splitext(output)
+    started = time.perf_counter()
+    files = []
+    for language in languages:
+        path = f"{root}_{language}{extension or '.pdf'}" if len(languages) > 1 else output
+        generate_portfolio_report(language, teams, path)
+        files.append(path)
+    return {
+        'reports': len(files),
+        'teams': len(teams),
+        'seconds': time.perf_counter() - started,
+        'files': files,
+        'invalid': invalid,
+    }
+
+
+def _report_problems(stats):
+    """
+    Print the invalid rows and failed reports of a run to stderr.
+
+    Returns:
+        bool: Whether there were any
+    """
+    for number, reason in stats['invalid']:
+        print(f"Skipped row {number}: {reason}", file=sys.stderr)
+    for team_id, language, error in stats.get('failed', ()):
+        print(f"Failed report of team {team_id!r} ({language}): {error}", file=sys.stderr)
+    return bool(stats['invalid'] or stats.get('failed'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate executive summary PDFs for many teams.')
+    parser.add_argument('input', help='CSV or JSONL file with one team per row, keys as in user_inputs.json')
+    parser.add_argument('-o', '--output', default='reports', help="Output directory or '.zip' file (default: reports), the PDF file with --portfolio (default: portfolio.pdf)")
+    parser.add_argument('-l', '--language', default='en',
+                        help=f"Comma separated languages or 'all' ({', '.join(LANGUAGES)}, default: en)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--id-column', default='team', help='Column with the team id (default: team)')
+    parser.add_argument('--no-charts', action='store_true', help='Leave the charts out of the reports')
+    parser.add_argument('--portfolio', action='store_true',
+                        help='Write one portfolio PDF of all teams to --output instead of one report per team')
+    args = parser.parse_args(argv)
+
+    languages = LANGUAGES if args.language == 'all' else tuple(args.language.split(','))
+    unknown = [language for language in languages if language not in LANGUAGES]
+    if unknown:
+        parser.error(f"unsupported language(s): {', '.join(unknown)}")
+
+    if args.portfolio:
+        output = 'portfolio.pdf' if args.output == parser.get_default('output') else args.output
+        stats = generate_portfolio(args.input, output, languages, args.id_column)
+        print(f"Portfolio of {stats['teams']} teams in {stats['seconds']:.1f} s: {', '.join(stats['files'])}")
+        if _report_problems(stats):
+            sys.exit(f"{len(stats['invalid'])} invalid rows left out")
+        return
+
+    def progress(done, seconds):
+        if done % 100 == 0:
+            print(f"{done} reports, {done / seconds:.1f} reports/s", file=sys.stderr)
+
+    stats = generate_batch(args.input, args.output, languages, args.workers, args.id_column,
+                           with_charts=not args.no_charts, progress=progress)
+    print(f"{stats['reports']} reports ({stats['skipped']} skipped without answered questions) "
+          f"in {stats['seconds']:.1f} s, {stats['reports_per_second']:.1f} reports/s")
+    if _report_problems(stats):
+        sys.exit(f"{len(stats['invalid'])} invalid rows left out, {len(stats['failed'])} reports failed")
+
+
+if __name__ == '__main__':
+    main()
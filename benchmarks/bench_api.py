@@ -0,0 +1,108 @@
+# bench_api.py
+"""
+Benchmark for the HTTP API (api.py), called in-process through its ASGI
+interface so the numbers exclude the network and the server.
+
+Measures requests/s of the single calculation endpoints, items/s of the
+batch endpoints and reports/s of /report with concurrent clients, the PDF
+cache disabled, for 1 worker process up to the CPU count.
+
+Run from the repository root:
+    python -m benchmarks.bench_api [requests]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+os.environ['TAC_PDF_CACHE_ENTRIES'] = '0'
+
+from api import API
+
+SAMPLE_INPUTS = {
+    'q1_manual_test_execution_time': 10,
+    'q1_automated_test_execution_time_min': 10,
+    'q2_initial_investment': 160,
+    'q2_time_savings_per_run': 8,
+    'q3_th': 10,
+    'q3_mt': 5,
+    'q3_n': 50,
+    'q3_a': 10,
+}
+
+
+async def _request(app, path, payload):
+    """
+    Send one POST request and return the response status.
+    """
+    messages = [{'type': 'http.request', 'body': json.dumps(payload).encode('utf-8'), 'more_body': False}]
+    status = None
+
+    async def receive():
+        return messages.pop() if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await app({'type': 'http', 'method': 'POST', 'path': path}, receive, send)
+    return status
+
+
+async def _calculations(requests):
+    app = API(workers=1)
+    results = {}
+    for question in ('q1', 'q2', 'q3'):
+        start = time.perf_counter()
+        for _ in range(requests):
+            await _request(app, f'/{question}', SAMPLE_INPUTS)
+        results[f'/{question}'] = requests / (time.perf_counter() - start)
+    items = [SAMPLE_INPUTS] * 10_000
+    for question in ('q1', 'q2', 'q3'):
+        start = time.perf_counter()
+        await _request(app, f'/{question}/batch', {'items': items})
+        results[f'/{question}/batch'] = len(items) / (time.perf_counter() - start)
+    return results
+
+
+async def _reports(workers, reports):
+    """
+    Reports/s with 2 concurrent clients per worker, retrying on 503.
+    """
+    app = API(workers=workers)
+    # Warm-up: starts the worker processes
+    await asyncio.gather(*(_request(app, '/report', {'inputs': SAMPLE_INPUTS}) for _ in range(workers)))
+    remaining = reports
+    rejected = 0
+
+    async def client(number):
+        nonlocal remaining, rejected
+        while remaining > 0:
+            remaining -= 1
+            # Distinct inputs, so nothing is served from a cache
+            inputs = {**SAMPLE_INPUTS, 'q3_a': 10 + number + remaining}
+            while await _request(app, '/report', {'inputs': inputs}) == 503:
+                rejected += 1
+                await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(workers * 2)))
+    seconds = time.perf_counter() - start
+    app.close()
+    return reports / seconds, rejected
+
+
+def main(requests=2000, reports=20):
+    for endpoint, rate in asyncio.run(_calculations(requests)).items():
+        unit = 'items/s' if endpoint.endswith('/batch') else 'requests/s'
+        print(f"{endpoint:10} {rate:12,.0f} {unit}")
+    for workers in sorted({1, os.cpu_count() or 1}):
+        rate, rejected = asyncio.run(_reports(workers, reports))
+        print(f"/report    {rate:12.1f} reports/s with {workers} worker(s), {rejected} rejected with 503")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,59 @@
+# bench_calculations.py
+"""
+Benchmark for the vectorized calculation engine.
+
+Run from the repository root:
+    python -m benchmarks.bench_calculations [scenarios]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from utils.calculations import calculate_all
+
+
+def make_inputs(count, seed=0):
+    """
+    Build a columnar table of random but plausible inputs.
+
+    Args:
+        count (int): Number of scenarios
+        seed (int): Random seed
+
+    Returns:
+        dict: Input key -> numpy array
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        'q1_manual_test_execution_time': rng.uniform(1, 100, count),
+        'q1_automated_test_execution_time_min': rng.uniform(1, 600, count),
+        'q2_initial_investment': rng.uniform(10, 5000, count),
+        'q2_time_savings_per_run': rng.uniform(0, 50, count),
+        'q3_th': rng.uniform(0, 200, count),
+        'q3_mt': rng.uniform(0, 150, count),
+        'q3_n': rng.integers(0, 5000, count),
+        'q3_a': rng.integers(0, 500, count),
+    }
+
+
+def run(count=1_000_000, repeats=5):
+    """
+    Time calculate_all over `count` scenarios and return the best run in seconds.
+    """
+    inputs = make_inputs(count)
+    calculate_all(inputs)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        calculate_all(inputs)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    best = run(count)
+    print(f"calculate_all: {count:,} scenarios in {best * 1000:.1f} ms "
+          f"({count / best:,.0f} scenarios/s)")
@@ -0,0 +1,103 @@
+# bench_figures.py
+"""
+Soak benchmark for the Matplotlib figure lifecycle: resident memory (RSS)
+over many Question 3 page reruns.
+
+Every rerun builds the Question 3 chart for new inputs and draws it, as the
+page does when its inputs change (memoization doesn't apply). Compared:
+    - figures from utils.figures, released after drawing, for all reruns
+    - pyplot figures that are never closed, as the charts used to be built,
+      for at most 200 reruns since their memory grows without bound
+RSS is sampled ten times per run; with released figures it stays flat.
+
+Run from the repository root:
+    python -m benchmarks.bench_figures [reruns]
+"""
+
+import os
+import resource
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+
+from utils.chart_specs import q3_chart
+from utils.charts import matplotlib_figure
+from utils.figures import release_figure
+
+# Reruns of the pyplot mode, which keeps every figure
+LEAKING_RERUNS = 200
+
+
+def rss_mb():
+    """
+    Current resident set size in MB (the peak where /proc is not available).
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def _spec(rerun):
+    # New inputs every rerun, like a user changing the Question 3 inputs
+    return q3_chart('en', [60 - (4 + rerun % 7) * month for month in range(12)], (2026, 1))
+
+
+def _released(rerun):
+    fig = matplotlib_figure(_spec(rerun))
+    try:
+        fig.canvas.draw()
+    finally:
+        release_figure(fig)
+
+
+def _pyplot_not_closed(rerun):
+    import matplotlib.pyplot as plt
+    spec = _spec(rerun)
+    fig, ax = plt.subplots()
+    series = spec['series'][0]
+    ax.plot(series['x'], series['y'], marker='o')
+    ax.set_xticks(spec['x_ticks']['positions'])
+    ax.set_xticklabels(spec['x_ticks']['labels'])
+    ax.set_xlabel(spec['x_title'])
+    ax.set_ylabel(spec['y_title'])
+    ax.grid(True)
+    fig.canvas.draw()
+
+
+def soak(rerun, reruns):
+    """
+    Return [(reruns done, RSS MB)] sampled ten times, and the seconds per rerun.
+    """
+    # Warm-up: fonts, caches and the first Agg renderer
+    for number in range(3):
+        _released(number)
+    samples = [(0, rss_mb())]
+    every = max(reruns // 10, 1)
+    start = time.perf_counter()
+    for number in range(1, reruns + 1):
+        rerun(number)
+        if number % every == 0:
+            samples.append((number, rss_mb()))
+    return samples, (time.perf_counter() - start) / reruns
+
+
+def main(reruns=10_000):
+    import warnings
+    # pyplot warns once more than 20 figures are open, which is the point here
+    warnings.filterwarnings('ignore', message='More than 20 figures')
+    for name, rerun, count in (('released figures', _released, reruns),
+                               ('pyplot, never closed', _pyplot_not_closed, min(reruns, LEAKING_RERUNS))):
+        samples, seconds = soak(rerun, count)
+        print(f"{name}: {count} reruns, {seconds * 1000:.1f} ms/rerun")
+        for done, rss in samples:
+            print(f"  {done:6} reruns {rss:8.1f} MB")
+        growth = (samples[-1][1] - samples[1][1]) / max(samples[-1][0] - samples[1][0], 1)
+        print(f"  growth after the first sample: {growth * 1000:.1f} KB/rerun")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
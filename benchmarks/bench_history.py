@@ -0,0 +1,111 @@
+# bench_history.py
+"""
+Benchmark for the scenario history (utils.history): appends per second, and
+the latency of listing, loading, comparing and restoring versions as the
+history grows, plus the time and effect of a compaction.
+
+The history is filled with input sets of 1000 namespaces. Lookups pick
+random versions and namespaces; their latency should stay flat from 1k to
+200k versions, since the index is read by position and listing follows the
+previous-version links.
+
+Run from the repository root:
+    python -m benchmarks.bench_history [versions]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from utils.calculations import INPUT_KEYS
+from utils.history import ScenarioHistory
+
+NAMESPACES = 1000
+LOOKUPS = 2000
+
+# Versions per namespace kept by the compaction
+KEEP = 100
+
+
+def _values(rng):
+    return {key: rng.randint(1, 200) for key in INPUT_KEYS}
+
+
+def _lookups(history, rng):
+    """
+    Mean seconds of versions(), load(), compare() and a restore (load + record) of random versions.
+    """
+    timings = {}
+    namespaces = [f'session-{rng.randrange(NAMESPACES)}' for _ in range(LOOKUPS)]
+
+    start = time.perf_counter()
+    listed = [history.versions(namespace, limit=20) for namespace in namespaces]
+    timings['list 20'] = (time.perf_counter() - start) / LOOKUPS
+
+    picks = [(namespace, rng.choice(items)['version'], rng.choice(items)['version'])
+             for namespace, items in zip(namespaces, listed) if items]
+    start = time.perf_counter()
+    for namespace, version, _ in picks:
+        history.load(version, namespace)
+    timings['load'] = (time.perf_counter() - start) / len(picks)
+
+    start = time.perf_counter()
+    for namespace, version_a, version_b in picks:
+        history.compare(version_a, version_b, namespace)
+    timings['compare'] = (time.perf_counter() - start) / len(picks)
+
+    # Restores add versions, so time only a few and leave the size all but unchanged
+    restores = picks[:100]
+    start = time.perf_counter()
+    for namespace, version, _ in restores:
+        history.record(namespace, history.load(version, namespace)['values'])
+    timings['restore'] = (time.perf_counter() - start) / len(restores)
+    return timings
+
+
+def run(versions=200_000, keep=KEEP):
+    """
+    Fill a history to `versions` and time lookups at sizes along the way.
+
+    Returns:
+        tuple: ({size: {operation: seconds}}, appends/s, compaction results)
+    """
+    rng = random.Random(0)
+    sizes = [size for size in (1_000, 10_000, 100_000) if size < versions] + [versions]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # No compaction while filling, so the sizes are what they claim to be
+        history = ScenarioHistory(os.path.join(tmp_dir, 'scenario_history.log'), max_bytes=1 << 62, keep=keep,
+                                  max_versions=1 << 62)
+        appended = 0
+        append_seconds = 0.0
+        for size in sizes:
+            start = time.perf_counter()
+            while history.get_stats()['last'] < size:
+                history.record(f'session-{rng.randrange(NAMESPACES)}', _values(rng))
+                appended += 1
+            append_seconds += time.perf_counter() - start
+            results[size] = _lookups(history, rng)
+
+        before = history.get_stats()['log_bytes']
+        start = time.perf_counter()
+        dropped = history.compact()
+        compaction = {'seconds': time.perf_counter() - start, 'dropped': dropped,
+                      'log_before': before, 'log_after': history.get_stats()['log_bytes']}
+        history.close()
+    return results, appended / append_seconds, compaction
+
+
+if __name__ == '__main__':
+    versions = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    results, appends, compaction = run(versions)
+    print(f"appends: {appends:,.0f}/s")
+    operations = list(next(iter(results.values())))
+    print(f"{'versions':>9} " + ' '.join(f"{name:>10}" for name in operations))
+    for size, timings in results.items():
+        print(f"{size:>9,} " + ' '.join(f"{timings[name] * 1e6:8.1f}us" for name in operations))
+    print(f"compaction to {KEEP} versions per namespace: {compaction['dropped']:,} versions dropped, "
+          f"log {compaction['log_before'] / 1e6:.1f} MB -> {compaction['log_after'] / 1e6:.1f} MB "
+          f"in {compaction['seconds']:.2f} s")
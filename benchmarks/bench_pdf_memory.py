@@ -0,0 +1,94 @@
+# bench_pdf_memory.py
+"""
+Benchmark for the peak memory of writing a report in memory vs. to a file.
+
+Builds 1-page and 500-page documents with the flowables of the executive
+summary (headings, paragraphs and result tables) and writes them
+    - into a BytesIO and copies out the bytes, as a download used to,
+    - into a spooled file (utils.pdf_generator.spooled_file) and streams it in chunks,
+    - into a file on disk and streams it in chunks.
+Peak memory is measured with tracemalloc and includes ReportLab's own
+copy of the document, which it assembles in memory before writing it.
+
+Run from the repository root:
+    python -m benchmarks.bench_pdf_memory [pages ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Table, TableStyle
+
+from utils.pdf_generator import iter_chunks, spooled_file
+
+
+def _elements(pages):
+    styles = getSampleStyleSheet()
+    elements = []
+    for page in range(pages):
+        elements.append(Paragraph(f"Team {page + 1}", styles['Heading2']))
+        elements.append(Paragraph("Results of the three questions for this team. " * 20, styles['Normal']))
+        rows = [['Month', 'Potential', 'Runs', 'Hours saved']]
+        rows += [[str(month), f"{60 - 4 * month:.2f}", str(50 + month), f"{9.5 + month / 10:.2f}"] for month in range(24)]
+        table = Table(rows)
+        table.setStyle(TableStyle([('GRID', (0, 0), (-1, -1), 0.5, colors.grey)]))
+        elements.append(table)
+        elements.append(PageBreak())
+    return elements
+
+
+def _in_memory(pages):
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, pagesize=letter).build(_elements(pages))
+    data = buffer.getvalue()
+    return len(data)
+
+
+def _spooled(pages):
+    with spooled_file() as f:
+        SimpleDocTemplate(f, pagesize=letter).build(_elements(pages))
+        f.seek(0)
+        return sum(len(chunk) for chunk in iter_chunks(f))
+
+
+def _on_disk(pages):
+    fd, path = tempfile.mkstemp(suffix='.pdf')
+    os.close(fd)
+    try:
+        SimpleDocTemplate(path, pagesize=letter).build(_elements(pages))
+        with open(path, 'rb') as f:
+            return sum(len(chunk) for chunk in iter_chunks(f))
+    finally:
+        os.remove(path)
+
+
+MODES = {'BytesIO + getvalue': _in_memory, 'spooled file': _spooled, 'file on disk': _on_disk}
+
+
+def measure(mode, pages):
+    """
+    Return {'seconds', 'size_mb', 'peak_mb'} of writing one document.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = MODES[mode](pages)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': seconds, 'size_mb': size / 1e6, 'peak_mb': peak / 1e6}
+
+
+if __name__ == '__main__':
+    page_counts = [int(pages) for pages in sys.argv[1:]] or [1, 500]
+    print(f"{'pages':>5} {'output':20} {'size':>9} {'peak':>9} {'time':>8}")
+    for pages in page_counts:
+        for mode in MODES:
+            result = measure(mode, pages)
+            print(f"{pages:5} {mode:20} {result['size_mb']:7.2f}MB {result['peak_mb']:7.1f}MB {result['seconds']:7.2f}s")
@@ -0,0 +1,91 @@
+# bench_persistence.py
+"""
+Benchmark for utils.persistence reads.
+
+Simulates the get_value calls of one home page rerun and compares the cached
+JSON store and the SQLite backend with the previous read-per-key behaviour
+(open + json.load per call).
+
+Run from the repository root:
+    python -m benchmarks.bench_persistence [reruns]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from utils import history, persistence
+from utils.calculations import INPUT_KEYS
+from utils.storage import JsonFileBackend, SQLiteBackend
+
+# home.show reads the has_*_data keys first, then every input for the report
+RERUN_KEYS = [
+    'q1_manual_test_execution_time', 'q1_automated_test_execution_time_min',
+    'q2_initial_investment', 'q2_time_savings_per_run', 'q3_n',
+] + list(INPUT_KEYS)
+
+
+def _legacy_reader(path):
+    """
+    get_value as implemented before the in-process cache.
+    """
+    def get_value(key, default=0):
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                data = {}
+        else:
+            data = {}
+        return data.get(key, default)
+    return get_value
+
+
+def _time_reruns(get_value, reruns):
+    start = time.perf_counter()
+    for _ in range(reruns):
+        for key in RERUN_KEYS:
+            get_value(key, 0)
+    return (time.perf_counter() - start) / reruns
+
+
+def run(reruns=2000):
+    """
+    Return mean seconds per simulated rerun for each store, and the cache counters.
+    """
+    values = {key: 10 for key in INPUT_KEYS}
+    original_backend = persistence.get_backend()
+    original_history = history.get_history()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, 'user_inputs.json')
+        temporary_history = history.ScenarioHistory(os.path.join(tmp_dir, 'scenario_history.log'))
+        try:
+            history.set_history(temporary_history)
+            persistence.set_backend(JsonFileBackend(json_path))
+            persistence.save_data(values)
+            results['read-per-key'] = _time_reruns(_legacy_reader(json_path), reruns)
+            persistence.reset_cache_stats()
+            results['json cached'] = _time_reruns(persistence.get_value, reruns)
+            stats = persistence.get_cache_stats()
+
+            persistence.set_backend(SQLiteBackend(os.path.join(tmp_dir, 'user_inputs.db')))
+            persistence.save_data(values)
+            results['sqlite'] = _time_reruns(persistence.get_value, reruns)
+        finally:
+            persistence.set_backend(original_backend)
+            history.set_history(original_history)
+            temporary_history.close()
+    return results, stats
+
+
+if __name__ == '__main__':
+    reruns = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    results, stats = run(reruns)
+    legacy = results['read-per-key']
+    for name, seconds in results.items():
+        print(f"{name:13} {seconds * 1e6:8.1f} us/rerun ({legacy / seconds:.1f}x)")
+    print(f"json cache hits: {stats['hits']}, misses: {stats['misses']}")
@@ -0,0 +1,64 @@
+# bench_portfolio.py
+"""
+Benchmark for the portfolio report: pages per second for 10 to 1000 teams.
+
+The layout cost per page should stay about the same as the portfolio
+grows: results are computed in one pass, styles are built once, and the
+table of contents is laid out at its final length from the first pass.
+
+Run from the repository root:
+    python -m benchmarks.bench_portfolio [teams ...]
+"""
+
+import re
+import sys
+import time
+
+import numpy as np
+
+from utils.pdf_generator import generate_portfolio_report
+
+PAGE_OBJECT = re.compile(rb'/Type /Page\b(?!s)')
+
+
+def sample_teams(count, seed=0):
+    """
+    Return (team id, inputs) of `count` teams with random inputs answering all questions.
+    """
+    rng = np.random.default_rng(seed)
+    teams = []
+    for number in range(count):
+        teams.append((f"Team {number + 1}", {
+            'q1_manual_test_execution_time': int(rng.integers(1, 20)),
+            'q1_automated_test_execution_time_min': int(rng.integers(1, 60)),
+            'q2_initial_investment': int(rng.integers(1, 500)),
+            'q2_time_savings_per_run': int(rng.integers(1, 10)),
+            'q3_th': int(rng.integers(0, 200)),
+            'q3_mt': int(rng.integers(0, 100)),
+            'q3_n': int(rng.integers(1, 80)),
+            'q3_a': int(rng.integers(0, 10)),
+            'q3_horizon_months': int(rng.choice([6, 12, 24])),
+        }))
+    return teams
+
+
+def run(count, language='en'):
+    """
+    Return {'seconds', 'pages', 'pages_per_second'} of one portfolio report.
+    """
+    teams = sample_teams(count)
+    start = time.perf_counter()
+    pdf = generate_portfolio_report(language, teams).getvalue()
+    seconds = time.perf_counter() - start
+    pages = len(PAGE_OBJECT.findall(pdf))
+    return {'seconds': seconds, 'pages': pages, 'pages_per_second': pages / seconds}
+
+
+if __name__ == '__main__':
+    counts = [int(count) for count in sys.argv[1:]] or [10, 100, 1000]
+    # Warm-up: imports, fonts and styles
+    run(1)
+    print(f"{'teams':>6} {'pages':>6} {'time':>8} {'pages/s':>8}")
+    for count in counts:
+        result = run(count)
+        print(f"{count:6} {result['pages']:6} {result['seconds']:7.2f}s {result['pages_per_second']:8.1f}")
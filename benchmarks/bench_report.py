@@ -0,0 +1,50 @@
+# bench_report.py
+"""
+Benchmark for end-to-end executive summary generation with 1, 2 and 3
+chart conversion workers.
+
+Run from the repository root:
+    python -m benchmarks.bench_report [repeats]
+"""
+
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+
+from utils.charts import build_questions_data
+from utils.pdf_generator import generate_executive_summary
+
+SAMPLE_INPUTS = {
+    'q1_manual_test_execution_time': 10,
+    'q1_automated_test_execution_time_min': 10,
+    'q2_initial_investment': 160,
+    'q2_time_savings_per_run': 8,
+    'q3_th': 10,
+    'q3_mt': 5,
+    'q3_n': 50,
+    'q3_a': 10,
+}
+
+
+def run(repeats=5, workers=(1, 2, 3), language='en'):
+    """
+    Return the mean seconds per report for each worker count.
+    """
+    questions_data = build_questions_data(language, SAMPLE_INPUTS)
+    # Warm-up: loads fonts and the Matplotlib backend
+    generate_executive_summary(language, questions_data)
+    results = {}
+    for max_workers in workers:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            generate_executive_summary(language, questions_data, max_workers=max_workers)
+        results[max_workers] = (time.perf_counter() - start) / repeats
+    return results
+
+
+if __name__ == '__main__':
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for max_workers, seconds in run(repeats).items():
+        print(f"max_workers={max_workers}: {seconds * 1000:8.1f} ms/report")
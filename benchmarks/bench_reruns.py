@@ -0,0 +1,72 @@
+# bench_reruns.py
+"""
+Benchmark for Streamlit reruns: time of each page rerun with unchanged
+inputs, with memoization of results and figures on and off. The pages read
+the suite's sample inputs from a temporary store, so the saved inputs and
+history are neither changed nor timed.
+
+Run from the repository root:
+    python -m benchmarks.bench_reruns
+"""
+
+import os
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.suite import SAMPLE_INPUTS, _temporary_backend
+from questions import PAGES
+from utils import memo
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, 'test_automation_calculations.py')
+
+REPEAT = 20
+
+
+def page_reruns(page, repeat=REPEAT):
+    """
+    Open `page` in a fresh AppTest session and time `repeat` reruns of it.
+
+    Returns:
+        dict: {'mean': seconds, 'median': seconds}
+    """
+    at = AppTest.from_file(SCRIPT, default_timeout=120)
+    at.run()
+    index = list(PAGES).index(page)
+    at.sidebar.radio[0].set_value(at.sidebar.radio[0].options[index]).run()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - start)
+    return {'mean': statistics.mean(timings), 'median': statistics.median(timings)}
+
+
+def run(repeat=REPEAT):
+    """
+    Return {page: {'memoized': {...}, 'uncached': {...}}}.
+    """
+    results = {}
+    with _temporary_backend('json', 0) as persistence:
+        persistence.save_data(SAMPLE_INPUTS)
+        try:
+            for page in PAGES:
+                results[page] = {}
+                for label, enabled in (('uncached', False), ('memoized', True)):
+                    memo.set_enabled(enabled)
+                    memo.clear_all()
+                    results[page][label] = page_reruns(page, repeat)
+        finally:
+            memo.set_enabled(True)
+    return results
+
+
+if __name__ == '__main__':
+    print(f"{'page':10} {'uncached':>10} {'memoized':>10} {'speedup':>8}")
+    for page, timings in run().items():
+        uncached = timings['uncached']['median']
+        memoized = timings['memoized']['median']
+        print(f"{page:10} {uncached * 1000:8.1f}ms {memoized * 1000:8.1f}ms {uncached / memoized:7.1f}x")
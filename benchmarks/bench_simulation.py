@@ -0,0 +1,53 @@
+# bench_simulation.py
+"""
+Benchmark for the Monte Carlo engine: samples per second and peak memory of
+utils.simulation.simulate for growing sample counts and projection horizons.
+
+Run from the repository root:
+    python -m benchmarks.bench_simulation [--samples 1000000]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from utils.simulation import DISTRIBUTIONS, simulate, spread_distributions
+
+INPUTS = {
+    'q1_manual_test_execution_time': 10,
+    'q1_automated_test_execution_time_min': 10,
+    'q2_initial_investment': 100,
+    'q2_time_savings_per_run': 2,
+    'q3_th': 100,
+    'q3_mt': 40,
+    'q3_n': 50,
+    'q3_a': 5,
+}
+
+
+def run(samples, months, distribution='triangular'):
+    """
+    Return {'seconds': s, 'samples_per_second': n, 'peak_mb': mb} of one simulation.
+    """
+    distributions = spread_distributions(INPUTS, distribution, 0.3)
+    tracemalloc.start()
+    start = time.perf_counter()
+    simulate(INPUTS, distributions, samples, months)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': seconds, 'samples_per_second': samples / seconds, 'peak_mb': peak / 1e6}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--samples', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{'distribution':12} {'samples':>10} {'months':>6} {'time':>9} {'samples/s':>12} {'peak':>9}")
+    for distribution in DISTRIBUTIONS:
+        for samples in (args.samples // 100, args.samples // 10, args.samples):
+            for months in (6, 120):
+                result = run(samples, months, distribution)
+                print(f"{distribution:12} {samples:10d} {months:6d} {result['seconds']:8.2f}s "
+                      f"{result['samples_per_second']:12,.0f} {result['peak_mb']:7.1f}MB")
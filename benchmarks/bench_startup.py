@@ -0,0 +1,113 @@
+# bench_startup.py
+"""
+Benchmark for app cold start: import time of each page module (measured with
+`python -X importtime` in a fresh interpreter) and the first-render latency
+of each page in a fresh Streamlit AppTest session. The pages read the suite's
+sample inputs from a temporary store, so the saved inputs and history are
+neither changed nor timed. Also checks that pages
+don't load libraries they don't draw with (see UNEXPECTED_LIBRARIES) and
+exits with status 1 if one does.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from questions import PAGES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries a page must not load on its first render: Matplotlib is only needed by the
+# Q3 chart and the sensitivity heatmaps, ReportLab only by the report export
+UNEXPECTED_LIBRARIES = {
+    'home': ('matplotlib', 'reportlab'),
+    'question1': ('matplotlib', 'reportlab'),
+}
+
+# Runs in a fresh interpreter: opens the app, switches to one page and times that rerun
+_FIRST_RENDER_SCRIPT = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+from benchmarks.suite import SAMPLE_INPUTS, _temporary_backend
+from questions import PAGES
+page = sys.argv[1]
+with _temporary_backend('json', 0) as persistence:
+    persistence.save_data(SAMPLE_INPUTS)
+    at = AppTest.from_file('test_automation_calculations.py', default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    startup = time.perf_counter() - start
+    index = list(PAGES).index(page)
+    start = time.perf_counter()
+    at.sidebar.radio[0].set_value(at.sidebar.radio[0].options[index]).run()
+    first_render = time.perf_counter() - start
+loaded = [name for name in ('matplotlib', 'plotly', 'reportlab') if name in sys.modules]
+print(json.dumps({'startup': startup, 'first_render': first_render, 'loaded': loaded}))
+"""
+
+
+def import_time(module):
+    """
+    Cumulative import time of a module in a fresh interpreter.
+
+    Returns:
+        float: Seconds, as reported by -X importtime
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"; top-level entries aren't indented
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):
+            total_us += int(cumulative)
+    return total_us / 1e6
+
+
+def first_render(page):
+    """
+    App startup (home) and first render of `page` in a fresh interpreter.
+
+    Returns:
+        dict: {'startup': seconds, 'first_render': seconds, 'loaded': heavy libraries imported by then}
+    """
+    result = subprocess.run([sys.executable, '-c', _FIRST_RENDER_SCRIPT, page],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run():
+    """
+    Return {page: {'import': s, 'startup': s, 'first_render': s, 'loaded': [library]}}.
+    """
+    results = {}
+    for page in PAGES:
+        results[page] = {'import': import_time(f'questions.{page}'), **first_render(page)}
+    return results
+
+
+def unexpected_libraries(results):
+    """
+    Returns:
+        list: (page, library) for libraries loaded by pages that shouldn't load them
+    """
+    return [(page, library) for page, timings in results.items()
+            for library in UNEXPECTED_LIBRARIES.get(page, ()) if library in timings['loaded']]
+
+
+if __name__ == '__main__':
+    results = run()
+    print(f"{'page':10} {'import':>10} {'app start':>10} {'first render':>13}  loaded")
+    for page, timings in results.items():
+        print(f"{page:10} {timings['import'] * 1000:8.0f}ms {timings['startup'] * 1000:8.0f}ms "
+              f"{timings['first_render'] * 1000:11.0f}ms  {', '.join(timings['loaded'])}")
+    unexpected = unexpected_libraries(results)
+    for page, library in unexpected:
+        print(f"Error: the {page} page loads {library}", file=sys.stderr)
+    sys.exit(1 if unexpected else 0)
@@ -0,0 +1,372 @@
+# suite.py
+"""
+Benchmark suite for regression checks across commits.
+
+Times the hot paths of the app: the calculation engine, persistence reads
+and writes for growing key counts, chart conversion for the PDF, executive
+summary generation per language and full page reruns with Streamlit's
+AppTest. Results can be written as JSON, stored as a named baseline and
+compared against one; the comparison fails (exit status 1) when a case's
+median time grows by more than the threshold.
+
+Run from the repository root:
+    python -m benchmarks.suite                          # run and print
+    python -m benchmarks.suite --save-baseline main     # store benchmarks/baselines/main.json
+    python -m benchmarks.suite --compare main --threshold 20
+    python -m benchmarks.suite -k persistence --json results.json
+
+Baselines are machine specific and not committed: store one on the machine
+that runs --compare, and store it again after an intended speed change. A
+missing baseline, or one sharing no timed case with the run, fails with
+exit status 2.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINES_DIR = os.path.join(ROOT, 'benchmarks', 'baselines')
+
+DEFAULT_THRESHOLD = 20.0
+
+# Inputs answering all three questions, used by the chart, PDF and rerun cases
+SAMPLE_INPUTS = {
+    'q1_manual_test_execution_time': 10,
+    'q1_automated_test_execution_time_min': 10,
+    'q2_initial_investment': 100,
+    'q2_time_savings_per_run': 2,
+    'q3_th': 100,
+    'q3_mt': 40,
+    'q3_n': 50,
+    'q3_a': 5,
+}
+
+_CASES = []
+
+
+class SkipCase(Exception):
+    """
+    Raised by a case setup when the case can't run in this environment.
+    """
+
+
+def case(name, repeat=20):
+    """
+    Register a benchmark case.
+
+    The decorated function is a generator: it sets the case up, yields the
+    zero-argument function to time and cleans up after the yield.
+
+    Args:
+        name (str): Case name, stable across commits so baselines can be compared
+        repeat (int): Number of timed calls
+    """
+    def decorator(setup):
+        _CASES.append((name, repeat, contextmanager(setup)))
+        return setup
+    return decorator
+
+
+# Calculations
+
+@case('calculations.calculate_all[100k]')
+def _calculate_all():
+    from utils.calculations import INPUT_KEYS, calculate_all
+    rng = np.random.default_rng(0)
+    inputs = {key: rng.uniform(1, 100, 100_000) for key in INPUT_KEYS}
+    yield lambda: calculate_all(inputs)
+
+
+@case('calculations.maintenance_potential[100k x 120]')
+def _maintenance_potential():
+    from utils.calculations import maintenance_potential
+    rng = np.random.default_rng(0)
+    TH, MT, N, A = (rng.uniform(1, 100, 100_000) for _ in range(4))
+    yield lambda: maintenance_potential(TH, MT, N, A, 120)
+
+
+# Persistence
+
+@contextmanager
+def _temporary_backend(backend_name, keys):
+    from utils import history, persistence
+    from utils.storage import JsonFileBackend, SQLiteBackend
+    original = persistence.get_backend()
+    original_history = history.get_history()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if backend_name == 'json':
+            backend = JsonFileBackend(os.path.join(tmp_dir, 'user_inputs.json'))
+        else:
+            backend = SQLiteBackend(os.path.join(tmp_dir, 'user_inputs.db'))
+        temporary_history = history.ScenarioHistory(os.path.join(tmp_dir, 'scenario_history.log'))
+        try:
+            persistence.set_backend(backend)
+            history.set_history(temporary_history)
+            persistence.save_data({f'key_{index}': index for index in range(keys)})
+            yield persistence
+        finally:
+            persistence.set_backend(original)
+            history.set_history(original_history)
+            temporary_history.close()
+
+
+def _persistence_cases(backend_name, keys):
+    @case(f'persistence.{backend_name}.get_value[{keys} keys]')
+    def _get_value():
+        with _temporary_backend(backend_name, keys) as persistence:
+            names = [f'key_{index}' for index in range(keys)]
+
+            def read_all():
+                for name in names:
+                    persistence.get_value(name, 0)
+            yield read_all
+
+    @case(f'persistence.{backend_name}.update_value[{keys} keys]')
+    def _update_value():
+        with _temporary_backend(backend_name, keys) as persistence:
+            counter = iter(range(10 ** 9))
+
+            def update_and_flush():
+                persistence.update_value('key_0', next(counter))
+                persistence.flush()
+            yield update_and_flush
+
+
+for _backend_name in ('json', 'sqlite'):
+    for _keys in (10, 100, 1000):
+        _persistence_cases(_backend_name, _keys)
+
+
+# Chart conversion
+
+@case('charts.convert_matplotlib', repeat=10)
+def _convert_matplotlib():
+    from utils.charts import build_q3_chart
+    from utils.figures import release_figure
+    from utils.pdf_generator import _convert_matplotlib_to_image
+    fig = build_q3_chart('en', [60 - 4 * month for month in range(6)], (2026, 1))
+    try:
+        yield lambda: _convert_matplotlib_to_image(fig)
+    finally:
+        release_figure(fig)
+
+
+@case('charts.draw_vector', repeat=10)
+def _draw_vector():
+    from reportlab.graphics import renderPDF
+    from reportlab.lib.units import inch
+    from utils.chart_specs import q2_chart
+    from utils.pdf_charts import chart_drawing
+    spec = q2_chart('en', 100, 2, 50)
+    yield lambda: renderPDF.drawToString(chart_drawing(spec, 5*inch, 3.5*inch))
+
+
+# PDF
+
+def _pdf_case(language):
+    @case(f'pdf.executive_summary[{language}]', repeat=5)
+    def _executive_summary():
+        from utils.charts import build_questions_data
+        from utils.pdf_generator import generate_executive_summary
+        questions_data = build_questions_data(language, SAMPLE_INPUTS)
+        yield lambda: generate_executive_summary(language, questions_data)
+
+
+for _language in ('en', 'de', 'fr', 'lb'):
+    _pdf_case(_language)
+
+
+@case('pdf.portfolio[100 teams]', repeat=3)
+def _portfolio():
+    from benchmarks.bench_portfolio import sample_teams
+    from utils.pdf_generator import generate_portfolio_report
+    teams = sample_teams(100)
+    yield lambda: generate_portfolio_report('en', teams)
+
+
+# Page reruns
+
+def _rerun_case(page):
+    @case(f'app.rerun[{page}]', repeat=10)
+    def _rerun():
+        from streamlit.testing.v1 import AppTest
+        from questions import PAGES
+        with _temporary_backend('json', 0) as persistence:
+            persistence.save_data(SAMPLE_INPUTS)
+            at = AppTest.from_file(os.path.join(ROOT, 'test_automation_calculations.py'), default_timeout=120)
+            at.run()
+            at.sidebar.radio[0].set_value(at.sidebar.radio[0].options[list(PAGES).index(page)]).run()
+            if at.exception:
+                raise SkipCase(f'page failed: {at.exception}')
+            yield at.run
+
+
+for _page in ('home', 'question1', 'question2', 'question3'):
+    _rerun_case(_page)
+
+
+def run(selected=None, repeat=None, progress=None):
+    """
+    Run the benchmark cases.
+
+    Args:
+        selected (str): Only run cases whose name contains this string
+        repeat (int): Timed calls per case, overrides each case's default
+        progress (callable): Called with (name, result) after each case
+
+    Returns:
+        dict: Case name -> {'median', 'min', 'mean' (seconds), 'repeat'} or {'skipped': reason}
+    """
+    results = {}
+    for name, default_repeat, setup in _CASES:
+        if selected and selected not in name:
+            continue
+        try:
+            with setup() as function:
+                # Warm-up call: imports, caches and lazy initialization aren't part of the hot path
+                function()
+                timings = []
+                for _ in range(repeat or default_repeat):
+                    start = time.perf_counter()
+                    function()
+                    timings.append(time.perf_counter() - start)
+            result = {'median': statistics.median(timings), 'min': min(timings),
+                      'mean': statistics.mean(timings), 'repeat': len(timings)}
+        except SkipCase as e:
+            result = {'skipped': str(e)}
+        results[name] = result
+        if progress:
+            progress(name, result)
+    return results
+
+
+def _metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def baseline_path(name):
+    """
+    Returns:
+        str: Path of a stored baseline, `name` may also be a path to a JSON file
+    """
+    if name.endswith('.json') or os.sep in name:
+        return name
+    return os.path.join(BASELINES_DIR, f'{name}.json')
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results with a baseline.
+
+    Args:
+        results (dict): As returned by run()
+        baseline (dict): Results of a baseline run
+        threshold (float): Allowed slowdown of a case's median, in percent
+
+    Returns:
+        list: (name, baseline median, median, change in percent, regressed) for cases timed in both
+    """
+    rows = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if 'median' not in result or not previous or 'median' not in previous:
+            continue
+        change = (result['median'] / previous['median'] - 1) * 100
+        rows.append((name, previous['median'], result['median'], change, change > threshold))
+    return rows
+
+
+def _format_seconds(seconds):
+    return f"{seconds * 1000:10.3f}ms"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the benchmark suite and compare it with a baseline.')
+    parser.add_argument('-k', dest='selected', help='Only run cases whose name contains this string')
+    parser.add_argument('--repeat', type=int, help='Timed calls per case (default: per case)')
+    parser.add_argument('--json', dest='json_path', help='Write the results to this JSON file')
+    parser.add_argument('--save-baseline', metavar='NAME', help='Store the results as baseline NAME')
+    parser.add_argument('--compare', metavar='NAME', help='Compare with baseline NAME (or a JSON file)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Allowed slowdown in percent before --compare fails (default: {DEFAULT_THRESHOLD:g})')
+    parser.add_argument('--list', action='store_true', help='List the cases and exit')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, repeat, _ in _CASES:
+            print(f"{name} (repeat {repeat})")
+        return 0
+
+    baseline = None
+    if args.compare:
+        path = baseline_path(args.compare)
+        if not os.path.exists(path):
+            print(f"Error: no baseline {args.compare} at {path}. Store one on this machine first with "
+                  f"'python -m benchmarks.suite --save-baseline {args.compare}'", file=sys.stderr)
+            return 2
+        try:
+            with open(path, encoding='utf-8') as f:
+                baseline = json.load(f)['results']
+        except (IOError, ValueError, KeyError) as e:
+            print(f"Error loading baseline {args.compare}: {e}", file=sys.stderr)
+            return 2
+
+    def progress(name, result):
+        if 'skipped' in result:
+            print(f"{name:50} skipped: {result['skipped']}")
+        else:
+            print(f"{name:50} {_format_seconds(result['median'])} median {_format_seconds(result['min'])} min")
+
+    report = {'meta': _metadata(), 'results': run(args.selected, args.repeat, progress)}
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(BASELINES_DIR, exist_ok=True)
+        with open(baseline_path(args.save_baseline), 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline stored in {baseline_path(args.save_baseline)}")
+
+    if baseline is None:
+        return 0
+    rows = compare(report['results'], baseline, args.threshold)
+    if not rows:
+        print(f"Error: no case was timed in both this run and baseline {args.compare}, nothing was compared",
+              file=sys.stderr)
+        return 2
+    print(f"\n{'case':50} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, previous, current, change, regressed in rows:
+        print(f"{name:50} {_format_seconds(previous)} {_format_seconds(current)} {change:+7.1f}%"
+              f"{'  REGRESSION' if regressed else ''}")
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than the baseline by more than {args.threshold:g}%")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
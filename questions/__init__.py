@@ -1,3 +1,26 @@
 # questions/__init__.py
+import importlib
 
-__all__ = ["home", "question1", "question2", "question3"]
+# Page registry: page key -> translation key of its navigation label, in navigation order.
+# Page modules are imported on first use, so only the libraries of the opened page are loaded.
+PAGES = {
+    "home": "nav_home",
+    "question1": "nav_q1",
+    "question2": "nav_q2",
+    "question3": "nav_q3",
+}
+
+
+def load_page(key):
+    """
+    Import a page module on first use.
+    
+    Args:
+        key (str): Page key from PAGES
+        
+    Returns:
+        module: The page module, providing show(language)
+    """
+    if key not in PAGES:
+        raise KeyError(f"Unknown page: {key}")
+    return importlib.import_module(f"{__name__}.{key}")
@@ -0,0 +1,97 @@
+# history_panel.py
+# Sidebar panel to compare and restore earlier inputs from the scenario history (not a page itself)
+from datetime import datetime
+
+import streamlit as st
+from utils.translations import get_text
+from utils.persistence import history_namespace, restore_version
+from utils.history import HISTORY_ERRORS, get_history
+
+# Earlier versions offered in the panel
+HISTORY_LIMIT = 20
+
+# Translation (section, key) of the label of each stored input
+INPUT_LABELS = {
+    'q1_manual_test_execution_time': ('question1', 'input_manual'),
+    'q1_automated_test_execution_time_min': ('question1', 'input_automated'),
+    'q2_initial_investment': ('question2', 'input_investment'),
+    'q2_time_savings_per_run': ('question2', 'input_savings'),
+    'q3_th': ('question3', 'input_th'),
+    'q3_mt': ('question3', 'input_mt'),
+    'q3_n': ('question3', 'input_n'),
+    'q3_a': ('question3', 'input_a'),
+    'q3_horizon_months': ('question3', 'input_horizon'),
+    'simulation_spread': ('simulation', 'spread_label'),
+    'simulation_distribution': ('simulation', 'distribution_label'),
+}
+SWEEP_LABELS = {'x': 'x_label', 'y': 'y_label', 'range': 'range_label', 'steps': 'steps_label',
+                'in_report': 'include_in_report'}
+
+
+def _label(language, key):
+    if key in INPUT_LABELS:
+        return get_text(language, *INPUT_LABELS[key])
+    question, _, setting = key.partition('_sweep_')
+    if setting in SWEEP_LABELS:
+        return f"{get_text(language, 'sensitivity', 'expander')} ({question.upper()}): " \
+               f"{get_text(language, 'sensitivity', SWEEP_LABELS[setting])}"
+    return key
+
+
+def _format(value):
+    return '–' if value is None else str(value)
+
+
+def _restore(version):
+    """
+    Restore a version and drop the widget values, so the widgets show the restored inputs.
+    """
+    restore_version(version)
+    for key in [key for key in st.session_state if key.endswith('_input')]:
+        del st.session_state[key]
+
+
+def show(language):
+    """
+    Show the earlier inputs of the session's storage namespace in a sidebar expander.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+    """
+    with st.sidebar.expander(get_text(language, 'history', 'title')):
+        namespace = history_namespace()
+        history = get_history()
+        try:
+            versions = history.versions(namespace, limit=HISTORY_LIMIT + 1)
+        except HISTORY_ERRORS:
+            versions = []
+        # The newest version holds the current inputs
+        if len(versions) < 2:
+            st.caption(get_text(language, 'history', 'empty'))
+            return
+        current = versions[0]['version']
+        times = {item['version']: item['time'] for item in versions}
+
+        selected = st.selectbox(
+            get_text(language, 'history', 'version_label'),
+            list(times)[1:],
+            format_func=lambda version: get_text(language, 'history', 'version_option').format(
+                version=version, time=datetime.fromtimestamp(times[version]).strftime('%Y-%m-%d %H:%M:%S')),
+            key='history_version'
+        )
+        try:
+            changes = history.compare(selected, current, namespace)
+        except (KeyError, *HISTORY_ERRORS):
+            # Compacted away or changed by another session since the list was read
+            st.caption(get_text(language, 'history', 'empty'))
+            return
+
+        if changes:
+            st.table([{get_text(language, 'history', 'input_column'): _label(language, key),
+                       get_text(language, 'history', 'selected_column'): _format(old),
+                       get_text(language, 'history', 'current_column'): _format(new)}
+                      for key, (old, new) in changes.items()])
+        else:
+            st.caption(get_text(language, 'history', 'no_changes'))
+        st.button(get_text(language, 'history', 'restore_button'), on_click=_restore, args=(selected,),
+                  key='history_restore')
@@ -1,184 +1,146 @@
 # home.py
+import os
+import uuid
 import streamlit as st
-import math
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objs as go
-import pandas as pd
-import numpy as np
 from datetime import datetime
-from utils.translations import get_text, format_number
-from utils.persistence import get_value
-from utils.pdf_generator import generate_executive_summary
-from utils.date_utils import generate_next_6_months
+from io import BytesIO
+from utils.translations import get_text
+from utils.scenario import current_scenario
+from utils.metrics import span
+
+# Seconds between status checks of a running report export
+POLL_INTERVAL = 1.0
+
+# Progress bar position of each export stage
+STAGE_PROGRESS = {None: 0.0, 'data': 0.1, 'charts': 0.3, 'layout': 0.7}
+
+
+def _generate_report(language, scenario, cache_key, date):
+    """
+    Build the executive summary in a background job.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        scenario (Scenario): Scenario of the session, read in the script thread
+        cache_key (str): Report cache key
+        date (str): Generation time printed in the report, when the export was requested
+
+    Returns:
+        callable: Job function returning the PDF as a file object
+    """
+    from utils.pdf_generator import write_executive_summary, SPOOL_MAX_BYTES
+    from utils.pdf_cache import get_pdf_cache
+
+    def run(job):
+        with span('home.report.cache'):
+            pdf_bytes = get_pdf_cache().get(cache_key)
+        if pdf_bytes is not None:
+            return BytesIO(pdf_bytes)
+
+        job.progress('data')
+        with span('home.report.data'):
+            scenario.questions_data(language)
+
+        # Generate comprehensive PDF into a spooled file, so finished reports aren't held as bytes between reruns
+        with span('home.report.pdf'):
+            report = write_executive_summary(language, scenario, progress=job.progress, date=date)
+        size = report.seek(0, os.SEEK_END)
+        report.seek(0)
+        if size <= SPOOL_MAX_BYTES:
+            get_pdf_cache().put(cache_key, report.read())
+            report.seek(0)
+        return report
+    return run
+
+
+def _read_report(report):
+    """
+    Deferred download data: the report file is only read when the button is clicked.
+
+    Streamlit accepts bytes or BytesIO from the callable but not the spooled
+    file itself, and reads every source into one bytes object anyway, so the
+    whole file is read into bytes on click.
+    """
+    def read():
+        report.seek(0)
+        return report.read()
+    return read
+
+
+def _show_report_job(language, owner, cache_key):
+    """
+    Show the status of the session's report export, and the download once it is done.
+    """
+    from utils.report_jobs import get_report_jobs, DONE, FAILED, FINISHED
+
+    job = get_report_jobs().get(owner, st.session_state.get('home_report_job'))
+    # Nothing to show if the export expired or was made for other inputs
+    if job is None or job.key != cache_key:
+        return
+    if job.status == DONE:
+        st.success(get_text(language, 'pdf', 'report_ready'))
+        filename = f"test_automation_executive_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        st.download_button(
+            label=get_text(language, 'pdf', 'download_full_report'),
+            data=_read_report(job.result),
+            file_name=filename,
+            mime='application/pdf',
+            key='home_download_full_pdf'
+        )
+    elif job.status == FAILED:
+        st.error(get_text(language, 'pdf', 'report_failed').format(error=job.error))
+    elif job.status not in FINISHED:
+        label = get_text(language, 'pdf', f'report_stage_{job.stage}' if job.stage else 'report_queued')
+        st.progress(STAGE_PROGRESS.get(job.stage, 0.0), text=label)
+
+    if job.status in FINISHED and st.session_state.get('home_report_polling'):
+        # Stop polling: rerun the whole page so the status is shown without a timer
+        st.session_state.home_report_polling = False
+        st.rerun()
 
 
 def show(language='en'):
     st.write(get_text(language, 'home', 'instructions'))
-    
+
     st.write("")
     st.write("")
-    
+
     # Add full report export button
     st.subheader(get_text(language, 'pdf', 'executive_summary'))
-    
+
     # Check if any data exists
-    has_q1_data = get_value('q1_manual_test_execution_time', 0) > 0 and get_value('q1_automated_test_execution_time_min', 0) > 0
-    has_q2_data = get_value('q2_initial_investment', 0) > 0 and get_value('q2_time_savings_per_run', 0) > 0
-    has_q3_data = get_value('q3_n', 0) > 0
-    
+    with span('home.inputs'):
+        scenario = current_scenario()
+    has_q1_data, has_q2_data, has_q3_data = scenario.answered
+
     if not (has_q1_data or has_q2_data or has_q3_data):
         st.info(get_text(language, 'pdf', 'no_data_warning'))
-    else:
-        if st.button(get_text(language, 'pdf', 'download_full_report'), key='home_full_report'):
-            questions_data = {}
-            
-            # Prepare Question 1 data if available
-            if has_q1_data:
-                manual_time = get_value('q1_manual_test_execution_time', 0)
-                auto_time_min = get_value('q1_automated_test_execution_time_min', 0)
-                auto_time = auto_time_min / 60
-                time_savings = manual_time - auto_time
-                
-                # Recreate Q1 chart
-                df = pd.DataFrame({
-                    get_text(language, 'question1', 'chart_type'): [
-                        get_text(language, 'question1', 'label_manual'),
-                        get_text(language, 'question1', 'label_automated'),
-                        get_text(language, 'question1', 'label_saved')
-                    ],
-                    get_text(language, 'question1', 'chart_yaxis'): [
-                        manual_time, 
-                        auto_time, 
-                        time_savings
-                    ]
-                })
-                
-                fig1 = px.bar(
-                    df, 
-                    x=get_text(language, 'question1', 'chart_type'), 
-                    y=get_text(language, 'question1', 'chart_yaxis'), 
-                    title=get_text(language, 'question1', 'chart_title'),
-                    color=get_text(language, 'question1', 'chart_type'),
-                    color_discrete_map={
-                        get_text(language, 'question1', 'label_manual'): 'blue',
-                        get_text(language, 'question1', 'label_automated'): 'green',
-                        get_text(language, 'question1', 'label_saved'): 'orange'
-                    }
-                )
-                
-                questions_data['q1'] = {
-                    'inputs': {
-                        'manual_time': manual_time,
-                        'automated_time_min': auto_time_min
-                    },
-                    'results': {
-                        'time_savings': time_savings,
-                        'formatted_savings': format_number(time_savings, 2, language)
-                    },
-                    'chart': fig1
-                }
-            
-            # Prepare Question 2 data if available
-            if has_q2_data:
-                investment = get_value('q2_initial_investment', 0)
-                savings_per_run = get_value('q2_time_savings_per_run', 0)
-                runs_to_break_even = math.ceil(investment / savings_per_run) if savings_per_run != 0 else float('inf')
-                
-                # Recreate Q2 chart
-                if savings_per_run > 0:
-                    runs = np.arange(0, int(runs_to_break_even) + 10, 1)
-                    cumulative_savings = runs * savings_per_run
-                    
-                    fig2 = go.Figure()
-                    hover_template = (
-                        f"{get_text(language, 'question2', 'hover_runs')}: %{{x}}<br>"
-                        f"{get_text(language, 'question2', 'hover_savings')}: %{{y:.2f}} "
-                        f"{get_text(language, 'question1', 'chart_yaxis').split('(')[1].replace(')', '')}"
-                        "<extra></extra>"
-                    )
-                    
-                    fig2.add_trace(go.Scatter(
-                        x=runs, y=cumulative_savings,
-                        mode='lines+markers',
-                        name=get_text(language, 'question2', 'chart_trace'),
-                        hovertemplate=hover_template,
-                    ))
-                    
-                    fig2.add_hline(
-                        y=investment, 
-                        line_dash="dash", 
-                        line_color="red", 
-                        annotation_text=get_text(language, 'question2', 'chart_annotation'),
-                        annotation_position="top right"
-                    )
-                    
-                    fig2.update_layout(
-                        title=get_text(language, 'question2', 'chart_title'),
-                        xaxis_title=get_text(language, 'question2', 'chart_xaxis'),
-                        yaxis_title=get_text(language, 'question2', 'chart_yaxis'),
-                        legend=dict(yanchor="top", y=0.99, xanchor="right", x=0.99)
-                    )
-                    
-                    questions_data['q2'] = {
-                        'inputs': {
-                            'initial_investment': investment,
-                            'time_savings': savings_per_run
-                        },
-                        'results': {
-                            'runs_to_break_even': runs_to_break_even
-                        },
-                        'chart': fig2
-                    }
-            
-            # Prepare Question 3 data if available
-            if has_q3_data:
-                TH = get_value('q3_th', 0)
-                MT = get_value('q3_mt', 0)
-                N = get_value('q3_n', 0)
-                A = get_value('q3_a', 0)
-                
-                # Recreate Q3 calculations
-                potential_array = []
-                MAINTENANCE_HOURS_NEW = MT
-                for i in range(1, 7):
-                    MAINTENANCE_HOURS_NEW += (MT / N) * A
-                    potential_array.append(TH - MAINTENANCE_HOURS_NEW)
-                
-                can_afford = potential_array[0] > 0 if potential_array else False
-                
-                # Recreate Q3 chart
-                fig3, ax = plt.subplots()
-                months = generate_next_6_months(language)
-                ax.plot(months, potential_array, marker='o')
-                ax.axhline(0, color='red', linestyle='--', linewidth=0.5)
-                ax.set_xlabel(get_text(language, 'question3', 'chart_xaxis'))
-                ax.set_ylabel(get_text(language, 'question3', 'chart_yaxis'))
-                ax.grid(True)
-                
-                questions_data['q3'] = {
-                    'inputs': {
-                        'TH': TH,
-                        'MT': MT,
-                        'N': N,
-                        'A': A
-                    },
-                    'results': {
-                        'potential_array': potential_array,
-                        'can_afford': can_afford
-                    },
-                    'chart': fig3
-                }
-            
-            # Generate comprehensive PDF
-            pdf_buffer = generate_executive_summary(language, questions_data)
-            
-            # Create download button
-            filename = f"test_automation_executive_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            st.download_button(
-                label=get_text(language, 'pdf', 'download_full_report'),
-                data=pdf_buffer,
-                file_name=filename,
-                mime='application/pdf',
-                key='home_download_full_pdf'
-            )
+        return
+
+    # Exports run as background jobs of this browser session
+    owner = st.session_state.setdefault('home_report_owner', uuid.uuid4().hex)
+    clicked = st.button(get_text(language, 'pdf', 'download_full_report'), key='home_full_report')
+    if not (clicked or 'home_report_job' in st.session_state):
+        return
+
+    # The PDF subsystem pulls in ReportLab, Plotly and Matplotlib, so load it only when needed
+    from utils.pdf_cache import report_key
+    from utils.pdf_generator import report_date
+    from utils.report_jobs import get_report_jobs, QueueFull, FINISHED
+
+    # Only the answered questions end up in the report, and therefore in its cache key
+    cache_key = report_key(language, scenario.report_inputs)
+
+    if clicked:
+        try:
+            job = get_report_jobs().submit(owner, cache_key, _generate_report(language, scenario, cache_key, report_date()))
+        except QueueFull:
+            st.warning(get_text(language, 'pdf', 'report_busy'))
+            return
+        st.session_state.home_report_job = job.id
+
+    job = get_report_jobs().get(owner, st.session_state.home_report_job)
+    polling = job is not None and job.status not in FINISHED
+    st.session_state.home_report_polling = polling
+    # Only the status is rerun while the export is in flight, the page stays responsive
+    st.fragment(_show_report_job, run_every=POLL_INTERVAL if polling else None)(language, owner, cache_key)
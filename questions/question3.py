@@ -1,60 +1,68 @@
 # page3.py
 import streamlit as st
-import matplotlib.pyplot as plt
-from utils.date_utils import generate_next_6_months
 from utils.translations import get_text
 from utils.persistence import get_value, update_value
+from utils.calculations import projection_months, PROJECTION_HORIZONS, PROJECTION_MONTHS
+from utils.date_utils import format_horizon
+from utils.scenario import current_scenario
+from utils.simulation import uncertainty_message
+from utils.metrics import span
+from questions import sweep_panel
 
 def show(language='en'):
     st.subheader(get_text(language, 'question3', 'title'))
 
     # Input fields with file persistence
-    TH = st.number_input(
-        get_text(language, 'question3', 'input_th'), 
-        min_value=0, 
-        value=get_value('q3_th', 0),
-        step=1,
-        on_change=lambda: update_value('q3_th', st.session_state.q3_th_input),
-        key='q3_th_input'
-    )
-    MT = st.number_input(
-        get_text(language, 'question3', 'input_mt'), 
-        min_value=0, 
-        value=get_value('q3_mt', 0),
-        step=1,
-        on_change=lambda: update_value('q3_mt', st.session_state.q3_mt_input),
-        key='q3_mt_input'
-    )
-    N = st.number_input(
-        get_text(language, 'question3', 'input_n'), 
-        min_value=0, 
-        value=get_value('q3_n', 0),
-        step=1,
-        on_change=lambda: update_value('q3_n', st.session_state.q3_n_input),
-        key='q3_n_input'
-    )
-    A = st.number_input(
-        get_text(language, 'question3', 'input_a'), 
-        min_value=0, 
-        value=get_value('q3_a', 0),
-        step=1,
-        on_change=lambda: update_value('q3_a', st.session_state.q3_a_input),
-        key='q3_a_input'
-    )
+    with span('question3.inputs'):
+        TH = st.number_input(
+            get_text(language, 'question3', 'input_th'),
+            min_value=0,
+            value=get_value('q3_th', 0),
+            step=1,
+            on_change=lambda: update_value('q3_th', st.session_state.q3_th_input),
+            key='q3_th_input'
+        )
+        MT = st.number_input(
+            get_text(language, 'question3', 'input_mt'),
+            min_value=0,
+            value=get_value('q3_mt', 0),
+            step=1,
+            on_change=lambda: update_value('q3_mt', st.session_state.q3_mt_input),
+            key='q3_mt_input'
+        )
+        N = st.number_input(
+            get_text(language, 'question3', 'input_n'),
+            min_value=0,
+            value=get_value('q3_n', 0),
+            step=1,
+            on_change=lambda: update_value('q3_n', st.session_state.q3_n_input),
+            key='q3_n_input'
+        )
+        A = st.number_input(
+            get_text(language, 'question3', 'input_a'),
+            min_value=0,
+            value=get_value('q3_a', 0),
+            step=1,
+            on_change=lambda: update_value('q3_a', st.session_state.q3_a_input),
+            key='q3_a_input'
+        )
+        stored_horizon = projection_months({'q3_horizon_months': get_value('q3_horizon_months', PROJECTION_MONTHS)})
+        horizon = st.selectbox(
+            get_text(language, 'question3', 'input_horizon'),
+            PROJECTION_HORIZONS,
+            index=PROJECTION_HORIZONS.index(stored_horizon) if stored_horizon in PROJECTION_HORIZONS else 0,
+            format_func=lambda months: format_horizon(language, months),
+            on_change=lambda: update_value('q3_horizon_months', st.session_state.q3_horizon_input),
+            key='q3_horizon_input'
+        )
 
     # Calculate the potential to add more tests (P)
-    potential_tests_array = []
-
     if N > 0:
 
-        P = []
-        MAINTENANCE_HOURS_NEW = MT
-        for i in range(1, 7):
-            MAINTENANCE_HOURS_NEW += (MT / N) * A
-            P.append(TH - MAINTENANCE_HOURS_NEW)
-
-        for i, p in enumerate(P, 1):
-            potential_tests_array.append(p)
+        # Calculated on the scenario shared with the other pages
+        with span('question3.calculate'):
+            scenario = current_scenario(q3_th=TH, q3_mt=MT, q3_n=N, q3_a=A, q3_horizon_months=horizon)
+            potential_tests_array = scenario.potential
 
         # Interpretation
         st.text("")
@@ -65,20 +73,26 @@ def show(language='en'):
         elif isinstance(potential_tests_array[0], (int, float)) and potential_tests_array[0] > 0:
             st.success(get_text(language, 'question3', 'success_message').format(count=int(A)))
 
+        # Simulated range of the potential, if the inputs are uncertain
+        with span('question3.simulation'):
+            simulation = scenario.simulation
+        if simulation is not None:
+            st.info(uncertainty_message(language, 'q3', simulation, scenario.inputs['simulation_spread']))
+
         # Plot the trend
-        fig, ax = plt.subplots()
-        months = generate_next_6_months(language)
-        ax.plot(months, potential_tests_array, marker='o')
-        ax.axhline(0, color='red', linestyle='--', linewidth=0.5)
-        ax.set_xlabel(get_text(language, 'question3', 'chart_xaxis'))
-        ax.set_ylabel(get_text(language, 'question3', 'chart_yaxis'))
-        ax.grid(True)
+        with span('question3.figure'):
+            chart_png = scenario.figure('q3', language)
 
         # Display the chart
         st.text("")
         st.text("")
         st.text("")
-        st.pyplot(fig)
+        with span('question3.render'):
+            st.image(chart_png, width="stretch")
+
+        # Potential next month for other inputs
+        with span('question3.sweep'):
+            sweep_panel.show(language, 'q3', {'q3_th': TH, 'q3_mt': MT, 'q3_n': N, 'q3_a': A})
 
     else:
         st.text("")
@@ -0,0 +1,73 @@
+# sweep_panel.py
+# Sensitivity heatmap panel shared by the Question 2 and Question 3 pages (not a page itself)
+import streamlit as st
+from utils.translations import get_text
+from utils.persistence import get_value, update_value
+from utils.sensitivity import SWEEP_STEPS, sweep_axes, sweep_settings
+from utils.charts import render_sweep_chart_png
+
+
+def show(language, question, inputs):
+    """
+    Show the sweep settings and the heatmap of a question in an expander.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        question (str): 'q2' or 'q3'
+        inputs (dict): Current input values of the question, keyed as in user_inputs.json
+    """
+    axes = sweep_axes(question, inputs)
+    if len(axes) < 2:
+        return
+
+    with st.expander(get_text(language, 'sensitivity', 'expander')):
+        stored = {key: get_value(f'{question}_sweep_{key}', None) for key in ('x', 'y', 'range', 'steps', 'in_report')}
+        x_key, y_key, span, steps = sweep_settings(question, {
+            **inputs, **{f'{question}_sweep_{key}': value for key, value in stored.items()}
+        })
+
+        # Question 2 has only two inputs, so its axes are fixed
+        if len(axes) > 2:
+            x_key = st.selectbox(
+                get_text(language, 'sensitivity', 'x_label'),
+                axes,
+                index=axes.index(x_key),
+                format_func=lambda key: get_text(language, 'sensitivity', key),
+                on_change=lambda: update_value(f'{question}_sweep_x', st.session_state[f'{question}_sweep_x_input']),
+                key=f'{question}_sweep_x_input'
+            )
+            y_axes = tuple(key for key in axes if key != x_key)
+            y_key = st.selectbox(
+                get_text(language, 'sensitivity', 'y_label'),
+                y_axes,
+                index=y_axes.index(y_key) if y_key in y_axes else 0,
+                format_func=lambda key: get_text(language, 'sensitivity', key),
+                on_change=lambda: update_value(f'{question}_sweep_y', st.session_state[f'{question}_sweep_y_input']),
+                key=f'{question}_sweep_y_input'
+            )
+        sweep_range = st.slider(
+            get_text(language, 'sensitivity', 'range_label'),
+            min_value=10,
+            max_value=90,
+            value=int(round(span * 100)),
+            step=10,
+            on_change=lambda: update_value(f'{question}_sweep_range', st.session_state[f'{question}_sweep_range_input']),
+            key=f'{question}_sweep_range_input'
+        )
+        steps = st.selectbox(
+            get_text(language, 'sensitivity', 'steps_label'),
+            SWEEP_STEPS,
+            index=SWEEP_STEPS.index(steps) if steps in SWEEP_STEPS else 0,
+            on_change=lambda: update_value(f'{question}_sweep_steps', st.session_state[f'{question}_sweep_steps_input']),
+            key=f'{question}_sweep_steps_input'
+        )
+        st.checkbox(
+            get_text(language, 'sensitivity', 'include_in_report'),
+            value=bool(stored['in_report']),
+            on_change=lambda: update_value(f'{question}_sweep_in_report', st.session_state[f'{question}_sweep_in_report_input']),
+            key=f'{question}_sweep_in_report_input'
+        )
+
+        values = tuple(sorted((key, float(value)) for key, value in inputs.items()))
+        st.image(render_sweep_chart_png(language, values, question, x_key, y_key, sweep_range / 100, steps),
+                 width="stretch")
@@ -1,7 +1,12 @@
 import streamlit as st
-from questions import home, question1, question2, question3
+from questions import PAGES, load_page, history_panel
 from utils.translations import get_text
-from utils.persistence import clear_all_data
+from utils.persistence import clear_all_data, flush, get_value, update_value
+from utils.simulation import DEFAULT_DISTRIBUTION, DISTRIBUTIONS, MAX_SPREAD
+from utils import metrics
+
+# Metrics export (JSONL file, /metrics endpoint), if enabled with TAC_METRICS=1
+metrics.configure_from_environment()
 
 
 # Set the layout to wide
@@ -27,16 +32,32 @@ lang = st.session_state.language
 st.title(get_text(lang, 'main', 'app_title'))
 
 # Page dictionary with stable keys mapped to translated labels
-page_dict = {
-    get_text(lang, 'main', 'nav_home'): "home",
-    get_text(lang, 'main', 'nav_q1'): "question1",
-    get_text(lang, 'main', 'nav_q2'): "question2",
-    get_text(lang, 'main', 'nav_q3'): "question3",
-}
+page_dict = {get_text(lang, 'main', label_key): key for key, label_key in PAGES.items()}
 
 st.sidebar.title(get_text(lang, 'main', 'sidebar_title'))
 selected_label = st.sidebar.radio(get_text(lang, 'main', 'nav_label'), list(page_dict.keys()))
 
+# Uncertainty of the inputs, simulated on all pages and in the report
+st.sidebar.subheader(get_text(lang, 'simulation', 'sidebar_title'))
+st.sidebar.slider(
+    get_text(lang, 'simulation', 'spread_label'),
+    min_value=0,
+    max_value=MAX_SPREAD,
+    value=get_value('simulation_spread', 0),
+    step=5,
+    on_change=lambda: update_value('simulation_spread', st.session_state.simulation_spread_input),
+    key='simulation_spread_input'
+)
+distribution = get_value('simulation_distribution', DEFAULT_DISTRIBUTION)
+st.sidebar.selectbox(
+    get_text(lang, 'simulation', 'distribution_label'),
+    DISTRIBUTIONS,
+    index=DISTRIBUTIONS.index(distribution) if distribution in DISTRIBUTIONS else DISTRIBUTIONS.index(DEFAULT_DISTRIBUTION),
+    format_func=lambda name: get_text(lang, 'simulation', name),
+    on_change=lambda: update_value('simulation_distribution', st.session_state.simulation_distribution_input),
+    key='simulation_distribution_input'
+)
+
 # Add spacing before Clear All button
 st.sidebar.write("")
 st.sidebar.write("")
@@ -47,11 +68,19 @@ if st.sidebar.button(get_text(lang, 'main', 'clear_all_button')):
     clear_all_data()
     st.rerun()
 
-if page_dict[selected_label] == "home":
-    home.show(lang)
-elif page_dict[selected_label] == "question1":
-    question1.show(lang)
-elif page_dict[selected_label] == "question2":
-    question2.show(lang)
-elif page_dict[selected_label] == "question3":
-    question3.show(lang)
+try:
+    with metrics.span('rerun'):
+        load_page(page_dict[selected_label]).show(lang)
+finally:
+    # Write all input changes of this rerun to disk in one go
+    with metrics.span('persistence.flush'):
+        flush()
+
+    # Earlier inputs, including cleared ones, can be compared and restored; shown
+    # after the flush so the inputs saved by this rerun are already listed
+    history_panel.show(lang)
+
+    # Timings of the recorded stages, if metrics are enabled
+    if metrics.is_enabled():
+        with st.sidebar.expander(get_text(lang, 'main', 'debug_panel')):
+            st.table(metrics.summary())
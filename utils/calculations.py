@@ -0,0 +1,149 @@
+# calculations.py
+"""
+Vectorized calculation engine for the three test automation questions.
+Works on scalars as well as NumPy arrays (one element per scenario) and has
+no Streamlit dependency, so pages, PDF export and batch callers share it.
+"""
+
+import numpy as np
+
+# Default number of months covered by the Question 3 maintenance projection
+PROJECTION_MONTHS = 6
+
+# Projection horizons offered for Question 3, in months (6 months to 10 years)
+PROJECTION_HORIZONS = (6, 12, 24, 36, 48, 60, 72, 84, 96, 108, 120)
+MAX_PROJECTION_MONTHS = PROJECTION_HORIZONS[-1]
+
+# Input keys as stored in user_inputs.json
+INPUT_KEYS = (
+    'q1_manual_test_execution_time',
+    'q1_automated_test_execution_time_min',
+    'q2_initial_investment',
+    'q2_time_savings_per_run',
+    'q3_th',
+    'q3_mt',
+    'q3_n',
+    'q3_a',
+    'q3_horizon_months',
+)
+
+
+def hours_saved(manual_time, automated_time_min):
+    """
+    Question 1: work hours saved per automated test run.
+
+    Args:
+        manual_time: Manual test run time in hours (scalar or array)
+        automated_time_min: Automated test run time in minutes (scalar or array)
+
+    Returns:
+        numpy.ndarray: Hours saved per run
+    """
+    manual_time = np.asarray(manual_time, dtype=float)
+    automated_time_min = np.asarray(automated_time_min, dtype=float)
+    return manual_time - automated_time_min / 60
+
+
+def runs_to_break_even(initial_investment, time_savings_per_run):
+    """
+    Question 2: number of test runs needed to counter-balance the investment.
+
+    Args:
+        initial_investment: Initial investment in hours (scalar or array)
+        time_savings_per_run: Time savings per run in hours (scalar or array)
+
+    Returns:
+        numpy.ndarray: Runs rounded up to whole runs, inf where savings are 0
+    """
+    initial_investment = np.asarray(initial_investment, dtype=float)
+    time_savings_per_run = np.asarray(time_savings_per_run, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        runs = np.ceil(initial_investment / time_savings_per_run)
+    return np.where(time_savings_per_run != 0, runs, np.inf)
+
+
+def maintenance_potential(TH, MT, N, A, months=PROJECTION_MONTHS):
+    """
+    Question 3: potential to add more tests (P) for each projected month.
+
+    P = TH - (MT + ((MT / N) x A)), with the maintenance hours of the new
+    tests accumulating month over month.
+
+    Args:
+        TH: Monthly hours available for maintenance tasks
+        MT: Monthly hours used to maintain existing automated tests
+        N: Count of current automated tests
+        A: Count of new automated tests added per month
+        months (int): Number of months to project
+
+    Returns:
+        numpy.ndarray: Array of shape (..., months), NaN where N is 0
+    """
+    TH, MT, N, A = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (TH, MT, N, A)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = np.where(N > 0, MT / N * A, np.nan)
+    steps = np.arange(1, months + 1, dtype=float)
+    return (TH - MT)[..., np.newaxis] - growth[..., np.newaxis] * steps
+
+
+def projection_months(inputs):
+    """
+    The Question 3 projection horizon of a set of inputs.
+
+    Args:
+        inputs (dict): Input values, keyed as in user_inputs.json
+
+    Returns:
+        int: Months to project, PROJECTION_MONTHS if unset, at most MAX_PROJECTION_MONTHS
+    """
+    months = int(inputs.get('q3_horizon_months') or PROJECTION_MONTHS)
+    return min(max(months, 1), MAX_PROJECTION_MONTHS)
+
+
+def answered_questions(inputs):
+    """
+    Check which questions have enough inputs to be part of a report.
+
+    Args:
+        inputs (dict): Input values, keyed as in user_inputs.json
+
+    Returns:
+        tuple: (has_q1_data, has_q2_data, has_q3_data)
+    """
+    has_q1_data = inputs.get('q1_manual_test_execution_time', 0) > 0 and inputs.get('q1_automated_test_execution_time_min', 0) > 0
+    has_q2_data = inputs.get('q2_initial_investment', 0) > 0 and inputs.get('q2_time_savings_per_run', 0) > 0
+    has_q3_data = inputs.get('q3_n', 0) > 0
+    return has_q1_data, has_q2_data, has_q3_data
+
+
+def calculate_all(inputs, months=PROJECTION_MONTHS):
+    """
+    Compute the results of all three questions in one vectorized pass.
+
+    Args:
+        inputs (dict): Columnar mapping of input key (see INPUT_KEYS) to a
+            scalar or array of values. Missing keys count as 0.
+        months (int): Number of months of the Question 3 projection, the same for all scenarios
+
+    Returns:
+        dict: Result arrays with one element (or row) per scenario
+            {
+                'q1_time_savings': array,
+                'q2_runs_to_break_even': array,
+                'q3_potential': array of shape (n, months),
+                'q3_can_afford': bool array
+            }
+    """
+    columns = np.broadcast_arrays(*(np.asarray(inputs.get(key, 0), dtype=float) for key in INPUT_KEYS))
+    values = dict(zip(INPUT_KEYS, columns))
+
+    potential = maintenance_potential(values['q3_th'], values['q3_mt'], values['q3_n'], values['q3_a'], months)
+
+    return {
+        'q1_time_savings': hours_saved(values['q1_manual_test_execution_time'],
+                                       values['q1_automated_test_execution_time_min']),
+        'q2_runs_to_break_even': runs_to_break_even(values['q2_initial_investment'],
+                                                    values['q2_time_savings_per_run']),
+        'q3_potential': potential,
+        'q3_can_afford': potential[..., 0] > 0,
+    }
@@ -0,0 +1,240 @@
+# chart_specs.py
+"""
+Chart descriptions of the questions and sensitivity sweeps, independent of any
+plotting library.
+
+A description is a plain dict of lists, arrays and numbers, so it can be cached,
+pickled to worker processes and drawn by different renderers: the pages turn
+it into a Plotly or Matplotlib figure (utils.charts) and the PDF export draws
+it as ReportLab vector graphics (utils.pdf_charts).
+
+Keys of a description:
+    type        - 'bar', 'line' or 'heatmap'
+    title       - Chart title, or None
+    x_title     - X axis title
+    y_title     - Y axis title
+    legend      - Legend position ('best', 'top right'), or None for no legend
+    grid        - Whether to draw grid lines
+Bar charts:
+    bars        - [{'label', 'value', 'color', 'error': (minus, plus) or None}]
+    legend_title - Title of the legend (one entry per bar)
+Line charts:
+    series      - [{'name', 'x', 'y', 'color', 'lines', 'markers', 'marker', 'dash', 'hover'}]
+    ranges      - [{'name', 'x', 'low', 'high', 'color', 'opacity'}], shaded between two curves
+    h_lines     - [{'name', 'y', 'color', 'dash', 'width'}], horizontal reference lines
+    x_spans     - [{'name', 'x0', 'x1', 'color', 'opacity'}], shaded x intervals
+    v_lines     - [{'x', 'color', 'dash'}], vertical reference lines
+    x_ticks     - {'positions', 'labels', 'rotate'}, or None for numeric ticks
+Heatmaps (sensitivity sweeps, rendered by Matplotlib only):
+    x, y        - Grid values along each axis
+    values      - 2D array of cell values, one row per y value
+    diverging   - Color around zero (red to green) instead of a sequential scale
+    colorbar_title - Title of the color bar
+    point       - {'name', 'x', 'y'}, the highlighted current inputs
+`name` None leaves an element out of the legend, `dash` is None, 'dash' or 'dot'.
+"""
+
+import numpy as np
+
+from utils.translations import get_text
+from utils.date_utils import month_labels
+
+# Colors of the default Plotly and Matplotlib traces the charts used before
+PLOTLY_BLUE = '#636efa'
+MATPLOTLIB_BLUE = '#1f77b4'
+
+# Most points drawn for the Question 2 series, about one per pixel column of a chart
+Q2_MAX_POINTS = 200
+
+
+def q1_chart(language, manual_time, auto_time, time_savings, band=None):
+    """
+    Bar chart comparing manual, automated and saved time per run.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        manual_time (float): Manual test run time in hours
+        auto_time (float): Automated test run time in hours
+        time_savings (float): Hours saved per run
+        band (tuple): (P10, P50, P90) of the hours saved, drawn as an error bar
+
+    Returns:
+        dict: Chart description
+    """
+    error = None
+    if band is not None:
+        low, _, high = band
+        error = (max(time_savings - low, 0), max(high - time_savings, 0))
+    return {
+        'type': 'bar',
+        'title': get_text(language, 'question1', 'chart_title'),
+        'x_title': get_text(language, 'question1', 'chart_type'),
+        'y_title': get_text(language, 'question1', 'chart_yaxis'),
+        'legend': 'top right',
+        'legend_title': get_text(language, 'question1', 'chart_type'),
+        'grid': True,
+        'bars': [
+            {'label': get_text(language, 'question1', 'label_manual'), 'value': float(manual_time),
+             'color': 'blue', 'error': None},
+            {'label': get_text(language, 'question1', 'label_automated'), 'value': float(auto_time),
+             'color': 'green', 'error': None},
+            {'label': get_text(language, 'question1', 'label_saved'), 'value': float(time_savings),
+             'color': 'orange', 'error': error},
+        ],
+    }
+
+
+def cumulative_savings_series(savings_per_run, last_run, max_points=Q2_MAX_POINTS):
+    """
+    Cumulative time savings from run 0 to `last_run`, at no more than `max_points` runs.
+
+    Cumulative savings grow linearly, so leaving out runs loses no shape; the
+    first and last run are always included.
+
+    Args:
+        savings_per_run (float): Time savings per run in hours
+        last_run (int): Last run on the x axis
+        max_points (int): Upper bound on the number of points
+
+    Returns:
+        tuple: (runs array, cumulative savings array)
+    """
+    if last_run + 1 <= max_points:
+        runs = np.arange(0, last_run + 1)
+    else:
+        runs = np.unique(np.linspace(0, last_run, max_points).round().astype(np.int64))
+    return runs, runs * savings_per_run
+
+
+def q2_chart(language, investment, savings_per_run, runs_to_break_even, band=None):
+    """
+    Line chart of cumulative time savings per run against the initial investment.
+
+    The series is sampled at a bounded number of runs (see Q2_MAX_POINTS), so
+    the description stays the same size however many runs break-even takes.
+    The exact break-even run is marked separately.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        investment (float): Initial investment in hours
+        savings_per_run (float): Time savings per run in hours, must be > 0
+        runs_to_break_even (int): Runs needed to break even
+        band (tuple): (P10, P50, P90) of the runs needed, drawn as a shaded range
+
+    Returns:
+        dict: Chart description
+    """
+    runs_to_break_even = int(runs_to_break_even)
+    has_band = band is not None and np.isfinite(band[2])
+    last_run = max(runs_to_break_even, int(band[2]) if has_band else 0) + 9
+    runs, cumulative_savings = cumulative_savings_series(savings_per_run, last_run)
+    hover_template = get_text(language, 'derived', 'q2_hover_template')
+
+    spec = {
+        'type': 'line',
+        'title': get_text(language, 'question2', 'chart_title'),
+        'x_title': get_text(language, 'question2', 'chart_xaxis'),
+        'y_title': get_text(language, 'question2', 'chart_yaxis'),
+        'legend': 'top right',
+        'grid': True,
+        'series': [
+            # Markers only while every run is drawn, they would merge into a thick line otherwise
+            {'name': get_text(language, 'question2', 'chart_trace'),
+             'x': runs.tolist(), 'y': cumulative_savings.tolist(), 'color': PLOTLY_BLUE,
+             'lines': True, 'markers': len(runs) == last_run + 1, 'marker': 'circle', 'dash': None,
+             'hover': hover_template},
+            {'name': get_text(language, 'question2', 'chart_break_even'),
+             'x': [runs_to_break_even], 'y': [runs_to_break_even * savings_per_run], 'color': 'red',
+             'lines': False, 'markers': True, 'marker': 'diamond', 'dash': None,
+             'hover': hover_template},
+        ],
+        'ranges': [],
+        'h_lines': [{'name': get_text(language, 'question2', 'chart_annotation'), 'y': float(investment),
+                     'color': 'red', 'dash': 'dash', 'width': 1}],
+        'x_spans': [],
+        'v_lines': [],
+        'x_ticks': None,
+    }
+    if has_band:
+        spec['x_spans'].append({'name': get_text(language, 'simulation', 'band_label'),
+                                'x0': float(band[0]), 'x1': float(band[2]), 'color': 'orange', 'opacity': 0.2})
+        spec['v_lines'].append({'x': float(band[1]), 'color': 'orange', 'dash': 'dot'})
+    return spec
+
+
+def q3_chart(language, potential_array, start=None, band=None):
+    """
+    Trend of the potential to add more tests over the projected months.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        potential_array (list): Potential (P) per month
+        start (tuple): (year, month) the projection starts after, defaults to the current month
+        band (tuple): (P10, P50, P90) curves of the potential, drawn as a shaded range
+
+    Returns:
+        dict: Chart description
+    """
+    months = month_labels(language, len(potential_array), start)
+    positions = list(range(len(months)))
+    # Label about 12 months at most, longer horizons would overlap
+    step = -(-len(months) // 12)
+
+    spec = {
+        'type': 'line',
+        'title': None,
+        'x_title': get_text(language, 'question3', 'chart_xaxis'),
+        'y_title': get_text(language, 'question3', 'chart_yaxis'),
+        'legend': None,
+        'grid': True,
+        'series': [
+            {'name': None, 'x': positions, 'y': [float(value) for value in potential_array],
+             'color': MATPLOTLIB_BLUE, 'lines': True, 'markers': len(months) <= 24, 'marker': 'circle',
+             'dash': None, 'hover': None},
+        ],
+        'ranges': [],
+        'h_lines': [{'name': None, 'y': 0.0, 'color': 'red', 'dash': 'dash', 'width': 0.5}],
+        'x_spans': [],
+        'v_lines': [],
+        'x_ticks': {'positions': positions[::step], 'labels': months[::step], 'rotate': step > 1},
+    }
+    if band is not None:
+        low, median, high = ([float(value) for value in curve] for curve in band)
+        spec['legend'] = 'best'
+        spec['ranges'].append({'name': get_text(language, 'simulation', 'band_label'), 'x': positions,
+                               'low': low, 'high': high, 'color': MATPLOTLIB_BLUE, 'opacity': 0.2})
+        spec['series'].append({'name': get_text(language, 'simulation', 'median_label'), 'x': positions,
+                               'y': median, 'color': MATPLOTLIB_BLUE, 'lines': True, 'markers': False,
+                               'marker': 'circle', 'dash': 'dot', 'hover': None})
+    return spec
+
+
+def sweep_chart(language, result):
+    """
+    Heatmap of a sensitivity sweep with the current inputs highlighted.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        result (dict): As returned by utils.sensitivity.sweep; its arrays are shared, not copied
+
+    Returns:
+        dict: Chart description
+    """
+    question = result['question']
+    current_x, current_y = result['current']
+    return {
+        'type': 'heatmap',
+        'title': get_text(language, 'sensitivity', f'{question}_title'),
+        'x_title': get_text(language, 'sensitivity', result['x_key']),
+        'y_title': get_text(language, 'sensitivity', result['y_key']),
+        'legend': 'top right',
+        'grid': False,
+        'x': result['x'],
+        'y': result['y'],
+        'values': result['values'],
+        # Green where tests can be added, red where the suite decays
+        'diverging': question == 'q3',
+        'colorbar_title': get_text(language, 'sensitivity', f'{question}_colorbar'),
+        'point': {'name': get_text(language, 'sensitivity', 'current_point'),
+                  'x': float(current_x), 'y': float(current_y)},
+    }
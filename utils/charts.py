@@ -0,0 +1,272 @@
+# charts.py
+"""
+Charts and report data for the pages and the executive summary, built
+without Streamlit so the app, benchmarks and batch report generation share
+them. The charts are chart descriptions (utils.chart_specs): the pages
+render them here as Plotly or Matplotlib figures, the executive summary
+draws them as vector graphics. The figures of the question pages are kept
+on their scenario (utils.scenario), so unchanged pages rerender without
+rebuilding them; shared figures must not be modified.
+Matplotlib figures are created without pyplot (utils.figures) and released
+as soon as they are rendered, so reruns don't accumulate them. Matplotlib is
+only imported when a figure is rendered with it, so pages showing only Plotly
+charts don't load it.
+"""
+
+from io import BytesIO
+
+import plotly.graph_objs as go
+import numpy as np
+from utils.memo import memoize
+from utils.chart_specs import q1_chart, q2_chart, q3_chart, sweep_chart
+from utils.scenario import get_scenario
+from utils.sensitivity import sweep
+
+
+# Line styles of the dash names used in chart descriptions
+MATPLOTLIB_DASHES = {None: '-', 'dash': '--', 'dot': ':'}
+MATPLOTLIB_MARKERS = {'circle': 'o', 'diamond': 'D'}
+
+
+def plotly_figure(spec):
+    """
+    Render a chart description (see utils.chart_specs) as an interactive Plotly figure.
+
+    Args:
+        spec (dict): Chart description
+
+    Returns:
+        plotly.graph_objs.Figure
+    """
+    fig = go.Figure()
+    if spec['type'] == 'bar':
+        hover_template = f"{spec['x_title']}=%{{x}}<br>{spec['y_title']}=%{{y:.2f}}<extra></extra>"
+        for bar in spec['bars']:
+            error_y = None
+            if bar['error'] is not None:
+                minus, plus = bar['error']
+                error_y = dict(type='data', symmetric=False, array=[plus], arrayminus=[minus])
+            fig.add_trace(go.Bar(x=[bar['label']], y=[bar['value']], name=bar['label'],
+                                 marker_color=bar['color'], error_y=error_y, hovertemplate=hover_template))
+        fig.update_layout(barmode='relative', legend_title_text=spec['legend_title'])
+    else:
+        for band in spec['ranges']:
+            fig.add_trace(go.Scatter(x=band['x'], y=band['high'], mode='lines', line=dict(width=0),
+                                     showlegend=False, hoverinfo='skip'))
+            fig.add_trace(go.Scatter(x=band['x'], y=band['low'], mode='lines', line=dict(width=0),
+                                     fill='tonexty', fillcolor=band['color'], opacity=band['opacity'],
+                                     name=band['name'], hoverinfo='skip'))
+        for series in spec['series']:
+            mode = '+'.join(part for part, shown in (('lines', series['lines']), ('markers', series['markers'])) if shown)
+            fig.add_trace(go.Scatter(
+                x=series['x'], y=series['y'], mode=mode,
+                name=series['name'], showlegend=series['name'] is not None,
+                line=dict(color=series['color'], dash=series['dash'] or 'solid'),
+                marker=dict(color=series['color'], symbol=series['marker'],
+                            size=6 if series['lines'] else 10),
+                hovertemplate=series['hover'],
+            ))
+        for line in spec['h_lines']:
+            fig.add_hline(y=line['y'], line_dash=line['dash'] or 'solid', line_color=line['color'],
+                          annotation_text=line['name'], annotation_position="top right")
+        for interval in spec['x_spans']:
+            fig.add_vrect(x0=interval['x0'], x1=interval['x1'], fillcolor=interval['color'],
+                          opacity=interval['opacity'], line_width=0,
+                          annotation_text=interval['name'], annotation_position="top left")
+        for line in spec['v_lines']:
+            fig.add_vline(x=line['x'], line_dash=line['dash'] or 'solid', line_color=line['color'])
+        if spec['x_ticks'] is not None:
+            fig.update_xaxes(tickvals=spec['x_ticks']['positions'], ticktext=spec['x_ticks']['labels'])
+
+    fig.update_layout(title=spec['title'], xaxis_title=spec['x_title'], yaxis_title=spec['y_title'])
+    if spec['legend'] == 'top right':
+        fig.update_layout(legend=dict(yanchor="top", y=0.99, xanchor="right", x=0.99))
+    return fig
+
+
+def matplotlib_figure(spec):
+    """
+    Render a chart description (see utils.chart_specs) as a Matplotlib figure.
+
+    Args:
+        spec (dict): Chart description
+
+    Returns:
+        matplotlib.figure.Figure: Release it with utils.figures.release_figure once it is drawn
+    """
+    from utils.figures import new_figure
+
+    fig = new_figure()
+    ax = fig.subplots()
+    if spec['type'] == 'heatmap':
+        _plot_heatmap(fig, ax, spec)
+    elif spec['type'] == 'bar':
+        bars = spec['bars']
+        errors = [bar['error'] or (0, 0) for bar in bars]
+        ax.bar([bar['label'] for bar in bars], [bar['value'] for bar in bars],
+               color=[bar['color'] for bar in bars],
+               yerr=np.array(errors).T if any(bar['error'] for bar in bars) else None, capsize=4)
+    else:
+        for series in spec['series'][:1]:
+            _plot_series(ax, series)
+        for band in spec['ranges']:
+            ax.fill_between(band['x'], band['low'], band['high'], color=band['color'],
+                            alpha=band['opacity'], label=band['name'])
+        for series in spec['series'][1:]:
+            _plot_series(ax, series)
+        for interval in spec['x_spans']:
+            ax.axvspan(interval['x0'], interval['x1'], color=interval['color'], alpha=interval['opacity'],
+                       linewidth=0, label=interval['name'])
+        for line in spec['v_lines']:
+            ax.axvline(line['x'], color=line['color'], linestyle=MATPLOTLIB_DASHES[line['dash']])
+        for line in spec['h_lines']:
+            ax.axhline(line['y'], color=line['color'], linestyle=MATPLOTLIB_DASHES[line['dash']],
+                       linewidth=line['width'], label=line['name'])
+        ticks = spec['x_ticks']
+        if ticks is not None:
+            ax.set_xticks(ticks['positions'])
+            ax.set_xticklabels(ticks['labels'], rotation=45 if ticks['rotate'] else 0,
+                               ha='right' if ticks['rotate'] else 'center')
+    if spec['legend'] is not None:
+        ax.legend(loc='upper right' if spec['legend'] == 'top right' else 'best')
+    if spec['title']:
+        ax.set_title(spec['title'])
+    ax.set_xlabel(spec['x_title'])
+    ax.set_ylabel(spec['y_title'])
+    ax.grid(spec['grid'])
+    return fig
+
+
+def _plot_heatmap(fig, ax, spec):
+    from matplotlib.colors import Normalize
+
+    x, y, values = spec['x'], spec['y'], spec['values']
+    extent = (x[0], x[-1], y[0], y[-1])
+    if spec['diverging']:
+        low, high = np.nanmin(values), np.nanmax(values)
+        limit = max(abs(low), abs(high), 1e-9)
+        image = ax.imshow(values, origin='lower', aspect='auto', extent=extent,
+                          cmap='RdYlGn', norm=Normalize(vmin=-limit, vmax=limit))
+        if low < 0 < high:
+            ax.contour(x, y, values, levels=[0], colors='black', linewidths=0.8)
+    else:
+        # Fewer runs are better, so they are drawn bright
+        image = ax.imshow(values, origin='lower', aspect='auto', extent=extent, cmap='viridis_r')
+    fig.colorbar(image, ax=ax, label=spec['colorbar_title'])
+    point = spec['point']
+    ax.plot(point['x'], point['y'], marker='o', markersize=9, color='white', markeredgecolor='black',
+            linestyle='none', label=point['name'])
+
+
+def render_png(spec, dpi=200):
+    """
+    Render a chart description to PNG with Matplotlib, releasing the figure afterwards.
+
+    Args:
+        spec (dict): Chart description
+        dpi (int): Resolution
+
+    Returns:
+        bytes: PNG image
+    """
+    from utils.figures import release_figure
+
+    fig = matplotlib_figure(spec)
+    try:
+        buffer = BytesIO()
+        fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        release_figure(fig)
+
+
+def _plot_series(ax, series):
+    ax.plot(series['x'], series['y'], color=series['color'],
+            linestyle=MATPLOTLIB_DASHES[series['dash']] if series['lines'] else 'none',
+            marker=MATPLOTLIB_MARKERS[series['marker']] if series['markers'] else None,
+            label=series['name'])
+
+
+def build_q1_chart(language, manual_time, auto_time, time_savings, band=None):
+    """
+    Bar chart comparing manual, automated and saved time per run.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        manual_time (float): Manual test run time in hours
+        auto_time (float): Automated test run time in hours
+        time_savings (float): Hours saved per run
+        band (tuple): (P10, P50, P90) of the hours saved, drawn as an error bar
+
+    Returns:
+        plotly.graph_objs.Figure
+    """
+    return plotly_figure(q1_chart(language, manual_time, auto_time, time_savings, band))
+
+
+def build_q2_chart(language, investment, savings_per_run, runs_to_break_even, band=None):
+    """
+    Line chart of cumulative time savings per run against the initial investment.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        investment (float): Initial investment in hours
+        savings_per_run (float): Time savings per run in hours, must be > 0
+        runs_to_break_even (int): Runs needed to break even
+        band (tuple): (P10, P50, P90) of the runs needed, drawn as a shaded range
+
+    Returns:
+        plotly.graph_objs.Figure
+    """
+    return plotly_figure(q2_chart(language, investment, savings_per_run, runs_to_break_even, band))
+
+
+def build_q3_chart(language, potential_array, start=None, band=None):
+    """
+    Trend of the potential to add more tests over the projected months.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        potential_array (list): Potential (P) per month
+        start (tuple): (year, month) the projection starts after, defaults to the current month
+        band (tuple): (P10, P50, P90) curves of the potential, drawn as a shaded range
+
+    Returns:
+        matplotlib.figure.Figure: Release it with utils.figures.release_figure once it is drawn
+    """
+    return matplotlib_figure(q3_chart(language, potential_array, start, band))
+
+
+@memoize(maxsize=32)
+def render_sweep_chart_png(language, inputs, question, x_key, y_key, span, steps):
+    """
+    The sensitivity heatmap rendered to PNG, for the pages.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        inputs, question, x_key, y_key, span, steps: As taken by utils.sensitivity.sweep
+
+    Returns:
+        bytes: PNG image
+    """
+    return render_png(sweep_chart(language, sweep(inputs, question, x_key, y_key, span, steps)))
+
+
+def build_questions_data(language, inputs, with_charts=True):
+    """
+    Build results and charts of the answered questions for the executive summary.
+
+    Shorthand for the questions_data of the shared scenario of these inputs
+    (see utils.scenario): results and charts already computed for the pages
+    are reused.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        inputs (dict): Input values and uncertainty settings, keyed as in user_inputs.json
+            (see INPUT_KEYS, SETTINGS_KEYS and SWEEP_KEYS)
+        with_charts (bool): Build the charts, 'chart' is None otherwise
+
+    Returns:
+        dict: questions_data as expected by generate_executive_summary, shared, don't modify it
+    """
+    return get_scenario(inputs).questions_data(language, with_charts)
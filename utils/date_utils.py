@@ -1,36 +1,89 @@
 # date_utils.py
 
 import datetime
-from utils.translations import get_months
+from functools import lru_cache
+from utils.translations import get_months, get_text
+from utils.calculations import MAX_PROJECTION_MONTHS
+
+
+def current_month():
+    """
+    Get the current month.
+
+    Returns:
+        tuple: (year, month)
+    """
+    today = datetime.date.today()
+    return today.year, today.month
+
+
+@lru_cache(maxsize=64)
+def _month_labels(language, start, with_year):
+    """
+    Labels of the MAX_PROJECTION_MONTHS months following `start`.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', or 'lb')
+        start (tuple): (year, month) the projection starts after
+        with_year (bool): Append the year, e.g. 'Jan 2027'
+
+    Returns:
+        tuple: Month labels
+    """
+    month_names = get_months(language)
+    year, month = start
+    labels = []
+    for offset in range(month, month + MAX_PROJECTION_MONTHS):
+        name = month_names[offset % 12]
+        labels.append(f"{name} {year + offset // 12}" if with_year else name)
+    return tuple(labels)
+
+
+def month_labels(language='en', months=6, start=None):
+    """
+    Generate labels for the months following `start`, in the specified language.
+
+    Labels carry the year once the horizon is longer than a year, so months
+    don't repeat.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', or 'lb')
+        months (int): Number of months, at most MAX_PROJECTION_MONTHS
+        start (tuple): (year, month) to start after, defaults to the current month
+
+    Returns:
+        list: List of `months` month labels
+    """
+    start = start or current_month()
+    return list(_month_labels(language, start, months > 12)[:months])
 
 
 def generate_next_6_months(language='en'):
     """
     Generate a list of the next 6 month abbreviations in the specified language.
-    
+
     Args:
         language (str): Language code ('en', 'de', 'fr', or 'lb')
-        
+
     Returns:
         list: List of 6 month abbreviations
     """
-    # Get the current month and year
-    current_date = datetime.datetime.now()
-    current_month = current_date.month
-    current_year = current_date.year
+    return month_labels(language, 6)
 
-    # Get month names for the selected language
-    month_names = get_months(language)
 
-    # Generate the next 6 months
-    months = []
-    for i in range(1, 7):  # Start from 1 to get the next month
-        month = current_month + i
-        year = current_year
-        if month > 12:
-            month -= 12
-            year += 1
-        # Use month index (1-12) to get localized month name
-        months.append(month_names[month - 1])
-
-    return months
+def format_horizon(language, months):
+    """
+    Format a projection horizon, e.g. '6 months' or '2 years'.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', or 'lb')
+        months (int): Horizon in months
+
+    Returns:
+        str: Localized horizon
+    """
+    if months == 12:
+        return get_text(language, 'question3', 'horizon_one_year')
+    if months % 12 == 0:
+        return get_text(language, 'question3', 'horizon_years').format(count=months // 12)
+    return get_text(language, 'question3', 'horizon_months').format(count=months)
@@ -0,0 +1,90 @@
+# figures.py
+"""
+Matplotlib figure lifecycle for the long-running server.
+
+Figures are created with the object-oriented API (matplotlib.figure.Figure
+on an Agg canvas) instead of pyplot, so no global figure registry keeps
+them alive between reruns. Every figure is released explicitly once it has
+been drawn, and the number of live figures has a ceiling: new_figure()
+waits for a figure to be released once it is reached, so memory held by
+figures stays bounded however many sessions render at the same time.
+
+The ceiling is configured with an environment variable:
+    TAC_MAX_FIGURES     - figures alive at the same time (default 16)
+"""
+
+import gc
+import os
+import threading
+import time
+import weakref
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+MAX_LIVE_FIGURES = int(os.environ.get('TAC_MAX_FIGURES', 16))
+
+# Seconds new_figure() waits for a free slot before giving up
+FIGURE_WAIT = 30
+
+_live_figures = weakref.WeakSet()
+_released = threading.Condition()
+
+
+class FigureLimitReached(Exception):
+    """
+    Raised by new_figure() when no figure was released within the wait time.
+    """
+
+
+def new_figure(timeout=FIGURE_WAIT, **kwargs):
+    """
+    Create a figure on an Agg canvas, waiting while MAX_LIVE_FIGURES are alive.
+
+    Args:
+        timeout (float): Seconds to wait for a free slot
+        **kwargs: Passed to matplotlib.figure.Figure
+
+    Returns:
+        matplotlib.figure.Figure: Release it with release_figure() once it is drawn
+
+    Raises:
+        FigureLimitReached: If no slot became free within the timeout
+    """
+    deadline = time.monotonic() + timeout
+    with _released:
+        while len(_live_figures) >= MAX_LIVE_FIGURES:
+            # Figures that were dropped without release are only freed by the cycle collector
+            gc.collect()
+            if len(_live_figures) < MAX_LIVE_FIGURES:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise FigureLimitReached(f"{len(_live_figures)} figures alive")
+            _released.wait(min(remaining, 0.5))
+        fig = Figure(**kwargs)
+        FigureCanvasAgg(fig)
+        _live_figures.add(fig)
+    return fig
+
+
+def release_figure(fig):
+    """
+    Clear a figure and free its slot. The figure must not be used afterwards.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figure created by new_figure()
+    """
+    fig.clear()
+    with _released:
+        _live_figures.discard(fig)
+        _released.notify()
+
+
+def live_figures():
+    """
+    Returns:
+        int: Number of figures created and not yet released or freed
+    """
+    with _released:
+        return len(_live_figures)
@@ -0,0 +1,537 @@
+# history.py
+"""
+Versioned history of the saved input values.
+
+Every input set saved through utils.persistence is recorded as an immutable
+version: one JSON line appended to a log file. An index file next to it
+holds a fixed-size entry per version (log offset and length, save time,
+namespace and the namespace's previous version) and is read through mmap,
+so a version is found from its number in constant time, and the versions
+of a namespace are listed newest first by following the previous-version
+links, without scanning the log.
+
+Versions are never changed: restoring an old version saves its values
+again as a new version, and clearing the inputs records an empty one.
+Once the log outgrows its size cap, or the index spans more than twice the
+version cap, it is compacted: of the newest `max_versions` versions, the
+newest `keep` of every namespace stay, older versions are dropped. The log
+and its index therefore stay bounded however many namespaces save inputs;
+version numbers stay the same.
+
+The default history is configured with environment variables:
+    TAC_HISTORY_PATH    - log file (default 'scenario_history.log'), the index is '<path>.idx'
+    TAC_HISTORY_MAX_MB  - log size that triggers compaction (default 16)
+    TAC_HISTORY_KEEP    - versions kept per namespace by compaction (default 100)
+    TAC_HISTORY_MAX_VERSIONS - newest versions compaction keeps of all namespaces together (default 10000)
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+from utils.storage import file_lock
+
+# Index header: magic, format version, number of the first indexed version
+_HEADER = struct.Struct('<4sIQ')
+_MAGIC = b'TACH'
+_FORMAT = 1
+
+# Index entry of a version: log offset, record length (0 once compacted away),
+# previous version of the namespace (-1 for none), save time, namespace digest
+_ENTRY = struct.Struct('<QIqd8s')
+
+# Errors the history may raise when its files are unavailable or damaged
+HISTORY_ERRORS = (OSError, ValueError)
+
+
+def _digest(namespace):
+    return hashlib.blake2b(namespace.encode('utf-8'), digest_size=8).digest()
+
+
+class ScenarioHistory:
+    """
+    Append-only log of saved input sets with a memory-mapped offset index.
+
+    Can be shared between threads and processes: appends and compaction
+    hold a file lock, and every call first picks up versions appended and
+    compactions done by other processes. A damaged or missing index is
+    rebuilt from the log.
+    """
+
+    def __init__(self, path, max_bytes=16 * 1024 * 1024, keep=100, max_versions=10000):
+        self.path = path
+        self.index_path = path + '.idx'
+        self.max_bytes = max_bytes
+        self.keep = max(int(keep), 1)
+        self.max_versions = max(int(max_versions), 1)
+        self._lock = threading.RLock()
+        self._log = None
+        self._index = None
+        self._map = None
+        self._identity = None
+        self._first = 1
+        self._count = 0
+        # Namespace digest -> latest version
+        self._heads = {}
+        self._compact_at = max_bytes
+        self._stats = {'appends': 0, 'compactions': 0, 'rebuilds': 0}
+
+    # Files
+
+    def _close_files(self):
+        if self._map is not None:
+            self._map.close()
+        for file in (self._index, self._log):
+            if file is not None:
+                file.close()
+        self._log = self._index = self._map = None
+
+    def _open(self):
+        """
+        Open the log and its index, creating or rebuilding the index as needed.
+        Must be called while holding the file lock.
+        """
+        self._close_files()
+        self._log = open(self.path, 'a+b')
+        try:
+            self._index = open(self.index_path, 'r+b')
+        except FileNotFoundError:
+            self._index = None
+        if self._index is None or not self._load_index():
+            self._rebuild_index()
+
+    def _load_index(self):
+        """
+        Map the index and check it against the log.
+
+        Returns:
+            bool: False if the index is damaged or doesn't match the log
+        """
+        size = os.fstat(self._index.fileno()).st_size
+        if size < _HEADER.size:
+            return False
+        self._map = mmap.mmap(self._index.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, file_format, first = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or file_format != _FORMAT:
+            return False
+        self._first = first
+        self._count = (size - _HEADER.size) // _ENTRY.size
+        if (size - _HEADER.size) % _ENTRY.size:
+            # An append was interrupted, drop the partial entry
+            self._index.truncate(_HEADER.size + self._count * _ENTRY.size)
+            self._remap()
+
+        # The last record must be where the index says, anything after it is an interrupted append
+        log_size = os.fstat(self._log.fileno()).st_size
+        end = 0
+        for version in range(self._first + self._count - 1, self._first - 1, -1):
+            entry = self._entry(version)
+            if entry is not None:
+                end = entry[0] + entry[1]
+                if end > log_size:
+                    return False
+                try:
+                    self._read(version, entry)
+                except (ValueError, KeyError, TypeError):
+                    return False
+                break
+        if end == 0 and log_size > 0 and self._count == 0:
+            return False
+        if log_size > end:
+            self._log.truncate(end)
+
+        self._heads = {}
+        self._scan(0)
+        self._identity = self._file_identity(os.fstat(self._index.fileno()))
+        return True
+
+    def _rebuild_index(self):
+        """
+        Write a new index from the records in the log.
+        Must be called while holding the file lock.
+        """
+        if self._map is not None:
+            self._map.close()
+        if self._index is not None:
+            self._index.close()
+        self._index = self._map = None
+        entries = []
+        heads = {}
+        offset = 0
+        self._log.seek(0)
+        for line in self._log:
+            try:
+                record = json.loads(line)
+                version, namespace, saved = int(record['version']), record['namespace'], float(record['time'])
+            except (ValueError, KeyError, TypeError):
+                version = None
+            # Versions only grow, anything else is a damaged record
+            if version is not None and (not entries or version > entries[-1][0]):
+                digest = _digest(namespace)
+                entries.append((version, offset, len(line), heads.get(digest, -1), saved, digest))
+                heads[digest] = version
+            offset += len(line)
+
+        first = entries[0][0] if entries else self._first + self._count
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                self._write_index(f, first, entries)
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        if entries:
+            self._stats['rebuilds'] += 1
+        self._index = open(self.index_path, 'r+b')
+        if not self._load_index():
+            raise ValueError(f"Could not rebuild the history index of {self.path}")
+
+    @staticmethod
+    def _write_index(f, first, entries):
+        """
+        Write an index with `entries` [(version, offset, length, previous, time, digest)],
+        leaving empty entries for the versions missing between them.
+        """
+        f.write(_HEADER.pack(_MAGIC, _FORMAT, first))
+        expected = first
+        for version, offset, length, previous, saved, digest in entries:
+            f.write(_ENTRY.pack(0, 0, -1, 0.0, b'\0' * 8) * (version - expected))
+            f.write(_ENTRY.pack(offset, length, previous, saved, digest))
+            expected = version + 1
+
+    @staticmethod
+    def _file_identity(stat):
+        return (stat.st_dev, stat.st_ino)
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._index.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _scan(self, start):
+        """
+        Update the namespace heads from the index entries from position `start` on.
+        """
+        for position in range(start, self._count):
+            offset, length, _, _, digest = _ENTRY.unpack_from(self._map, _HEADER.size + position * _ENTRY.size)
+            if length:
+                self._heads[digest] = self._first + position
+
+    def _refresh(self, locked=False):
+        """
+        Open the files on first use and pick up changes made by other processes.
+
+        Args:
+            locked (bool): Whether the caller holds the file lock already
+        """
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            stat = None
+        if self._index is None or stat is None or self._file_identity(stat) != self._identity:
+            # Opened for the first time, or compacted or rebuilt by another process
+            if locked:
+                self._open()
+            else:
+                with file_lock(self.path):
+                    self._open()
+            return
+        count = (stat.st_size - _HEADER.size) // _ENTRY.size
+        if count > self._count:
+            start, self._count = self._count, count
+            self._remap()
+            self._scan(start)
+
+    # Records
+
+    def _entry(self, version):
+        """
+        Index entry (offset, length, previous, time, digest) of a version, None if it doesn't exist.
+        """
+        position = version - self._first
+        if not 0 <= position < self._count:
+            return None
+        offset = _HEADER.size + position * _ENTRY.size
+        if offset + _ENTRY.size > len(self._map):
+            self._remap()
+        entry = _ENTRY.unpack_from(self._map, offset)
+        return entry if entry[1] else None
+
+    def _read(self, version, entry):
+        self._log.seek(entry[0])
+        record = json.loads(self._log.read(entry[1]))
+        if record['version'] != version:
+            raise ValueError(f"History index out of sync with {self.path} at version {version}")
+        return record
+
+    def _append(self, namespace, values):
+        """
+        Append a version. Must be called while holding both locks.
+        """
+        digest = _digest(namespace)
+        version = self._first + self._count
+        previous = self._heads.get(digest, -1)
+        saved = time.time()
+        line = json.dumps({'version': version, 'namespace': namespace, 'time': saved, 'values': values},
+                          sort_keys=True).encode('utf-8') + b'\n'
+        offset = self._log.seek(0, os.SEEK_END)
+        self._log.write(line)
+        self._log.flush()
+        # The log record is written first, so an index entry never points past the log
+        self._index.seek(0, os.SEEK_END)
+        self._index.write(_ENTRY.pack(offset, len(line), previous, saved, digest))
+        self._index.flush()
+        self._count += 1
+        self._heads[digest] = version
+        self._stats['appends'] += 1
+        if offset + len(line) > self._compact_at or self._count > 2 * self.max_versions:
+            self._compact()
+        return version
+
+    def record(self, namespace, values):
+        """
+        Record a saved input set as a new version of a namespace.
+
+        Nothing is recorded if the values equal the namespace's latest
+        version, or if a namespace without versions is saved empty.
+
+        Args:
+            namespace (str): User or session id
+            values (dict): Input values as saved, JSON serializable
+
+        Returns:
+            int: The new version, or None if nothing was recorded
+        """
+        digest = _digest(namespace)
+        with self._lock, file_lock(self.path):
+            self._refresh(locked=True)
+            head = self._heads.get(digest)
+            if head is None:
+                if not values:
+                    return None
+            elif self._read(head, self._entry(head))['values'] == values:
+                return None
+            return self._append(namespace, values)
+
+    def latest(self, namespace):
+        """
+        Args:
+            namespace (str): User or session id
+
+        Returns:
+            int: Latest version of the namespace, None if it has none
+        """
+        with self._lock:
+            self._refresh()
+            return self._heads.get(_digest(namespace))
+
+    def versions(self, namespace, limit=20, before=None):
+        """
+        List versions of a namespace, newest first.
+
+        Takes time in proportion to `limit`, not to the size of the history.
+
+        Args:
+            namespace (str): User or session id
+            limit (int): Most versions to list
+            before (int): List the versions older than this version of the namespace
+
+        Returns:
+            list: [{'version': int, 'time': float (seconds since the epoch)}]
+        """
+        digest = _digest(namespace)
+        listed = []
+        with self._lock:
+            self._refresh()
+            if before is None:
+                version = self._heads.get(digest, -1)
+            else:
+                entry = self._entry(before)
+                version = entry[2] if entry is not None and entry[4] == digest else -1
+            while version >= 0 and len(listed) < limit:
+                entry = self._entry(version)
+                # Older versions were compacted away
+                if entry is None or entry[4] != digest:
+                    break
+                listed.append({'version': version, 'time': entry[3]})
+                version = entry[2]
+        return listed
+
+    def load(self, version, namespace):
+        """
+        Load a version.
+
+        Args:
+            version (int): Version number
+            namespace (str): User or session id the version must belong to
+
+        Returns:
+            dict: {'version': int, 'namespace': str, 'time': float, 'values': dict}
+
+        Raises:
+            KeyError: If the version doesn't exist, was compacted away or belongs to another namespace
+        """
+        with self._lock:
+            self._refresh()
+            entry = self._entry(version)
+            if entry is None or entry[4] != _digest(namespace):
+                raise KeyError(version)
+            record = self._read(version, entry)
+        if record['namespace'] != namespace:
+            raise KeyError(version)
+        return record
+
+    def compare(self, version_a, version_b, namespace):
+        """
+        Compare the values of two versions.
+
+        Args:
+            version_a (int): First version
+            version_b (int): Second version
+            namespace (str): User or session id both versions must belong to
+
+        Returns:
+            dict: key -> (value in version_a, value in version_b) for every key that differs,
+                with None where a version doesn't have the key
+
+        Raises:
+            KeyError: As for load()
+        """
+        values_a = self.load(version_a, namespace)['values']
+        values_b = self.load(version_b, namespace)['values']
+        return {key: (values_a.get(key), values_b.get(key)) for key in sorted(values_a.keys() | values_b.keys())
+                if values_a.get(key) != values_b.get(key)}
+
+    # Compaction
+
+    def compact(self):
+        """
+        Rewrite the log with the newest `keep` versions of every namespace,
+        out of the newest `max_versions` versions.
+
+        Returns:
+            int: Number of versions dropped
+        """
+        with self._lock, file_lock(self.path):
+            self._refresh(locked=True)
+            return self._compact()
+
+    def _compact(self):
+        """
+        Must be called while holding both locks.
+        """
+        kept = []
+        counts = {}
+        dropped = 0
+        last = self._first + self._count - 1
+        for version in range(last, self._first - 1, -1):
+            entry = self._entry(version)
+            if entry is None:
+                continue
+            digest = entry[4]
+            # Versions beyond the global cap go whatever their namespace, so namespaces
+            # that are no longer used don't keep the log and the index from shrinking
+            if version <= last - self.max_versions or counts.get(digest, 0) >= self.keep:
+                dropped += 1
+                continue
+            counts[digest] = counts.get(digest, 0) + 1
+            kept.append((version, entry))
+        kept.reverse()
+        kept_versions = {version for version, _ in kept}
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        log_fd, log_tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        index_fd, index_tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            entries = []
+            offset = 0
+            with os.fdopen(log_fd, 'wb') as f:
+                for version, (old_offset, length, previous, saved, digest) in kept:
+                    self._log.seek(old_offset)
+                    f.write(self._log.read(length))
+                    entries.append((version, offset, length, previous if previous in kept_versions else -1,
+                                    saved, digest))
+                    offset += length
+            first = kept[0][0] if kept else self._first + self._count
+            with os.fdopen(index_fd, 'wb') as f:
+                self._write_index(f, first, entries)
+            # The index is replaced first: if the log isn't replaced as well, the index
+            # doesn't match it and is rebuilt from the old log on the next open
+            os.replace(index_tmp, self.index_path)
+            os.replace(log_tmp, self.path)
+        except BaseException:
+            for path in (log_tmp, index_tmp):
+                if os.path.exists(path):
+                    os.unlink(path)
+            raise
+        self._stats['compactions'] += 1
+        self._open()
+        # Don't compact again right away if the kept versions alone fill most of the cap
+        self._compact_at = max(self.max_bytes, 2 * offset)
+        return dropped
+
+    def get_stats(self):
+        """
+        Get the size of the history and its counters.
+
+        Returns:
+            dict: 'first' and 'last' version, 'log_bytes', and 'appends', 'compactions', 'rebuilds' counts
+        """
+        with self._lock:
+            self._refresh()
+            stats = dict(self._stats)
+            stats['first'] = self._first
+            stats['last'] = self._first + self._count - 1
+            stats['log_bytes'] = os.fstat(self._log.fileno()).st_size
+        return stats
+
+    def close(self):
+        """
+        Close the files. The history reopens them when used again.
+        """
+        with self._lock:
+            self._close_files()
+            self._identity = None
+
+
+_default_history = None
+_default_history_lock = threading.Lock()
+
+
+def get_history():
+    """
+    Get the process-wide history, configured from the environment on first use.
+
+    Returns:
+        ScenarioHistory: The shared history
+    """
+    global _default_history
+    if _default_history is None:
+        with _default_history_lock:
+            if _default_history is None:
+                _default_history = ScenarioHistory(
+                    os.environ.get('TAC_HISTORY_PATH', 'scenario_history.log'),
+                    max_bytes=int(float(os.environ.get('TAC_HISTORY_MAX_MB', 16)) * 1024 * 1024),
+                    keep=int(os.environ.get('TAC_HISTORY_KEEP', 100)),
+                    max_versions=int(os.environ.get('TAC_HISTORY_MAX_VERSIONS', 10000)),
+                )
+    return _default_history
+
+
+def set_history(history):
+    """
+    Replace the process-wide history, e.g. with one in a temporary directory.
+
+    Args:
+        history (ScenarioHistory): History to record to from now on
+    """
+    global _default_history
+    with _default_history_lock:
+        _default_history = history
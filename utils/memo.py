@@ -0,0 +1,109 @@
+# memo.py
+"""
+Bounded, time-limited memoization for results and figures that the pages
+would otherwise rebuild on every Streamlit rerun.
+
+Memoized values are shared between sessions and must be treated as
+read-only by callers. Set TAC_MEMO=0 to disable memoization.
+"""
+
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+_enabled = os.environ.get('TAC_MEMO', '1') != '0'
+_registry = []
+
+
+def memoize(maxsize=128, ttl=600):
+    """
+    Memoize a function on its (hashable) arguments.
+
+    Args:
+        maxsize (int): Maximum number of cached results, least recently used are evicted
+        ttl (float): Seconds a cached result stays valid
+
+    Returns:
+        callable: Decorator. The wrapped function gets cache_info() and cache_clear()
+    """
+    def decorator(func):
+        entries = OrderedDict()
+        stats = {'hits': 0, 'misses': 0}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(key)
+                if entry is not None and now - entry[0] < ttl:
+                    entries.move_to_end(key)
+                    stats['hits'] += 1
+                    return entry[1]
+                stats['misses'] += 1
+            value = func(*args, **kwargs)
+            with lock:
+                entries[key] = (now, value)
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return value
+
+        def cache_info():
+            with lock:
+                return {'hits': stats['hits'], 'misses': stats['misses'],
+                        'size': len(entries), 'maxsize': maxsize, 'ttl': ttl}
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+                stats['hits'] = 0
+                stats['misses'] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        _registry.append(wrapper)
+        return wrapper
+    return decorator
+
+
+def set_enabled(enabled):
+    """
+    Turn memoization on or off for all memoized functions.
+
+    Args:
+        enabled (bool): Whether to serve cached results
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    """
+    Returns:
+        bool: Whether memoization is on
+    """
+    return _enabled
+
+
+def clear_all():
+    """
+    Drop the cached results and counters of all memoized functions.
+    """
+    for wrapper in _registry:
+        wrapper.cache_clear()
+
+
+def get_stats():
+    """
+    Get the counters of all memoized functions.
+
+    Returns:
+        dict: 'module.function' -> cache_info()
+    """
+    return {f"{wrapper.__module__}.{wrapper.__name__}": wrapper.cache_info() for wrapper in _registry}
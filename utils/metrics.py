@@ -0,0 +1,299 @@
+# metrics.py
+"""
+Lightweight timing spans and metrics for the app.
+
+Wrap a stage in `with span('question1.figure'):` to time it. Durations are
+aggregated into a histogram per span name, which can be exported in the
+Prometheus text format (served on TAC_METRICS_PORT if set), appended to a
+JSONL file (TAC_METRICS_JSONL) and summarized in the sidebar debug panel.
+
+Metrics are off unless TAC_METRICS=1; a disabled span() returns a shared
+no-op context manager, so instrumentation costs one function call.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket upper bounds in seconds, as commonly used for latencies
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+_enabled = os.environ.get('TAC_METRICS', '0') == '1'
+_NULL_SPAN = nullcontext()
+
+_histograms = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+_jsonl_file = None
+_jsonl_lock = threading.Lock()
+_server = None
+_configured = False
+_configure_lock = threading.Lock()
+
+
+class _Histogram:
+    __slots__ = ('counts', 'count', 'sum', 'last', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.last = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, seconds):
+        for index, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.sum += seconds
+        self.last = seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation within its bucket,
+        narrowed to the observed minimum and maximum.
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(BUCKETS, self.counts):
+            if count and cumulative + count >= target:
+                lower = max(lower, self.min)
+                upper = min(bound, self.max)
+                return lower + (upper - lower) * (target - cumulative) / count
+            cumulative += count
+            lower = bound
+        return self.max
+
+
+class _Span:
+    __slots__ = ('name', 'start', 'parent')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1] if stack else None
+        stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        _local.stack.pop()
+        record(self.name, seconds, self.parent)
+        return False
+
+
+def span(name):
+    """
+    Time a stage.
+
+    Args:
+        name (str): Span name, dotted by area, e.g. 'pdf.layout'
+
+    Returns:
+        Context manager timing its block, a no-op if metrics are disabled
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def record(name, seconds, parent=None):
+    """
+    Record a duration measured elsewhere.
+
+    Args:
+        name (str): Span name
+        seconds (float): Duration
+        parent (str): Name of the enclosing span, if any
+    """
+    if not _enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = _Histogram()
+        histogram.observe(seconds)
+    if _jsonl_file is not None:
+        line = json.dumps({'ts': time.time(), 'span': name, 'parent': parent, 'seconds': seconds})
+        with _jsonl_lock:
+            if _jsonl_file is not None:
+                _jsonl_file.write(line + '\n')
+
+
+def set_enabled(enabled):
+    """
+    Turn metrics collection on or off.
+
+    Args:
+        enabled (bool): Whether spans are recorded
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    """
+    Returns:
+        bool: Whether spans are recorded
+    """
+    return _enabled
+
+
+def reset():
+    """
+    Drop all recorded histograms.
+    """
+    with _lock:
+        _histograms.clear()
+
+
+def summary():
+    """
+    Summarize the recorded spans, for the debug panel.
+
+    Returns:
+        list: One dict per span name, sorted by name:
+            {'span', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'last_ms'}
+    """
+    with _lock:
+        items = sorted(_histograms.items())
+        return [{
+            'span': name,
+            'count': histogram.count,
+            'mean_ms': round(histogram.sum / histogram.count * 1000, 2),
+            'p50_ms': round(histogram.quantile(0.5) * 1000, 2),
+            'p95_ms': round(histogram.quantile(0.95) * 1000, 2),
+            'last_ms': round(histogram.last * 1000, 2),
+        } for name, histogram in items]
+
+
+def prometheus_text():
+    """
+    Export the histograms in the Prometheus text exposition format.
+
+    Returns:
+        str: Metric family tac_span_seconds with one series per span name
+    """
+    lines = [
+        '# HELP tac_span_seconds Duration of instrumented app stages.',
+        '# TYPE tac_span_seconds histogram',
+    ]
+    with _lock:
+        for name, histogram in sorted(_histograms.items()):
+            label = name.replace('\\', '\\\\').replace('"', '\\"')
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram.counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'tac_span_seconds_bucket{{span="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'tac_span_seconds_sum{{span="{label}"}} {histogram.sum}')
+            lines.append(f'tac_span_seconds_count{{span="{label}"}} {histogram.count}')
+    return '\n'.join(lines) + '\n'
+
+
+def open_jsonl(path):
+    """
+    Append every recorded span to a JSONL file from now on.
+
+    Args:
+        path (str): File to append to
+    """
+    global _jsonl_file
+    with _jsonl_lock:
+        if _jsonl_file is not None:
+            _jsonl_file.close()
+        _jsonl_file = open(path, 'a', buffering=1, encoding='utf-8')
+
+
+def close_jsonl():
+    """
+    Stop writing spans to the JSONL file.
+    """
+    global _jsonl_file
+    with _jsonl_lock:
+        if _jsonl_file is not None:
+            _jsonl_file.close()
+            _jsonl_file = None
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = prometheus_text().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port, host='127.0.0.1'):
+    """
+    Serve prometheus_text() on http://host:port/metrics from a background thread.
+
+    Starting it again is a no-op.
+
+    Args:
+        port (int): Port to listen on
+        host (str): Interface to listen on
+
+    Returns:
+        ThreadingHTTPServer: The running server, or None if it couldn't be started
+    """
+    global _server
+    with _configure_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                print(f"Error starting metrics server on port {port}: {e}")
+                return None
+            threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
+    return _server
+
+
+def configure_from_environment():
+    """
+    Open the JSONL export and start the metrics server as configured by
+    TAC_METRICS_JSONL and TAC_METRICS_PORT, once per process. Only does
+    something if metrics are enabled.
+    """
+    global _configured
+    if not _enabled or _configured:
+        return
+    with _configure_lock:
+        if _configured:
+            return
+        _configured = True
+    path = os.environ.get('TAC_METRICS_JSONL')
+    if path:
+        open_jsonl(path)
+    port = os.environ.get('TAC_METRICS_PORT')
+    if port:
+        start_server(int(port), os.environ.get('TAC_METRICS_HOST', '127.0.0.1'))
+
+
+atexit.register(close_jsonl)
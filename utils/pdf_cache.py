@@ -0,0 +1,228 @@
+# pdf_cache.py
+"""
+Content-addressed cache for generated executive summary PDFs.
+
+Reports are keyed by a hash of (language, inputs, report version), so any
+change to the inputs or to the report layout produces a new key. A cached
+report shows the generation time it was built with. Entries live in an in-memory LRU tier and, optionally, in a size-capped directory
+shared between processes.
+
+The default cache used by the app is configured with environment variables:
+    TAC_PDF_CACHE_ENTRIES  - in-memory entries (default 32)
+    TAC_PDF_CACHE_DIR      - enables the on-disk tier in this directory
+    TAC_PDF_CACHE_MAX_MB   - size cap of the on-disk tier (default 100)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from utils.pdf_generator import REPORT_VERSION
+
+
+def report_key(language, inputs, version=REPORT_VERSION):
+    """
+    Build the cache key of a report.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        inputs (dict): Input values the report is generated from
+        version (str): Report layout version
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    payload = json.dumps({'language': language, 'inputs': inputs, 'version': version},
+                         sort_keys=True, default=float)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class PDFCache:
+    """
+    Two-tier (memory, disk) LRU cache of PDF bytes.
+    """
+
+    def __init__(self, max_entries=32, disk_dir=None, max_disk_bytes=100 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0,
+                       'memory_evictions': 0, 'disk_evictions': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pdf")
+
+    def get(self, key):
+        """
+        Look up a report.
+
+        Args:
+            key (str): Key from report_key()
+
+        Returns:
+            bytes: The PDF, or None if it isn't cached
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return data
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                # Refresh mtime so disk eviction stays least-recently-used
+                os.utime(path)
+            except OSError:
+                data = None
+            if data is not None:
+                with self._lock:
+                    self._stats['disk_hits'] += 1
+                    self._put_memory(key, data)
+                return data
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def put(self, key, data):
+        """
+        Store a report in all tiers.
+
+        Args:
+            key (str): Key from report_key()
+            data (bytes): The PDF
+        """
+        with self._lock:
+            self._put_memory(key, data)
+        if self.disk_dir and len(data) <= self.max_disk_bytes:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, self._disk_path(key))
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                return
+            self._trim_disk()
+
+    def _put_memory(self, key, data):
+        """
+        Insert into the memory tier and evict the least recently used entries.
+        Must be called while holding the lock.
+        """
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['memory_evictions'] += 1
+
+    def _trim_disk(self):
+        """
+        Delete the least recently used files until the disk tier fits its size cap.
+        """
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.pdf'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self._stats['disk_evictions'] += 1
+
+    def evict(self, key):
+        """
+        Remove a single report from all tiers.
+
+        Args:
+            key (str): Key from report_key()
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.disk_dir:
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+
+    def clear(self, disk=True):
+        """
+        Remove all reports.
+
+        Args:
+            disk (bool): Also empty the on-disk tier
+        """
+        with self._lock:
+            self._entries.clear()
+        if disk and self.disk_dir:
+            for entry in os.scandir(self.disk_dir):
+                if entry.name.endswith('.pdf'):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+
+    def get_stats(self):
+        """
+        Get hit, miss and eviction counters.
+
+        Returns:
+            dict: Counters plus 'hit_rate' (0.0 - 1.0) and 'memory_entries'
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._entries)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def reset_stats(self):
+        """
+        Reset the hit, miss and eviction counters.
+        """
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_pdf_cache():
+    """
+    Get the process-wide cache, configured from the environment on first use.
+
+    Returns:
+        PDFCache: The shared cache
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = PDFCache(
+                    max_entries=int(os.environ.get('TAC_PDF_CACHE_ENTRIES', 32)),
+                    disk_dir=os.environ.get('TAC_PDF_CACHE_DIR') or None,
+                    max_disk_bytes=int(float(os.environ.get('TAC_PDF_CACHE_MAX_MB', 100)) * 1024 * 1024),
+                )
+    return _default_cache
@@ -0,0 +1,293 @@
+# pdf_charts.py
+"""
+Chart descriptions (see utils.chart_specs) drawn as ReportLab vector graphics.
+
+The charts are built from reportlab.graphics bar and line charts with fixed
+axis ranges, so reference lines, shaded ranges and error bars are placed in
+the same coordinates. The resulting Drawing is a flowable: it goes into the
+PDF as vector paths and text, without a browser or rasterizer, and stays
+sharp at any zoom.
+"""
+
+import math
+
+from reportlab.graphics.shapes import Drawing, Group, Line, Polygon, Rect, String
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.widgets.markers import makeMarker
+from reportlab.lib import colors
+
+FONT = 'Helvetica'
+FONT_BOLD = 'Helvetica-Bold'
+TITLE_SIZE = 10
+LABEL_SIZE = 8
+TICK_SIZE = 7
+
+GRID_COLOR = colors.HexColor('#dddddd')
+
+# Description types drawn as vector graphics, heatmaps are rendered to images
+VECTOR_CHART_TYPES = ('bar', 'line')
+
+# Dash patterns of the dash names used in chart descriptions
+DASHES = {None: None, 'dash': [4, 3], 'dot': [1, 2]}
+MARKERS = {'circle': 'FilledCircle', 'diamond': 'FilledDiamond'}
+
+
+def nice_range(low, high, ticks=5):
+    """
+    Axis range with round tick steps covering low..high.
+
+    Args:
+        low (float): Smallest value to show
+        high (float): Largest value to show
+        ticks (int): Approximate number of tick intervals
+
+    Returns:
+        tuple: (minimum, maximum, step)
+    """
+    if high <= low:
+        low, high = low - 1, high + 1
+    raw_step = (high - low) / ticks
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(factor * magnitude for factor in (1, 2, 2.5, 5, 10) if factor * magnitude >= raw_step)
+    return math.floor(low / step) * step, math.ceil(high / step) * step, step
+
+
+def _finite(values):
+    return [value for value in values if value is not None and math.isfinite(value)]
+
+
+def _format_tick(value):
+    return f"{value:,.0f}" if float(value).is_integer() else f"{value:,.2f}".rstrip('0').rstrip('.')
+
+
+def _y_values(spec):
+    if spec['type'] == 'bar':
+        values = [0.0]
+        for bar in spec['bars']:
+            minus, plus = bar['error'] or (0, 0)
+            values += [bar['value'] - minus, bar['value'] + plus]
+        return _finite(values)
+    values = [line['y'] for line in spec['h_lines']]
+    for series in spec['series']:
+        values += series['y']
+    for band in spec['ranges']:
+        values += band['low'] + band['high']
+    return _finite(values)
+
+
+def _x_values(spec):
+    values = [line['x'] for line in spec['v_lines']]
+    for series in spec['series']:
+        values += series['x']
+    for band in spec['ranges']:
+        values += band['x']
+    for interval in spec['x_spans']:
+        values += [interval['x0'], interval['x1']]
+    return _finite(values)
+
+
+class _Scale:
+    """
+    Maps data coordinates to drawing coordinates inside the plot area.
+    """
+
+    def __init__(self, x, y, width, height, x_range, y_range):
+        self.x, self.y, self.width, self.height = x, y, width, height
+        self.x_min, self.x_max = x_range
+        self.y_min, self.y_max = y_range
+
+    def px(self, value):
+        return self.x + (value - self.x_min) / (self.x_max - self.x_min) * self.width
+
+    def py(self, value):
+        return self.y + (value - self.y_min) / (self.y_max - self.y_min) * self.height
+
+    def clip_x(self, value):
+        return min(max(self.px(value), self.x), self.x + self.width)
+
+
+def _bar_chart(spec, scale, y_range):
+    chart = VerticalBarChart()
+    chart.x, chart.y, chart.width, chart.height = scale.x, scale.y, scale.width, scale.height
+    chart.data = [[bar['value'] for bar in spec['bars']]]
+    chart.categoryAxis.categoryNames = [bar['label'] for bar in spec['bars']]
+    chart.categoryAxis.labels.fontName = FONT
+    chart.categoryAxis.labels.fontSize = TICK_SIZE
+    chart.categoryAxis.labels.boxAnchor = 'n'
+    chart.barSpacing = 0
+    chart.groupSpacing = 12
+    chart.bars.strokeColor = None
+    for index, bar in enumerate(spec['bars']):
+        chart.bars[(0, index)].fillColor = colors.toColor(bar['color'])
+    _value_axis(chart.valueAxis, y_range, spec['grid'])
+    return chart
+
+
+def _line_chart(spec, scale, x_range, y_range):
+    chart = LinePlot()
+    chart.x, chart.y, chart.width, chart.height = scale.x, scale.y, scale.width, scale.height
+    chart.data = [list(zip(series['x'], series['y'])) for series in spec['series']]
+    for index, series in enumerate(spec['series']):
+        line = chart.lines[index]
+        line.strokeColor = colors.toColor(series['color'])
+        line.strokeWidth = 1.2
+        line.lineStyle = 'joinedLine' if series['lines'] else 'line'
+        line.strokeDashArray = DASHES[series['dash']]
+        if series['markers']:
+            line.symbol = makeMarker(MARKERS[series['marker']], size=3 if series['lines'] else 6)
+    _value_axis(chart.yValueAxis, y_range, spec['grid'])
+
+    axis = chart.xValueAxis
+    axis.valueMin, axis.valueMax, step = x_range
+    ticks = spec['x_ticks']
+    if ticks is not None:
+        labels = dict(zip(ticks['positions'], ticks['labels']))
+        axis.valueSteps = list(ticks['positions'])
+        axis.labelTextFormat = lambda value: labels.get(int(round(value)), '')
+        if ticks['rotate']:
+            axis.labels.angle = 45
+            axis.labels.boxAnchor = 'ne'
+    else:
+        axis.valueStep = step
+        axis.labelTextFormat = _format_tick
+    axis.labels.fontName = FONT
+    axis.labels.fontSize = TICK_SIZE
+    axis.visibleGrid = spec['grid']
+    axis.gridStrokeColor = GRID_COLOR
+    axis.gridStrokeWidth = 0.5
+    return chart
+
+
+def _value_axis(axis, y_range, grid):
+    axis.valueMin, axis.valueMax, axis.valueStep = y_range
+    axis.labels.fontName = FONT
+    axis.labels.fontSize = TICK_SIZE
+    axis.labelTextFormat = _format_tick
+    axis.visibleGrid = grid
+    axis.gridStrokeColor = GRID_COLOR
+    axis.gridStrokeWidth = 0.5
+
+
+def _background(spec, scale):
+    """
+    Shaded ranges, drawn below the chart's lines.
+    """
+    group = Group()
+    for band in spec['ranges']:
+        upper = [coordinate for x, y in zip(band['x'], band['high']) for coordinate in (scale.px(x), scale.py(y))]
+        lower = [coordinate for x, y in reversed(list(zip(band['x'], band['low'])))
+                 for coordinate in (scale.px(x), scale.py(y))]
+        group.add(Polygon(upper + lower, fillColor=colors.toColor(band['color']),
+                          fillOpacity=band['opacity'], strokeColor=None))
+    for interval in spec['x_spans']:
+        x0, x1 = scale.clip_x(interval['x0']), scale.clip_x(interval['x1'])
+        group.add(Rect(x0, scale.y, x1 - x0, scale.height, fillColor=colors.toColor(interval['color']),
+                       fillOpacity=interval['opacity'], strokeColor=None))
+        if interval['name']:
+            group.add(String(x0 + 2, scale.y + scale.height - TICK_SIZE - 2, interval['name'],
+                             fontName=FONT, fontSize=TICK_SIZE))
+    return group
+
+
+def _overlay(spec, scale):
+    """
+    Reference lines and error bars, drawn above the chart.
+    """
+    group = Group()
+    if spec['type'] == 'bar':
+        slot = scale.width / len(spec['bars'])
+        for index, bar in enumerate(spec['bars']):
+            if bar['error'] is None:
+                continue
+            minus, plus = bar['error']
+            x = scale.x + (index + 0.5) * slot
+            low, high = scale.py(bar['value'] - minus), scale.py(bar['value'] + plus)
+            for points in ((x, low, x, high), (x - 4, low, x + 4, low), (x - 4, high, x + 4, high)):
+                group.add(Line(*points, strokeColor=colors.black, strokeWidth=0.8))
+        return group
+
+    for line in spec['h_lines']:
+        y = scale.py(line['y'])
+        group.add(Line(scale.x, y, scale.x + scale.width, y, strokeColor=colors.toColor(line['color']),
+                       strokeWidth=line['width'], strokeDashArray=DASHES[line['dash']]))
+        if line['name']:
+            group.add(String(scale.x + scale.width - 2, y + 2, line['name'], fontName=FONT,
+                             fontSize=TICK_SIZE, textAnchor='end'))
+    for line in spec['v_lines']:
+        x = scale.px(line['x'])
+        if scale.x <= x <= scale.x + scale.width:
+            group.add(Line(x, scale.y, x, scale.y + scale.height, strokeColor=colors.toColor(line['color']),
+                           strokeWidth=1, strokeDashArray=DASHES[line['dash']]))
+    return group
+
+
+def _legend(spec, scale):
+    entries = [(item['color'], item['name']) for item in spec['series'] + spec['ranges'] + spec['x_spans']
+               if item['name']]
+    legend = Legend()
+    legend.colorNamePairs = [(colors.toColor(color), name) for color, name in entries]
+    legend.fontName = FONT
+    legend.fontSize = TICK_SIZE
+    legend.alignment = 'right'
+    legend.boxAnchor = 'ne'
+    legend.x = scale.x + scale.width - 4
+    legend.y = scale.y + scale.height - 4
+    legend.dx = legend.dy = 6
+    legend.deltay = 9
+    legend.columnMaximum = len(entries)
+    legend.strokeColor = None
+    return legend
+
+
+def chart_drawing(spec, width, height):
+    """
+    Draw a chart description as a ReportLab Drawing.
+
+    Args:
+        spec (dict): Chart description, see utils.chart_specs
+        width (float): Width in points
+        height (float): Height in points
+
+    Returns:
+        reportlab.graphics.shapes.Drawing: Flowable with the chart as vector graphics
+    """
+    drawing = Drawing(width, height)
+    rotate = spec['type'] == 'line' and spec['x_ticks'] is not None and spec['x_ticks']['rotate']
+    top = 2 * TITLE_SIZE + 4 if spec['title'] else 8
+    bottom = 2 * LABEL_SIZE + TICK_SIZE + (28 if rotate else 8)
+    left = 2 * LABEL_SIZE + 40
+    plot_width, plot_height = width - left - 10, height - top - bottom
+
+    y_range = nice_range(min(_y_values(spec)), max(_y_values(spec)))
+    if spec['type'] == 'bar':
+        x_range = (0, len(spec['bars']), 1)
+    elif spec['x_ticks'] is not None:
+        x_values = _x_values(spec)
+        x_range = (min(x_values) - 0.5, max(x_values) + 0.5, 1)
+    else:
+        x_values = _x_values(spec)
+        x_range = nice_range(min(x_values), max(x_values), ticks=8)
+    scale = _Scale(left, bottom, plot_width, plot_height, x_range[:2], y_range[:2])
+
+    if spec['type'] == 'bar':
+        chart = _bar_chart(spec, scale, y_range)
+    else:
+        drawing.add(_background(spec, scale))
+        chart = _line_chart(spec, scale, x_range, y_range)
+    drawing.add(chart)
+    drawing.add(_overlay(spec, scale))
+
+    if spec['title']:
+        drawing.add(String(width / 2, height - TITLE_SIZE - 2, spec['title'], fontName=FONT_BOLD,
+                           fontSize=TITLE_SIZE, textAnchor='middle'))
+    drawing.add(String(left + plot_width / 2, 2, spec['x_title'], fontName=FONT, fontSize=LABEL_SIZE,
+                       textAnchor='middle'))
+    y_title = Group(String(0, 0, spec['y_title'], fontName=FONT, fontSize=LABEL_SIZE, textAnchor='middle'))
+    y_title.transform = (0, 1, -1, 0, LABEL_SIZE + 2, bottom + plot_height / 2)
+    drawing.add(y_title)
+    # Bars are already labelled by the category axis
+    if spec['legend'] is not None and spec['type'] == 'line':
+        drawing.add(_legend(spec, scale))
+    return drawing
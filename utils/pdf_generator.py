@@ -1,372 +1,693 @@
 # pdf_generator.py
 """
 PDF generation module for Test Automation Calculations
-Generates executive summary reports with charts and results
+Generates executive summary reports with charts and results, and portfolio
+reports covering many teams. Question charts are drawn as vector graphics
+from their chart descriptions (utils.chart_specs); Matplotlib figures are
+still accepted and embedded as images.
 """
 
-from reportlab.lib.pagesizes import letter, A4
+from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table, TableStyle
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table, TableStyle, LongTable
+from reportlab.platypus.tableofcontents import TableOfContents
 from reportlab.lib import colors
+import logging
+import numpy as np
+import tempfile
 from io import BytesIO
+from xml.sax.saxutils import escape
 from datetime import datetime
-import tempfile
-import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from utils.translations import get_text, format_number, format_numbers
+from utils.date_utils import format_horizon
+from utils.simulation import uncertainty_message
+from utils.pdf_charts import chart_drawing, VECTOR_CHART_TYPES
+from utils.charts import matplotlib_figure
+from utils.figures import release_figure
+from utils.metrics import span
+from utils.scenario import Scenario
+from utils.calculations import (hours_saved, runs_to_break_even, maintenance_potential, calculate_all,
+                                answered_questions, projection_months, INPUT_KEYS, PROJECTION_MONTHS)
+
+logger = logging.getLogger(__name__)
+
+# Version of the report layout, part of the PDF cache key. Bump it whenever the output changes.
+REPORT_VERSION = '3'
+
+# Generation time shown in the reports
+REPORT_DATE_FORMAT = '%Y-%m-%d %H:%M'
 
-from utils.translations import get_text, format_number
+# Reports up to this size are spooled in memory, larger ones in a temporary file
+SPOOL_MAX_BYTES = 1024 * 1024
 
+# Size of the chunks a report file is streamed in
+CHUNK_SIZE = 64 * 1024
 
-def _convert_plotly_to_image(fig, width=6, height=4):
+
+def report_date():
+    """
+    Generation time shown in a report generated now.
+
+    Returns:
+        str: Time formatted with REPORT_DATE_FORMAT
     """
-    Convert a Plotly figure to an image BytesIO object
+    return datetime.now().strftime(REPORT_DATE_FORMAT)
+
+
+def _convert_matplotlib_to_image(fig, width=6, height=4):
+    """
+    Convert a Matplotlib figure to an image BytesIO object
     
     Args:
-        fig: Plotly figure object
+        fig: Matplotlib figure object
         width: Width in inches
         height: Height in inches
         
     Returns:
-        BytesIO object containing the image
+        BytesIO object containing the image, or None if rendering failed
     """
-    try:
-        # Create a temporary file for the image
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmp_file:
-            tmp_path = tmp_file.name
-        
-        # Export plotly figure to image file
-        fig.write_image(tmp_path, width=width*100, height=height*100)
-        
-        # Read the image into BytesIO
-        with open(tmp_path, 'rb') as f:
-            img_bytes = BytesIO(f.read())
-        
-        # Clean up temp file
-        os.unlink(tmp_path)
-        
-        return img_bytes
-    except Exception as e:
-        print(f"Error converting Plotly figure: {e}")
-        return None
+    with span('pdf.chart.matplotlib'):
+        try:
+            buffer = BytesIO()
+            fig.set_size_inches(width, height)
+            fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+            buffer.seek(0)
+            return buffer
+        except Exception:
+            logger.exception("Error converting Matplotlib figure, the chart is left out of the report")
+            return None
 
 
-def _convert_matplotlib_to_image(fig, width=6, height=4):
+def _convert_spec_to_image(spec, width=6, height=4):
     """
-    Convert a Matplotlib figure to an image BytesIO object
+    Render a chart description that can't be drawn as vector graphics (a heatmap)
+    to an image BytesIO object with Matplotlib, releasing the figure afterwards
     
     Args:
-        fig: Matplotlib figure object
+        spec: Chart description, see utils.chart_specs
         width: Width in inches
         height: Height in inches
         
     Returns:
-        BytesIO object containing the image
+        BytesIO object containing the image, or None if rendering failed
     """
+    fig = matplotlib_figure(spec)
     try:
-        img_bytes = BytesIO()
-        fig.set_size_inches(width, height)
-        fig.savefig(img_bytes, format='png', dpi=100, bbox_inches='tight')
-        img_bytes.seek(0)
-        return img_bytes
-    except Exception as e:
-        print(f"Error converting Matplotlib figure: {e}")
-        return None
+        return _convert_matplotlib_to_image(fig, width, height)
+    finally:
+        release_figure(fig)
+
+
+def _derive_results(question, inputs):
+    """
+    Compute the results of a question from its inputs using the calculation engine
+    
+    Args:
+        question (str): Question key ('q1', 'q2' or 'q3')
+        inputs (dict): Inputs as passed in questions_data
+        
+    Returns:
+        dict: Results in the same shape generate_executive_summary expects
+    """
+    if question == 'q1':
+        time_savings = float(hours_saved(inputs.get('manual_time', 0), inputs.get('automated_time_min', 0)))
+        return {'time_savings': time_savings}
+    if question == 'q2':
+        runs = float(runs_to_break_even(inputs.get('initial_investment', 0), inputs.get('time_savings', 0)))
+        return {'runs_to_break_even': int(runs) if runs != float('inf') else runs}
+    potential = maintenance_potential(inputs.get('TH', 0), inputs.get('MT', 0),
+                                      inputs.get('N', 0), inputs.get('A', 0),
+                                      inputs.get('horizon_months', PROJECTION_MONTHS)).tolist()
+    return {'potential_array': potential, 'can_afford': potential[0] > 0}
+
+
+# Page margins of all reports
+PAGE_MARGINS = {'topMargin': 0.75*inch, 'bottomMargin': 0.75*inch,
+                'leftMargin': 0.75*inch, 'rightMargin': 0.75*inch}
 
 
-def generate_executive_summary(language, questions_data, output_path=None):
+@lru_cache(maxsize=None)
+def _styles():
+    """
+    Paragraph and table styles of the reports, built once per process.
+    
+    Returns:
+        dict: Style name -> ParagraphStyle or TableStyle. Shared, don't modify them
+    """
+    styles = getSampleStyleSheet()
+    return {
+        'normal': styles['Normal'],
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#1f77b4'),
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=12,
+            spaceBefore=12,
+            fontName='Helvetica-Bold'
+        ),
+        'subheading': ParagraphStyle(
+            'CustomSubHeading',
+            parent=styles['Heading3'],
+            fontSize=12,
+            textColor=colors.HexColor('#34495e'),
+            spaceAfter=8,
+            spaceBefore=8,
+            fontName='Helvetica-Bold'
+        ),
+        'body': ParagraphStyle(
+            'CustomBody',
+            parent=styles['BodyText'],
+            fontSize=11,
+            alignment=TA_JUSTIFY,
+            spaceAfter=12
+        ),
+        'date': ParagraphStyle('DateStyle', parent=styles['Normal'],
+                               fontSize=10, textColor=colors.grey,
+                               alignment=TA_CENTER),
+        'footer': ParagraphStyle('FooterStyle', parent=styles['Normal'],
+                                 fontSize=9, textColor=colors.grey,
+                                 alignment=TA_JUSTIFY, italic=True),
+        'toc_0': ParagraphStyle('TOCLevel0', parent=styles['Normal'], fontSize=11,
+                                leading=16, fontName='Helvetica-Bold'),
+        'toc_1': ParagraphStyle('TOCLevel1', parent=styles['Normal'], fontSize=10,
+                                leading=13, leftIndent=18),
+        'rollup_table': TableStyle([
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f2f4f6')]),
+            ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LINEBELOW', (0, 0), (-1, -1), 0.25, colors.HexColor('#d5d8dc')),
+        ]),
+        'input_table': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#34495e')),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ]),
+    }
+
+
+def _q1_inputs(language, inputs):
+    return [
+        [get_text(language, 'question1', 'input_manual'),
+         f"{format_number(inputs.get('manual_time', 0), 1, language)} {get_text(language, 'derived', 'hours_unit')}"],
+        [get_text(language, 'question1', 'input_automated'),
+         f"{format_number(inputs.get('automated_time_min', 0), 0, language)} min"]
+    ]
+
+
+def _q2_inputs(language, inputs):
+    return [
+        [get_text(language, 'question2', 'input_investment'),
+         f"{format_number(inputs.get('initial_investment', 0), 1, language)} h"],
+        [get_text(language, 'question2', 'input_savings'),
+         f"{format_number(inputs.get('time_savings', 0), 2, language)} h"]
+    ]
+
+
+def _q3_inputs(language, inputs):
+    return [
+        [get_text(language, 'question3', 'input_th'), format_number(inputs.get('TH', 0), 0, language)],
+        [get_text(language, 'question3', 'input_mt'), format_number(inputs.get('MT', 0), 0, language)],
+        [get_text(language, 'question3', 'input_n'), format_number(inputs.get('N', 0), 0, language)],
+        [get_text(language, 'question3', 'input_a'), format_number(inputs.get('A', 0), 0, language)],
+        [get_text(language, 'question3', 'input_horizon'),
+         format_horizon(language, inputs.get('horizon_months', PROJECTION_MONTHS))]
+    ]
+
+
+def _q1_result(language, data):
+    return get_text(language, 'question1', 'result_message').format(
+        time=format_number(data['results'].get('time_savings', 0), 2, language))
+
+
+def _q2_result(language, data):
+    return get_text(language, 'question2', 'result_message').format(
+        runs=data['results'].get('runs_to_break_even', 0))
+
+
+def _q3_result(language, data):
+    if data['results'].get('can_afford', False):
+        A_count = data['inputs'].get('A', 0) if 'inputs' in data else 0
+        return get_text(language, 'question3', 'success_message').format(count=int(A_count))
+    return get_text(language, 'question3', 'warning_message')
+
+
+# Report section of each question: (number, label key, input rows, result text, (chart key, chart height) ...)
+QUESTION_SECTIONS = {
+    'q1': (1, 'q1_summary_label', _q1_inputs, _q1_result, (('q1', 3.5),)),
+    'q2': (2, 'q2_summary_label', _q2_inputs, _q2_result, (('q2', 3.5), ('q2_sweep', 3.75))),
+    'q3': (3, 'q3_summary_label', _q3_inputs, _q3_result, (('q3', 3.5), ('q3_sweep', 3.75))),
+}
+
+
+def _question_section(language, question, data, chart_images):
+    """
+    Build the report section of one question: inputs table, results and charts.
+    
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        question (str): 'q1', 'q2' or 'q3'
+        data (dict): The question's entry of questions_data
+        chart_images (dict): As returned by _render_charts
+        
+    Returns:
+        list: Flowables of the section
+    """
+    number, label_key, input_rows, result_text, charts = QUESTION_SECTIONS[question]
+    styles = _styles()
+    if 'results' not in data and 'inputs' in data:
+        data = dict(data, results=_derive_results(question, data['inputs']))
+    
+    elements = [
+        Paragraph(f"{number}. {get_text(language, 'pdf', label_key)}", styles['subheading']),
+        Paragraph(f"<b>{get_text(language, 'pdf', 'inputs_label')}:</b>", styles['body']),
+    ]
+    
+    if 'inputs' in data:
+        input_table = Table(input_rows(language, data['inputs']), colWidths=[4*inch, 2*inch])
+        input_table.setStyle(styles['input_table'])
+        elements.append(input_table)
+        elements.append(Spacer(1, 0.1*inch))
+    
+    if 'results' in data:
+        elements.append(Paragraph(f"<b>{get_text(language, 'pdf', 'results_label')}:</b>", styles['body']))
+        elements.append(Paragraph(result_text(language, data), styles['body']))
+        if 'uncertainty' in data:
+            uncertainty = data['uncertainty']
+            elements.append(Paragraph(
+                uncertainty_message(language, question, uncertainty['simulation'], uncertainty['spread']), styles['body']))
+    
+    # Add charts if available: vector drawings as they are, rendered figures as images
+    for chart_key, height in charts:
+        chart = chart_images.get(chart_key)
+        if isinstance(chart, dict):
+            elements.append(Spacer(1, 0.1*inch))
+            elements.append(chart_drawing(chart, 5*inch, height*inch))
+        elif chart:
+            elements.append(Spacer(1, 0.1*inch))
+            elements.append(Image(chart, width=5*inch, height=height*inch))
+    
+    elements.append(Spacer(1, 0.2*inch))
+    return elements
+
+
+def _render_charts(questions_data, max_workers=3):
+    """
+    Convert the figures of all questions to images before layout starts
+    
+    Bar and line chart descriptions need no conversion, they are drawn during
+    layout. Heatmap descriptions (sensitivity sweeps), and Matplotlib
+    figures passed in place of a description, are converted independently,
+    so they run on a thread pool.
+    
+    Args:
+        questions_data (dict): As passed to generate_executive_summary
+        max_workers (int): Number of figures converted in parallel, 1 converts sequentially
+        
+    Returns:
+        dict: Question key (or 'q2_sweep', 'q3_sweep' for sensitivity heatmaps) -> chart description
+            or BytesIO image, None if there is no chart or conversion failed
+
+    Raises:
+        TypeError: If a chart is neither a chart description nor a Matplotlib figure
+    """
+    charts = {}
+    tasks = {}
+    for name, question, field in (('q1', 'q1', 'chart'), ('q2', 'q2', 'chart'), ('q3', 'q3', 'chart'),
+                                  ('q2_sweep', 'q2', 'sweep_chart'), ('q3_sweep', 'q3', 'sweep_chart')):
+        data = questions_data.get(question)
+        chart = data.get(field) if data else None
+        if isinstance(chart, dict) and chart['type'] in VECTOR_CHART_TYPES:
+            charts[name] = chart
+        elif isinstance(chart, dict):
+            tasks[name] = (_convert_spec_to_image, chart)
+        elif hasattr(chart, 'savefig'):
+            tasks[name] = (_convert_matplotlib_to_image, chart)
+        elif chart is not None:
+            # Plotly figures would need Kaleido and Chrome; pass their chart descriptions instead
+            raise TypeError(f"Chart {name} must be a chart description (utils.chart_specs) or a Matplotlib "
+                            f"figure, not {type(chart).__name__}")
+    
+    if max_workers <= 1 or len(tasks) <= 1:
+        charts.update({question: converter(chart) for question, (converter, chart) in tasks.items()})
+        return charts
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        futures = {question: executor.submit(converter, chart) for question, (converter, chart) in tasks.items()}
+        charts.update({question: future.result() for question, future in futures.items()})
+    return charts
+
+
+def generate_executive_summary(language, questions_data, output_path=None, max_workers=3, progress=None, date=None):
     """
     Generate a comprehensive executive summary PDF report
     
     Args:
         language (str): Language code ('en', 'de', 'fr', 'lb')
-        questions_data (dict): Dictionary containing data for each question
+        questions_data (Scenario or dict): Scenario (utils.scenario) to report on, or a
+            dictionary containing data for each question
             {
                 'q1': {
                     'inputs': {'manual_time': float, 'automated_time_min': float},
                     'results': {'time_savings': float, 'formatted_savings': str},
-                    'chart': plotly_figure or None
+                    'chart': chart description or None
                 },
                 'q2': {
                     'inputs': {'initial_investment': float, 'time_savings': float},
                     'results': {'runs_to_break_even': int},
-                    'chart': plotly_figure or None
+                    'chart': chart description or None
                 },
                 'q3': {
-                    'inputs': {'TH': float, 'MT': float, 'N': int, 'A': int},
+                    'inputs': {'TH': float, 'MT': float, 'N': int, 'A': int, 'horizon_months': int (optional)},
                     'results': {'potential_array': list, 'can_afford': bool},
-                    'chart': matplotlib_figure or None
+                    'chart': chart description or None
                 }
             }
-        output_path (str): Optional file path to save PDF. If None, returns BytesIO
+            Chart descriptions (utils.chart_specs) are drawn as vector graphics. A Matplotlib
+            figure may be passed instead and is embedded as an image; other figures raise TypeError.
+            'results' may be omitted; it is then derived from 'inputs' with utils.calculations.
+            Questions 2 and 3 may have a 'sweep_chart' (heatmap description), a sensitivity heatmap
+            shown below their chart. An optional 'uncertainty' entry {'spread': percent, 'simulation': utils.simulation.simulate()
+            result} adds the simulated P10-P90 range to the results.
+        output_path: Optional file path or writable binary file-like object to write the PDF to.
+            If None, returns BytesIO
+        max_workers (int): Number of figures converted to images in parallel
+        progress (callable): Optional, called with the stage name ('charts', 'layout') as each stage starts
+        date (str): Generation time printed in the report, defaults to now (report_date())
         
     Returns:
         BytesIO object containing the PDF (if output_path is None)
     """
+    if isinstance(questions_data, Scenario):
+        with span('pdf.data'):
+            questions_data = questions_data.questions_data(language)
+
+    # Convert all figures up front, in parallel
+    if progress:
+        progress('charts')
+    with span('pdf.charts'):
+        chart_images = _render_charts(questions_data, max_workers)
+    
     # Create PDF buffer
-    if output_path:
+    if output_path is not None:
         buffer = output_path
     else:
         buffer = BytesIO()
     
     # Create PDF document
-    doc = SimpleDocTemplate(buffer, pagesize=letter,
-                           topMargin=0.75*inch, bottomMargin=0.75*inch,
-                           leftMargin=0.75*inch, rightMargin=0.75*inch)
+    doc = SimpleDocTemplate(buffer, pagesize=letter, **PAGE_MARGINS)
+    styles = _styles()
     
     # Container for PDF elements
     elements = []
     
-    # Define styles
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1f77b4'),
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=12,
-        spaceBefore=12,
-        fontName='Helvetica-Bold'
-    )
-    
-    subheading_style = ParagraphStyle(
-        'CustomSubHeading',
-        parent=styles['Heading3'],
-        fontSize=12,
-        textColor=colors.HexColor('#34495e'),
-        spaceAfter=8,
-        spaceBefore=8,
-        fontName='Helvetica-Bold'
-    )
-    
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['BodyText'],
-        fontSize=11,
-        alignment=TA_JUSTIFY,
-        spaceAfter=12
-    )
-    
     # Add title
-    title = Paragraph(get_text(language, 'pdf', 'title'), title_style)
+    title = Paragraph(get_text(language, 'pdf', 'title'), styles['title'])
     elements.append(title)
     
     # Add generation date
-    date_text = f"{get_text(language, 'pdf', 'generated_date')} {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-    date_para = Paragraph(date_text, ParagraphStyle('DateStyle', parent=styles['Normal'], 
-                                                     fontSize=10, textColor=colors.grey, 
-                                                     alignment=TA_CENTER))
-    elements.append(date_para)
+    date_text = f"{get_text(language, 'pdf', 'generated_date')} {date or report_date()}"
+    elements.append(Paragraph(date_text, styles['date']))
     elements.append(Spacer(1, 0.3*inch))
     
     # Add executive summary section
-    exec_summary_title = Paragraph(get_text(language, 'pdf', 'executive_summary'), heading_style)
+    exec_summary_title = Paragraph(get_text(language, 'pdf', 'executive_summary'), styles['heading'])
     elements.append(exec_summary_title)
     
-    summary_intro = Paragraph(get_text(language, 'pdf', 'summary_intro'), body_style)
+    summary_intro = Paragraph(get_text(language, 'pdf', 'summary_intro'), styles['body'])
     elements.append(summary_intro)
     elements.append(Spacer(1, 0.2*inch))
     
-    # Process Question 1 if data exists
-    if 'q1' in questions_data and questions_data['q1']:
-        q1_data = questions_data['q1']
-        
-        # Question 1 heading
-        q1_title = Paragraph(f"1. {get_text(language, 'pdf', 'q1_summary_label')}", subheading_style)
-        elements.append(q1_title)
-        
-        # Inputs table
-        inputs_label = Paragraph(f"<b>{get_text(language, 'pdf', 'inputs_label')}:</b>", body_style)
-        elements.append(inputs_label)
-        
-        if 'inputs' in q1_data:
-            manual_time = q1_data['inputs'].get('manual_time', 0)
-            auto_time = q1_data['inputs'].get('automated_time_min', 0)
-            
-            input_data = [
-                [get_text(language, 'question1', 'input_manual'), 
-                 f"{format_number(manual_time, 1, language)} {get_text(language, 'question1', 'chart_yaxis').split('(')[1].replace(')', '')}"],
-                [get_text(language, 'question1', 'input_automated'), 
-                 f"{format_number(auto_time, 0, language)} min"]
-            ]
-            
-            input_table = Table(input_data, colWidths=[4*inch, 2*inch])
-            input_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#34495e')),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ]))
-            elements.append(input_table)
-            elements.append(Spacer(1, 0.1*inch))
-        
-        # Results
-        if 'results' in q1_data:
-            results_label = Paragraph(f"<b>{get_text(language, 'pdf', 'results_label')}:</b>", body_style)
-            elements.append(results_label)
-            
-            time_savings = q1_data['results'].get('time_savings', 0)
-            result_text = get_text(language, 'question1', 'result_message').format(
-                time=format_number(time_savings, 2, language)
-            )
-            result_para = Paragraph(result_text, body_style)
-            elements.append(result_para)
-        
-        # Add chart if available
-        if 'chart' in q1_data and q1_data['chart']:
-            elements.append(Spacer(1, 0.1*inch))
-            img_bytes = _convert_plotly_to_image(q1_data['chart'])
-            if img_bytes:
-                img = Image(img_bytes, width=5*inch, height=3.5*inch)
-                elements.append(img)
-        
-        elements.append(Spacer(1, 0.2*inch))
+    # One section per answered question
+    for question in QUESTION_SECTIONS:
+        if questions_data.get(question):
+            elements.extend(_question_section(language, question, questions_data[question], chart_images))
     
-    # Process Question 2 if data exists
-    if 'q2' in questions_data and questions_data['q2']:
-        q2_data = questions_data['q2']
-        
-        # Question 2 heading
-        q2_title = Paragraph(f"2. {get_text(language, 'pdf', 'q2_summary_label')}", subheading_style)
-        elements.append(q2_title)
-        
-        # Inputs table
-        inputs_label = Paragraph(f"<b>{get_text(language, 'pdf', 'inputs_label')}:</b>", body_style)
-        elements.append(inputs_label)
-        
-        if 'inputs' in q2_data:
-            investment = q2_data['inputs'].get('initial_investment', 0)
-            savings = q2_data['inputs'].get('time_savings', 0)
-            
-            input_data = [
-                [get_text(language, 'question2', 'input_investment'), 
-                 f"{format_number(investment, 1, language)} h"],
-                [get_text(language, 'question2', 'input_savings'), 
-                 f"{format_number(savings, 2, language)} h"]
-            ]
-            
-            input_table = Table(input_data, colWidths=[4*inch, 2*inch])
-            input_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#34495e')),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ]))
-            elements.append(input_table)
-            elements.append(Spacer(1, 0.1*inch))
-        
-        # Results
-        if 'results' in q2_data:
-            results_label = Paragraph(f"<b>{get_text(language, 'pdf', 'results_label')}:</b>", body_style)
-            elements.append(results_label)
-            
-            runs = q2_data['results'].get('runs_to_break_even', 0)
-            result_text = get_text(language, 'question2', 'result_message').format(runs=runs)
-            result_para = Paragraph(result_text, body_style)
-            elements.append(result_para)
-        
-        # Add chart if available
-        if 'chart' in q2_data and q2_data['chart']:
-            elements.append(Spacer(1, 0.1*inch))
-            img_bytes = _convert_plotly_to_image(q2_data['chart'])
-            if img_bytes:
-                img = Image(img_bytes, width=5*inch, height=3.5*inch)
-                elements.append(img)
-        
-        elements.append(Spacer(1, 0.2*inch))
+    # Add footer note
+    elements.append(Spacer(1, 0.3*inch))
+    elements.append(Paragraph(get_text(language, 'pdf', 'footer_note'), styles['footer']))
     
-    # Process Question 3 if data exists
-    if 'q3' in questions_data and questions_data['q3']:
-        q3_data = questions_data['q3']
-        
-        # Question 3 heading
-        q3_title = Paragraph(f"3. {get_text(language, 'pdf', 'q3_summary_label')}", subheading_style)
-        elements.append(q3_title)
-        
-        # Inputs table
-        inputs_label = Paragraph(f"<b>{get_text(language, 'pdf', 'inputs_label')}:</b>", body_style)
-        elements.append(inputs_label)
-        
-        if 'inputs' in q3_data:
-            TH = q3_data['inputs'].get('TH', 0)
-            MT = q3_data['inputs'].get('MT', 0)
-            N = q3_data['inputs'].get('N', 0)
-            A = q3_data['inputs'].get('A', 0)
-            
-            input_data = [
-                [get_text(language, 'question3', 'input_th'), format_number(TH, 0, language)],
-                [get_text(language, 'question3', 'input_mt'), format_number(MT, 0, language)],
-                [get_text(language, 'question3', 'input_n'), format_number(N, 0, language)],
-                [get_text(language, 'question3', 'input_a'), format_number(A, 0, language)]
-            ]
-            
-            input_table = Table(input_data, colWidths=[4*inch, 2*inch])
-            input_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#34495e')),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ]))
-            elements.append(input_table)
-            elements.append(Spacer(1, 0.1*inch))
-        
-        # Results
-        if 'results' in q3_data:
-            results_label = Paragraph(f"<b>{get_text(language, 'pdf', 'results_label')}:</b>", body_style)
-            elements.append(results_label)
-            
-            can_afford = q3_data['results'].get('can_afford', False)
-            A_count = q3_data['inputs'].get('A', 0) if 'inputs' in q3_data else 0
-            
-            if can_afford:
-                result_text = get_text(language, 'question3', 'success_message').format(count=int(A_count))
-            else:
-                result_text = get_text(language, 'question3', 'warning_message')
-            
-            result_para = Paragraph(result_text, body_style)
-            elements.append(result_para)
+    # Build PDF
+    if progress:
+        progress('layout')
+    with span('pdf.layout'):
+        doc.build(elements)
+    
+    if output_path is None:
+        buffer.seek(0)
+        return buffer
+    
+    return None
+
+
+
+class _PortfolioDocTemplate(SimpleDocTemplate):
+    """
+    Document template adding the headings marked with a toc_level to the
+    table of contents and to the PDF outline.
+    """
+
+    def afterFlowable(self, flowable):
+        level = getattr(flowable, 'toc_level', None)
+        if level is None:
+            return
+        text = flowable.getPlainText()
+        self.canv.bookmarkPage(flowable.toc_key)
+        self.canv.addOutlineEntry(text, flowable.toc_key, level=level, closed=level > 0)
+        self.notify('TOCEntry', (level, text, self.page, flowable.toc_key))
+
+
+def _toc_heading(text, style, level, key):
+    heading = Paragraph(text, style)
+    heading.toc_level = level
+    heading.toc_key = key
+    return heading
+
+
+def _team_questions_data(inputs, results, index, answered):
+    """
+    questions_data of one team of a portfolio, without charts.
+    
+    Args:
+        inputs (dict): The team's input values, keyed as in user_inputs.json
+        results (dict): calculate_all() results of all teams
+        index (int): Position of the team in the results
+        answered (tuple): (has_q1_data, has_q2_data, has_q3_data) of the team
         
-        # Add chart if available
-        if 'chart' in q3_data and q3_data['chart']:
-            elements.append(Spacer(1, 0.1*inch))
-            img_bytes = _convert_matplotlib_to_image(q3_data['chart'])
-            if img_bytes:
-                img = Image(img_bytes, width=5*inch, height=3.5*inch)
-                elements.append(img)
+    Returns:
+        dict: questions_data as expected by _question_section
+    """
+    has_q1_data, has_q2_data, has_q3_data = answered
+    questions_data = {}
+    if has_q1_data:
+        questions_data['q1'] = {
+            'inputs': {'manual_time': inputs['q1_manual_test_execution_time'],
+                       'automated_time_min': inputs['q1_automated_test_execution_time_min']},
+            'results': {'time_savings': float(results['q1_time_savings'][index])},
+        }
+    if has_q2_data:
+        questions_data['q2'] = {
+            'inputs': {'initial_investment': inputs['q2_initial_investment'],
+                       'time_savings': inputs['q2_time_savings_per_run']},
+            'results': {'runs_to_break_even': int(results['q2_runs_to_break_even'][index])},
+        }
+    if has_q3_data:
+        months = projection_months(inputs)
+        questions_data['q3'] = {
+            'inputs': {'TH': inputs['q3_th'], 'MT': inputs['q3_mt'], 'N': inputs['q3_n'],
+                       'A': inputs['q3_a'], 'horizon_months': months},
+            'results': {'potential_array': results['q3_potential'][index, :months].tolist(),
+                        'can_afford': bool(results['q3_can_afford'][index])},
+        }
+    return questions_data
+
+
+def _rollup_table(language, teams, results, answered):
+    """
+    Portfolio roll-up: one row per team with the key result of each question.
+    Columns are formatted in batches, and the table splits across pages with
+    its header repeated.
+    """
+    no_value = '\u2013'
+    has_q1, has_q2, has_q3 = (np.array(column, dtype=bool) for column in zip(*answered))
+    q1 = format_numbers(results['q1_time_savings'], 2, language)
+    q2 = format_numbers(np.where(has_q2, results['q2_runs_to_break_even'], 0), 0, language)
+    q3 = format_numbers(np.nan_to_num(results['q3_potential'][:, 0]), 1, language)
+    yes, no = get_text(language, 'pdf', 'yes'), get_text(language, 'pdf', 'no')
+    
+    rows = [[get_text(language, 'pdf', f'rollup_{column}')
+             for column in ('team', 'q1', 'q2', 'q3', 'can_afford')]]
+    for index, (team_id, _) in enumerate(teams):
+        rows.append([
+            team_id,
+            q1[index] if has_q1[index] else no_value,
+            q2[index] if has_q2[index] else no_value,
+            q3[index] if has_q3[index] else no_value,
+            (yes if results['q3_can_afford'][index] else no) if has_q3[index] else no_value,
+        ])
+    table = LongTable(rows, colWidths=[2.2*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch], repeatRows=1)
+    table.setStyle(_styles()['rollup_table'])
+    return table
+
+
+def _draw_page_number(canvas, doc):
+    canvas.saveState()
+    canvas.setFont('Helvetica', 8)
+    canvas.setFillColor(colors.grey)
+    canvas.drawRightString(doc.pagesize[0] - doc.rightMargin, doc.bottomMargin / 2,
+                           get_text(doc.language, 'pdf', 'page_label').format(page=doc.page))
+    canvas.restoreState()
+
+
+def generate_portfolio_report(language, teams, output_path=None, progress=None):
+    """
+    Generate one PDF covering many teams: a table of contents, a roll-up table
+    of all teams and one section per team with its inputs and results.
+    
+    Results of all teams are computed in one vectorized pass, and the styles
+    are shared with the executive summary, so the time per page stays about
+    the same for 10 or 1000 teams. Team sections have no charts.
+    
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        teams (list): (team id, inputs dict keyed as in user_inputs.json) per team,
+            e.g. the team ids and inputs yielded by batch_reports.read_teams()
+        output_path: Optional file path or writable binary file-like object to write the PDF to.
+            If None, returns BytesIO
+        progress (callable): Optional, called with the stage name ('layout') as each stage starts
         
-        elements.append(Spacer(1, 0.2*inch))
+    Returns:
+        BytesIO object containing the PDF (if output_path is None)
+    """
+    teams = [(str(team_id), {key: inputs.get(key, 0) for key in INPUT_KEYS}) for team_id, inputs in teams]
+    styles = _styles()
+    answered = [answered_questions(inputs) for _, inputs in teams]
+    months = max((projection_months(inputs) for _, inputs in teams), default=PROJECTION_MONTHS)
+    results = calculate_all({key: [inputs[key] for _, inputs in teams] for key in INPUT_KEYS}, months)
+    
+    buffer = output_path if output_path is not None else BytesIO()
+    doc = _PortfolioDocTemplate(buffer, pagesize=letter, **PAGE_MARGINS)
+    doc.language = language
+    
+    toc = TableOfContents(levelStyles=[styles['toc_0'], styles['toc_1']], dotsMinLevel=0)
+    elements = [
+        Paragraph(get_text(language, 'pdf', 'portfolio_title'), styles['title']),
+        Paragraph(f"{get_text(language, 'pdf', 'generated_date')} {report_date()}",
+                  styles['date']),
+        Spacer(1, 0.3*inch),
+        Paragraph(get_text(language, 'pdf', 'portfolio_intro').format(count=len(teams)), styles['body']),
+        Paragraph(get_text(language, 'pdf', 'toc_title'), styles['heading']),
+        toc,
+        PageBreak(),
+        _toc_heading(get_text(language, 'pdf', 'rollup_title'), styles['heading'], 0, 'rollup'),
+    ]
+    if teams:
+        elements.append(_rollup_table(language, teams, results, answered))
+    elements.append(PageBreak())
+    elements.append(_toc_heading(get_text(language, 'pdf', 'teams_title'), styles['heading'], 0, 'teams'))
+    
+    for index, (team_id, inputs) in enumerate(teams):
+        if index:
+            elements.append(PageBreak())
+        elements.append(_toc_heading(escape(team_id), styles['heading'], 1, f'team-{index}'))
+        questions_data = _team_questions_data(inputs, results, index, answered[index])
+        if not questions_data:
+            elements.append(Paragraph(get_text(language, 'pdf', 'team_no_data'), styles['body']))
+        for question in QUESTION_SECTIONS:
+            if question in questions_data:
+                elements.extend(_question_section(language, question, questions_data[question], {}))
     
-    # Add footer note
     elements.append(Spacer(1, 0.3*inch))
-    footer_note = Paragraph(get_text(language, 'pdf', 'footer_note'), 
-                           ParagraphStyle('FooterStyle', parent=styles['Normal'], 
-                                        fontSize=9, textColor=colors.grey, 
-                                        alignment=TA_JUSTIFY, italic=True))
-    elements.append(footer_note)
+    elements.append(Paragraph(get_text(language, 'pdf', 'footer_note'), styles['footer']))
     
-    # Build PDF
-    doc.build(elements)
+    # Seed the table of contents with all headings, so the first pass already lays it out at its
+    # final length and the second pass only fills in the page numbers. Otherwise the first pass
+    # lays out an empty table of contents and every page moves in the second pass, needing a third.
+    for flowable in elements:
+        if getattr(flowable, 'toc_level', None) is not None:
+            toc.addEntry(flowable.toc_level, flowable.getPlainText(), 0, flowable.toc_key)
+    
+    # Lay out until the page numbers in the table of contents are stable
+    if progress:
+        progress('layout')
+    with span('pdf.portfolio.layout'):
+        doc.multiBuild(elements, onFirstPage=_draw_page_number, onLaterPages=_draw_page_number)
     
-    if not output_path:
+    if output_path is None:
         buffer.seek(0)
         return buffer
     
     return None
+
+def spooled_file():
+    """
+    Returns:
+        SpooledTemporaryFile: Binary file kept in memory up to SPOOL_MAX_BYTES, then moved to disk
+    """
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode='w+b')
+
+
+def write_executive_summary(language, questions_data, target=None, max_workers=3, progress=None, date=None):
+    """
+    Write the executive summary to a file instead of returning it in memory.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        questions_data (Scenario or dict): As for generate_executive_summary
+        target: Writable binary file-like object, e.g. an open file, a socket file or a zip
+            entry. Defaults to a spooled_file()
+        max_workers (int): Number of figures converted to images in parallel
+        progress (callable): As for generate_executive_summary
+        date (str): As for generate_executive_summary
+
+    Returns:
+        The target. A default spooled file is rewound, ready to be read or streamed with iter_chunks()
+    """
+    spooled = target is None
+    if spooled:
+        target = spooled_file()
+    generate_executive_summary(language, questions_data, target, max_workers, progress, date)
+    target.flush()
+    if spooled:
+        target.seek(0)
+    return target
+
+
+def iter_chunks(file, chunk_size=CHUNK_SIZE):
+    """
+    Read a report file in chunks, e.g. to stream it to a client.
+
+    Args:
+        file: Readable binary file-like object, read from its current position
+        chunk_size (int): Bytes per chunk
+
+    Yields:
+        bytes: The next chunk
+    """
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
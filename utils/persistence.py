@@ -1,81 +1,283 @@
 # persistence.py
 """
-File-based persistence for user input values
+Persistence for user input values
+
+The storage backend is chosen with the TAC_STORAGE_BACKEND environment variable:
+    'json'   - single user_inputs.json shared by all sessions (default)
+    'sqlite' - SQLite database (TAC_SQLITE_PATH, default 'user_inputs.db'),
+               with inputs kept separately per user or browser session
+
+Every saved input set is also recorded as a version in the scenario history
+(utils.history), so earlier inputs, including cleared ones, can be restored.
 """
 
-import json
+import atexit
 import os
+import threading
+
+from utils.history import HISTORY_ERRORS, get_history
+from utils.storage import STORAGE_ERRORS, JsonFileBackend, SQLiteBackend
 
 # File to store user inputs
 DATA_FILE = 'user_inputs.json'
 
+# Database used by the SQLite backend
+DB_FILE = 'user_inputs.db'
+
+# Namespace used outside of a Streamlit session
+DEFAULT_NAMESPACE = 'default'
+
+_backend = None
+_backend_lock = threading.Lock()
+
+# Updates staged by update_value until the next flush(), per namespace
+_pending = {}
+_pending_lock = threading.Lock()
 
-def load_data():
+
+def get_backend():
     """
-    Load user input data from JSON file.
-    
+    Get the storage backend, creating it from the environment on first use.
+
     Returns:
-        dict: Dictionary with all saved input values, or empty dict if file doesn't exist
+        StorageBackend: The active backend
     """
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            # If file is corrupted or can't be read, return empty dict
-            return {}
-    return {}
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                kind = os.environ.get('TAC_STORAGE_BACKEND', 'json').lower()
+                if kind == 'sqlite':
+                    _backend = SQLiteBackend(os.environ.get('TAC_SQLITE_PATH', DB_FILE))
+                elif kind == 'json':
+                    _backend = JsonFileBackend(DATA_FILE)
+                else:
+                    raise ValueError(f"Unknown storage backend: {kind}")
+    return _backend
 
 
-def save_data(data):
+def set_backend(backend):
     """
-    Save user input data to JSON file.
-    
+    Replace the storage backend. Pending updates are written to the old one first.
+
     Args:
-        data (dict): Dictionary containing all input values to save
+        backend (StorageBackend): Backend to use from now on
+    """
+    global _backend
+    flush()
+    with _backend_lock:
+        _backend = backend
+
+
+def current_namespace():
+    """
+    Get the namespace of the current caller.
+
+    Inside a Streamlit session this is the logged-in user's email if
+    available, otherwise the session id. Outside Streamlit it is
+    DEFAULT_NAMESPACE.
+
+    Returns:
+        str: Namespace to key stored values by
+    """
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return DEFAULT_NAMESPACE
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return DEFAULT_NAMESPACE
+    user_info = getattr(ctx, 'user_info', None) or {}
+    if user_info.get('is_logged_in') and user_info.get('email'):
+        return user_info['email']
+    return ctx.session_id
+
+
+def get_cache_stats():
+    """
+    Get the backend's counters, e.g. hit/miss counts of the JSON file cache.
+
+    Returns:
+        dict: Counter name -> value
+    """
+    return get_backend().get_stats()
+
+
+def reset_cache_stats():
+    """
+    Reset the backend's counters.
+    """
+    get_backend().reset_stats()
+
+
+def history_namespace(namespace=None):
+    """
+    Get the namespace the scenario history of a namespace is kept under.
+
+    That is the namespace the backend stores the values under: the JSON
+    file is shared by all sessions, so its history is shared as well and
+    survives new browser sessions.
+
+    Args:
+        namespace (str): Namespace, defaults to current_namespace()
+
+    Returns:
+        str: Namespace to pass to utils.history
+    """
+    return get_backend().stored_namespace(namespace or current_namespace())
+
+
+def _record_version(namespace, values):
+    """
+    Record saved values in the scenario history. A failing history doesn't fail the save.
     """
     try:
-        with open(DATA_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
-    except IOError:
-        # Silently fail if we can't write the file
+        get_history().record(history_namespace(namespace), values)
+    except HISTORY_ERRORS:
         pass
 
 
-def update_value(key, value):
+def load_data(namespace=None):
+    """
+    Load all user input data, including updates not yet flushed.
+
+    Args:
+        namespace (str): Namespace to load, defaults to current_namespace()
+
+    Returns:
+        dict: Dictionary with all saved input values, or empty dict if nothing is saved
+    """
+    namespace = namespace or current_namespace()
+    data = dict(get_backend().load(namespace))
+    with _pending_lock:
+        data.update(_pending.get(namespace, {}))
+    return data
+
+
+def save_data(data, namespace=None):
+    """
+    Save user input data, replacing everything saved before.
+
+    Args:
+        data (dict): Dictionary containing all input values to save
+        namespace (str): Namespace to save, defaults to current_namespace()
+    """
+    namespace = namespace or current_namespace()
+    with _pending_lock:
+        _pending.pop(namespace, None)
+    try:
+        get_backend().replace(namespace, data)
+    except STORAGE_ERRORS:
+        # Silently fail if we can't write the data
+        return
+    _record_version(namespace, data)
+
+
+def update_value(key, value, namespace=None):
     """
     Update a single value in the persistent storage.
-    
+
+    The update is visible to get_value immediately but only written to the
+    backend by the next flush(), so all updates of one rerun end up in a
+    single write.
+
     Args:
         key (str): The key to update
         value: The value to store
+        namespace (str): Namespace to update, defaults to current_namespace()
     """
-    data = load_data()
-    data[key] = value
-    save_data(data)
+    namespace = namespace or current_namespace()
+    with _pending_lock:
+        _pending.setdefault(namespace, {})[key] = value
 
 
-def get_value(key, default=0):
+def flush():
+    """
+    Write all pending updates to the backend, one write per namespace, and
+    record each namespace's saved values in the scenario history.
+    """
+    with _pending_lock:
+        batches = {namespace: dict(updates) for namespace, updates in _pending.items() if updates}
+    if not batches:
+        return
+    backend = get_backend()
+    for namespace, updates in batches.items():
+        try:
+            backend.update(namespace, updates)
+            saved = backend.load(namespace)
+        except STORAGE_ERRORS:
+            # Keep the updates pending and retry on the next flush
+            continue
+        _record_version(namespace, saved)
+        with _pending_lock:
+            pending = _pending.get(namespace, {})
+            for key, value in updates.items():
+                if key in pending and pending[key] is value:
+                    del pending[key]
+            if not pending:
+                _pending.pop(namespace, None)
+
+
+def get_value(key, default=0, namespace=None):
     """
     Get a single value from persistent storage.
-    
+
     Args:
         key (str): The key to retrieve
         default: Default value if key doesn't exist
-        
+        namespace (str): Namespace to read, defaults to current_namespace()
+
     Returns:
         The stored value or default
     """
-    data = load_data()
-    return data.get(key, default)
+    namespace = namespace or current_namespace()
+    with _pending_lock:
+        pending = _pending.get(namespace)
+        if pending and key in pending:
+            return pending[key]
+    return get_backend().load(namespace).get(key, default)
 
 
-def clear_all_data():
+def clear_all_data(namespace=None):
     """
-    Clear all saved data by deleting the file.
+    Clear all saved data of a namespace.
+
+    The cleared values stay in the scenario history and can be restored
+    with restore_version().
+
+    Args:
+        namespace (str): Namespace to clear, defaults to current_namespace()
     """
-    if os.path.exists(DATA_FILE):
-        try:
-            os.remove(DATA_FILE)
-        except IOError:
-            pass
+    namespace = namespace or current_namespace()
+    with _pending_lock:
+        _pending.pop(namespace, None)
+    backend = get_backend()
+    try:
+        # Values saved before the history was kept have no version yet
+        _record_version(namespace, backend.load(namespace))
+        backend.clear(namespace)
+    except STORAGE_ERRORS:
+        return
+    _record_version(namespace, {})
+
+
+def restore_version(version, namespace=None):
+    """
+    Restore the input values of a version from the scenario history.
+
+    The restored values are saved as a new version, so the versions after
+    the restored one stay in the history as well.
+
+    Args:
+        version (int): Version to restore, see utils.history.ScenarioHistory.versions()
+        namespace (str): Namespace to restore, defaults to current_namespace()
+
+    Raises:
+        KeyError: If the version doesn't exist or isn't a version of the namespace
+    """
+    namespace = namespace or current_namespace()
+    save_data(get_history().load(version, history_namespace(namespace))['values'], namespace)
+
+
+# Don't lose updates of the last rerun when the server shuts down
+atexit.register(flush)
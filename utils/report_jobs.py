@@ -0,0 +1,242 @@
+# report_jobs.py
+"""
+Background jobs for executive summary exports.
+
+Exports are submitted to a bounded worker pool instead of running inside
+the Streamlit script, so the page renders immediately and polls the job.
+Each job belongs to an owner (a browser session) and is identified by a
+job id. Submitting a new export cancels the owner's previous in-flight
+export, and submitting the same report again returns the running job.
+A cancelled job that is already running is CANCELLING until its worker
+stops, and still counts toward the pending limit. Finished jobs keep their
+result for a TTL.
+
+The default queue used by the app is configured with environment variables:
+    TAC_REPORT_WORKERS      - exports generated in parallel (default 2)
+    TAC_REPORT_MAX_PENDING  - exports queued or running before new ones are refused (default 8)
+    TAC_REPORT_TTL          - seconds a finished export is kept (default 600)
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLING = 'cancelling'
+CANCELLED = 'cancelled'
+
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class QueueFull(Exception):
+    """
+    Raised by submit() when the maximum of queued and running jobs is reached.
+    """
+
+
+class JobCancelled(Exception):
+    """
+    Raised inside a job, by its progress callback, once the job is cancelled.
+    """
+
+
+class Job:
+    """
+    State of one export. Read its fields, they are updated by the worker.
+    """
+
+    def __init__(self, job_id, owner, key):
+        self.id = job_id
+        self.owner = owner
+        self.key = key
+        self.status = QUEUED
+        self.stage = None
+        self.result = None
+        self.error = None
+        self.created = time.monotonic()
+        self.finished = None
+        self.future = None
+
+    def progress(self, stage):
+        """
+        Report the stage the job is in. Raises JobCancelled if it was cancelled,
+        so long-running jobs stop at the next stage.
+
+        Args:
+            stage (str): Stage name, e.g. 'data', 'charts', 'layout'
+        """
+        if self.status in (CANCELLING, CANCELLED):
+            raise JobCancelled(self.id)
+        self.stage = stage
+
+
+class ReportJobs:
+    """
+    Bounded pool of background export jobs with per-owner job ids.
+    """
+
+    def __init__(self, workers=2, max_pending=8, ttl=600):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, owner, key, function):
+        """
+        Start a job, unless the owner already runs the same one.
+
+        The owner's other in-flight jobs are cancelled: queued ones never run,
+        running ones stop at their next progress() call.
+
+        Args:
+            owner (str): Session the job belongs to
+            key (str): Identity of the result, e.g. the PDF cache key
+            function (callable): Called as function(job) on a worker thread,
+                returns the result and may call job.progress(stage)
+
+        Returns:
+            Job: The new or already running job
+
+        Raises:
+            QueueFull: If max_pending jobs are queued, running or cancelling
+        """
+        with self._lock:
+            self._expire()
+            for job in self._jobs.values():
+                if job.owner != owner or job.status in FINISHED or job.status == CANCELLING:
+                    continue
+                if job.key == key:
+                    return job
+                self._cancel(job)
+            in_flight = sum(1 for job in self._jobs.values() if job.status not in FINISHED)
+            if in_flight >= self.max_pending:
+                raise QueueFull(f"{in_flight} exports in progress")
+            job = Job(uuid.uuid4().hex, owner, key)
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job, function)
+            return job
+
+    def _run(self, job, function):
+        try:
+            with self._lock:
+                if job.status == CANCELLING:
+                    return
+                job.status = RUNNING
+            result = function(job)
+        except JobCancelled:
+            pass
+        except Exception as e:
+            print(f"Error in report job {job.id}: {e}")
+            with self._lock:
+                if job.status != CANCELLING:
+                    job.error = str(e)
+                    job.status = FAILED
+        else:
+            with self._lock:
+                if job.status != CANCELLING:
+                    job.result = result
+                    job.status = DONE
+        finally:
+            with self._lock:
+                # The worker is free again, only now the job stops counting as in flight
+                if job.status == CANCELLING:
+                    job.status = CANCELLED
+                job.finished = time.monotonic()
+
+    def _cancel(self, job):
+        """
+        A queued job is cancelled right away, a running one is CANCELLING until its worker stops.
+        Must be called while holding the lock.
+        """
+        if job.future is not None and job.future.cancel():
+            job.status = CANCELLED
+            job.finished = time.monotonic()
+        else:
+            job.status = CANCELLING
+
+    def _expire(self):
+        """
+        Drop finished jobs older than the TTL. Must be called while holding the lock.
+        """
+        now = time.monotonic()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.status in FINISHED and job.finished is not None and now - job.finished > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, owner, job_id):
+        """
+        Look up a job of an owner.
+
+        Args:
+            owner (str): Session the job belongs to
+            job_id (str): Id returned by submit()
+
+        Returns:
+            Job: The job, None if it doesn't exist, belongs to someone else or has expired
+        """
+        with self._lock:
+            self._expire()
+            job = self._jobs.get(job_id)
+        return job if job is not None and job.owner == owner else None
+
+    def cancel(self, owner, job_id):
+        """
+        Cancel a job of an owner if it is still in flight.
+
+        Returns:
+            bool: Whether the job was cancelled
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.owner != owner or job.status in FINISHED or job.status == CANCELLING:
+                return False
+            self._cancel(job)
+            return True
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Number of jobs per status
+        """
+        with self._lock:
+            stats = {status: 0 for status in (QUEUED, RUNNING, CANCELLING) + FINISHED}
+            for job in self._jobs.values():
+                stats[job.status] += 1
+            return stats
+
+    def shutdown(self):
+        """
+        Cancel queued jobs and wait for the running ones.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_default_jobs = None
+_default_jobs_lock = threading.Lock()
+
+
+def get_report_jobs():
+    """
+    Get the process-wide job queue, configured from the environment on first use.
+
+    Returns:
+        ReportJobs: The shared queue
+    """
+    global _default_jobs
+    if _default_jobs is None:
+        with _default_jobs_lock:
+            if _default_jobs is None:
+                _default_jobs = ReportJobs(
+                    workers=int(os.environ.get('TAC_REPORT_WORKERS', 2)),
+                    max_pending=int(os.environ.get('TAC_REPORT_MAX_PENDING', 8)),
+                    ttl=float(os.environ.get('TAC_REPORT_TTL', 600)),
+                )
+    return _default_jobs
@@ -0,0 +1,257 @@
+# scenario.py
+"""
+The scenario model: one set of inputs and everything derived from it.
+
+A Scenario is immutable and hashable. Its results, simulation, sensitivity
+sweeps, chart descriptions and page figures are computed on first access
+and kept on the object. Scenarios are shared per set of inputs
+(get_scenario, current_scenario), so the question pages, the home page and
+the executive summary use one computation per input change instead of
+each deriving the values again.
+"""
+
+from dataclasses import dataclass, field
+from functools import cached_property
+
+from utils.calculations import INPUT_KEYS, answered_questions, calculate_all, projection_months
+from utils.chart_specs import q1_chart, q2_chart, q3_chart, sweep_chart
+from utils.memo import memoize
+from utils.persistence import get_value
+from utils.sensitivity import SWEEP_KEYS, report_sweep
+from utils.simulation import SETTINGS_KEYS, simulate_inputs, simulation_band
+from utils.translations import format_number
+
+# Keys a scenario is made of, as in user_inputs.json
+SCENARIO_KEYS = INPUT_KEYS + SETTINGS_KEYS + SWEEP_KEYS
+
+QUESTIONS = ('q1', 'q2', 'q3')
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Inputs of the three questions with their uncertainty and sweep settings.
+
+    Create scenarios with get_scenario() or current_scenario() to share them.
+    Derived values are computed once and shared, don't modify them.
+
+    Args:
+        values (tuple): (key, value) pairs of SCENARIO_KEYS, in that order
+    """
+    values: tuple
+    # Values derived per argument: sweeps, charts, figures and questions_data
+    _derived: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_inputs(cls, inputs):
+        """
+        Args:
+            inputs (dict): Input values and settings keyed as in user_inputs.json, missing keys count as 0
+
+        Returns:
+            Scenario: New, unshared scenario
+        """
+        return cls(tuple((key, inputs.get(key, 0)) for key in SCENARIO_KEYS))
+
+    def _derive(self, key, function):
+        try:
+            return self._derived[key]
+        except KeyError:
+            return self._derived.setdefault(key, function())
+
+    @cached_property
+    def inputs(self):
+        return dict(self.values)
+
+    @cached_property
+    def answered(self):
+        """
+        (has_q1_data, has_q2_data, has_q3_data)
+        """
+        return answered_questions(self.inputs)
+
+    @cached_property
+    def report_inputs(self):
+        """
+        The inputs that end up in the executive summary: those of the answered
+        questions and the uncertainty settings.
+        """
+        prefixes = tuple(f'{question}_' for question, has_data in zip(QUESTIONS, self.answered) if has_data)
+        return {key: value for key, value in self.values if key.startswith(prefixes + ('simulation_',))}
+
+    @cached_property
+    def months(self):
+        return projection_months(self.inputs)
+
+    @cached_property
+    def results(self):
+        """
+        As returned by utils.calculations.calculate_all for this scenario.
+        """
+        return calculate_all(self.inputs, self.months)
+
+    @cached_property
+    def time_savings(self):
+        return float(self.results['q1_time_savings'])
+
+    @cached_property
+    def runs_to_break_even(self):
+        return float(self.results['q2_runs_to_break_even'])
+
+    @cached_property
+    def potential(self):
+        return self.results['q3_potential'].tolist()
+
+    @cached_property
+    def can_afford(self):
+        return bool(self.results['q3_can_afford'])
+
+    @cached_property
+    def simulation(self):
+        """
+        As returned by utils.simulation.simulate_inputs, None without an uncertainty spread.
+        """
+        return simulate_inputs(self.inputs, self.months)
+
+    def sweep(self, question):
+        """
+        The sensitivity sweep of 'q2' or 'q3' for the executive summary, None if it isn't asked for.
+        """
+        return self._derive(('sweep', question), lambda: report_sweep(question, self.inputs))
+
+    def chart(self, question, language):
+        """
+        Chart description of a question (see utils.chart_specs).
+
+        Args:
+            question (str): 'q1', 'q2' or 'q3', which must be answered
+            language (str): Language code ('en', 'de', 'fr', 'lb')
+
+        Returns:
+            dict: Chart description
+        """
+        def build():
+            inputs = self.inputs
+            if question == 'q1':
+                return q1_chart(language, inputs['q1_manual_test_execution_time'],
+                                inputs['q1_automated_test_execution_time_min'] / 60, self.time_savings,
+                                simulation_band(self.simulation, 'q1_time_savings'))
+            if question == 'q2':
+                return q2_chart(language, inputs['q2_initial_investment'], inputs['q2_time_savings_per_run'],
+                                int(self.runs_to_break_even),
+                                simulation_band(self.simulation, 'q2_runs_to_break_even'))
+            return q3_chart(language, self.potential, band=simulation_band(self.simulation, 'q3_potential'))
+        return self._derive(('chart', question, language), build)
+
+    def figure(self, question, language):
+        """
+        The figure a question page displays: a Plotly figure for 'q1' and 'q2',
+        the Matplotlib chart rendered to PNG bytes for 'q3'.
+        """
+        def build():
+            from utils.charts import plotly_figure, render_png
+            chart = self.chart(question, language)
+            return render_png(chart) if question == 'q3' else plotly_figure(chart)
+        return self._derive(('figure', question, language), build)
+
+    def questions_data(self, language, with_charts=True):
+        """
+        Results and charts of the answered questions, as generate_executive_summary expects them.
+
+        With an uncertainty spread every question also gets an 'uncertainty'
+        entry, and questions 2 and 3 get a 'sweep_chart' heatmap if their
+        sweep settings ask for it.
+
+        Args:
+            language (str): Language code ('en', 'de', 'fr', 'lb')
+            with_charts (bool): Include the charts, 'chart' is None otherwise
+
+        Returns:
+            dict: questions_data, shared with other callers
+        """
+        return self._derive(('questions_data', language, with_charts),
+                            lambda: self._questions_data(language, with_charts))
+
+    def _questions_data(self, language, with_charts):
+        inputs = self.inputs
+        has_q1_data, has_q2_data, has_q3_data = self.answered
+        questions_data = {}
+
+        if has_q1_data:
+            questions_data['q1'] = {
+                'inputs': {
+                    'manual_time': inputs['q1_manual_test_execution_time'],
+                    'automated_time_min': inputs['q1_automated_test_execution_time_min']
+                },
+                'results': {
+                    'time_savings': self.time_savings,
+                    'formatted_savings': format_number(self.time_savings, 2, language)
+                },
+            }
+
+        if has_q2_data:
+            questions_data['q2'] = {
+                'inputs': {
+                    'initial_investment': inputs['q2_initial_investment'],
+                    'time_savings': inputs['q2_time_savings_per_run']
+                },
+                'results': {
+                    'runs_to_break_even': int(self.runs_to_break_even)
+                },
+            }
+
+        if has_q3_data:
+            questions_data['q3'] = {
+                'inputs': {
+                    'TH': inputs['q3_th'],
+                    'MT': inputs['q3_mt'],
+                    'N': inputs['q3_n'],
+                    'A': inputs['q3_a'],
+                    'horizon_months': self.months
+                },
+                'results': {
+                    'potential_array': self.potential,
+                    'can_afford': self.can_afford
+                },
+            }
+
+        for question, data in questions_data.items():
+            data['chart'] = self.chart(question, language) if with_charts else None
+            result = self.sweep(question) if with_charts and question in ('q2', 'q3') else None
+            if result is not None:
+                data['sweep_chart'] = sweep_chart(language, result)
+            if self.simulation is not None:
+                data['uncertainty'] = {'spread': inputs['simulation_spread'], 'simulation': self.simulation}
+
+        return questions_data
+
+
+@memoize(maxsize=64)
+def _shared(scenario):
+    return scenario
+
+
+def get_scenario(inputs):
+    """
+    Get the shared scenario of a set of inputs.
+
+    Args:
+        inputs (dict): Input values and settings keyed as in user_inputs.json, missing keys count as 0
+
+    Returns:
+        Scenario: The scenario already computed for these inputs, if any
+    """
+    return _shared(Scenario.from_inputs(inputs))
+
+
+def current_scenario(**values):
+    """
+    Get the shared scenario of the stored inputs of the current session.
+
+    Args:
+        **values: Values that replace stored ones, e.g. the current widget values of a page
+
+    Returns:
+        Scenario
+    """
+    return get_scenario({key: values[key] if key in values else get_value(key, 0) for key in SCENARIO_KEYS})
@@ -0,0 +1,149 @@
+# sensitivity.py
+"""
+Two-dimensional sensitivity sweeps: the Question 2 break-even runs or the
+Question 3 first-month potential over a grid of two inputs, each varied
+around its current value. The whole grid is evaluated in one broadcast pass
+of the calculation engine, and results are memoized per grid definition.
+"""
+
+import numpy as np
+
+from utils.calculations import INPUT_KEYS, calculate_all
+from utils.memo import memoize
+
+# Inputs that can be swept, per question
+SWEEP_AXES = {
+    'q2': ('q2_initial_investment', 'q2_time_savings_per_run'),
+    'q3': ('q3_th', 'q3_mt', 'q3_n', 'q3_a'),
+}
+
+# Grid resolutions offered, in cells per axis
+SWEEP_STEPS = (50, 100, 250, 500)
+DEFAULT_SWEEP_RANGE = 50
+DEFAULT_SWEEP_STEPS = 100
+
+# Sweep settings as stored in user_inputs.json: axes, range (± %), resolution
+# and whether the heatmap is part of the executive summary
+SWEEP_KEYS = (
+    'q2_sweep_range',
+    'q2_sweep_steps',
+    'q2_sweep_in_report',
+    'q3_sweep_x',
+    'q3_sweep_y',
+    'q3_sweep_range',
+    'q3_sweep_steps',
+    'q3_sweep_in_report',
+)
+
+
+def sweep_axes(question, inputs):
+    """
+    Inputs of a question that can be varied, only those with a current value.
+
+    Args:
+        question (str): 'q2' or 'q3'
+        inputs (dict): Input values, keyed as in user_inputs.json
+
+    Returns:
+        tuple: Input keys
+    """
+    return tuple(key for key in SWEEP_AXES[question] if float(inputs.get(key, 0) or 0) > 0)
+
+
+def sweep_settings(question, inputs):
+    """
+    The sweep grid definition stored alongside the inputs.
+
+    Args:
+        question (str): 'q2' or 'q3'
+        inputs (dict): Input values and sweep settings (see SWEEP_KEYS)
+
+    Returns:
+        tuple: (x_key, y_key, span, steps), or None if fewer than two inputs can be varied
+    """
+    axes = sweep_axes(question, inputs)
+    if len(axes) < 2:
+        return None
+    x_key = inputs.get(f'{question}_sweep_x') or axes[0]
+    x_key = x_key if x_key in axes else axes[0]
+    y_key = inputs.get(f'{question}_sweep_y') or next(key for key in axes if key != x_key)
+    y_key = y_key if y_key in axes and y_key != x_key else next(key for key in axes if key != x_key)
+    span = float(inputs.get(f'{question}_sweep_range') or DEFAULT_SWEEP_RANGE) / 100
+    steps = int(inputs.get(f'{question}_sweep_steps') or DEFAULT_SWEEP_STEPS)
+    return x_key, y_key, min(max(span, 0.01), 0.99), min(max(steps, 2), SWEEP_STEPS[-1])
+
+
+def grid_values(value, span, steps):
+    """
+    Evenly spaced values from value x (1 - span) to value x (1 + span).
+
+    Returns:
+        numpy.ndarray: `steps` values
+    """
+    return value * (1 + np.linspace(-span, span, steps))
+
+
+@memoize(maxsize=16)
+def sweep(inputs, question, x_key, y_key, span, steps):
+    """
+    Evaluate a question over a grid of two inputs.
+
+    Args:
+        inputs (tuple): Sorted (key, value) pairs of the input values
+        question (str): 'q2' (runs to break even) or 'q3' (potential next month)
+        x_key (str): Input varied along the horizontal axis
+        y_key (str): Input varied along the vertical axis
+        span (float): Relative range around the current values, e.g. 0.5 for ±50%
+        steps (int): Grid cells per axis
+
+    Returns:
+        dict: {
+            'question', 'x_key', 'y_key': as given,
+            'x': array of steps, 'y': array of steps,
+            'values': array of shape (steps, steps), indexed [y, x], NaN where undefined,
+            'current': (x value, y value)
+        }
+    """
+    values = {key: float(value or 0) for key, value in inputs if key in INPUT_KEYS}
+    x = grid_values(values[x_key], span, steps)
+    y = grid_values(values[y_key], span, steps)
+
+    # Broadcasting a row against a column evaluates the whole grid in one pass
+    columns = dict(values)
+    columns[x_key] = x[np.newaxis, :]
+    columns[y_key] = y[:, np.newaxis]
+    results = calculate_all(columns, months=1)
+
+    if question == 'q2':
+        grid = np.where(np.isfinite(results['q2_runs_to_break_even']), results['q2_runs_to_break_even'], np.nan)
+    else:
+        grid = results['q3_potential'][..., 0]
+    return {
+        'question': question,
+        'x_key': x_key,
+        'y_key': y_key,
+        'x': x,
+        'y': y,
+        'values': grid,
+        'current': (values[x_key], values[y_key]),
+    }
+
+
+def report_sweep(question, inputs):
+    """
+    The sweep to include in the executive summary, if the stored settings ask for one.
+
+    Args:
+        question (str): 'q2' or 'q3'
+        inputs (dict): Input values and sweep settings (see SWEEP_KEYS)
+
+    Returns:
+        dict: As returned by sweep(), or None
+    """
+    if not inputs.get(f'{question}_sweep_in_report'):
+        return None
+    settings = sweep_settings(question, inputs)
+    if settings is None:
+        return None
+    values = tuple(sorted((key, float(inputs.get(key, 0) or 0)) for key in INPUT_KEYS))
+    return sweep(values, question, *settings)
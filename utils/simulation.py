@@ -0,0 +1,308 @@
+# simulation.py
+"""
+Monte Carlo simulation of the three questions for uncertain inputs.
+
+Each input can be given a distribution (uniform, triangular or lognormal)
+instead of a single value. Samples are drawn and evaluated with the
+vectorized calculation engine in fixed-size chunks, and percentiles are
+taken from per-chunk histograms, so memory stays bounded however many
+samples are drawn.
+"""
+
+import warnings
+
+import numpy as np
+
+from utils.calculations import INPUT_KEYS, PROJECTION_MONTHS, calculate_all
+from utils.memo import memoize
+from utils.translations import get_text, format_number
+
+DISTRIBUTIONS = ('uniform', 'triangular', 'lognormal')
+
+# Percentiles reported for every result: P10, P50 and P90
+PERCENTILES = (10, 50, 90)
+
+# Uncertainty settings as stored in user_inputs.json next to the inputs:
+# the distribution name and the spread in percent (0 turns the simulation off)
+SETTINGS_KEYS = ('simulation_distribution', 'simulation_spread')
+DEFAULT_DISTRIBUTION = 'triangular'
+
+# Largest spread in percent, the inputs would reach zero at 100%
+MAX_SPREAD = 90
+
+# Inputs that describe the projection rather than the team, never sampled
+FIXED_KEYS = ('q3_horizon_months',)
+
+# Most values of the Question 3 curve evaluated at once, chunks shrink for long horizons
+CHUNK_VALUES = 1 << 20
+
+# z-score of the 90th percentile of a normal distribution
+_Z90 = 1.2815515655446004
+
+
+def spread_distributions(inputs, distribution='triangular', spread=0.2):
+    """
+    Distributions of ±`spread` around each input value.
+
+    The uniform and triangular distributions range from value x (1 - spread)
+    to value x (1 + spread), the triangular one peaking at the value. The
+    lognormal distribution has its median at the value and its 90th
+    percentile at value x (1 + spread).
+
+    Args:
+        inputs (dict): Input values, keyed as in user_inputs.json
+        distribution (str): One of DISTRIBUTIONS
+        spread (float): Relative uncertainty of every input, 0 to 1
+
+    Returns:
+        dict: Input key -> distribution spec, for simulate()
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {distribution}")
+    distributions = {}
+    for key in INPUT_KEYS:
+        value = float(inputs.get(key, 0) or 0)
+        if key in FIXED_KEYS or value == 0 or spread <= 0:
+            continue
+        if distribution == 'lognormal':
+            distributions[key] = {'distribution': 'lognormal', 'median': value,
+                                  'sigma': np.log1p(spread) / _Z90}
+        elif distribution == 'triangular':
+            distributions[key] = {'distribution': 'triangular', 'low': value * (1 - spread),
+                                  'mode': value, 'high': value * (1 + spread)}
+        else:
+            distributions[key] = {'distribution': 'uniform', 'low': value * (1 - spread),
+                                  'high': value * (1 + spread)}
+    return distributions
+
+
+def draw(rng, spec, size):
+    """
+    Draw samples of one input.
+
+    Args:
+        rng (numpy.random.Generator): Random number generator
+        spec (dict): {'distribution': 'uniform', 'low', 'high'},
+            {'distribution': 'triangular', 'low', 'mode', 'high'} or
+            {'distribution': 'lognormal', 'median', 'sigma'}
+        size (int): Number of samples
+
+    Returns:
+        numpy.ndarray: Samples
+    """
+    distribution = spec.get('distribution')
+    if distribution == 'uniform':
+        return rng.uniform(spec['low'], spec['high'], size)
+    if distribution == 'triangular':
+        if spec['low'] == spec['high']:
+            return np.full(size, float(spec['mode']))
+        return rng.triangular(spec['low'], spec['mode'], spec['high'], size)
+    if distribution == 'lognormal':
+        return spec['median'] * rng.lognormal(0.0, spec['sigma'], size)
+    raise ValueError(f"Unknown distribution: {distribution}")
+
+
+class _StreamingPercentiles:
+    """
+    Percentiles of a stream of value columns, from fixed-range histograms.
+
+    The bin range of each column is set by the first chunk (its 0.1 to 99.9
+    percentile, widened by half its span on both sides); values outside it
+    fall into an underflow or overflow bin. Percentiles are interpolated
+    within their bin, so their error is well below one bin width.
+    """
+
+    def __init__(self, columns, bins=4096):
+        self.columns = columns
+        self.bins = bins
+        self.counts = np.zeros((columns, bins + 2), dtype=np.int64)
+        self.posinf = np.zeros(columns, dtype=np.int64)
+        self.minimum = np.full(columns, np.inf)
+        self.maximum = np.full(columns, -np.inf)
+        self.low = None
+        self.width = None
+
+    def _set_range(self, values):
+        finite = np.where(np.isfinite(values), values, np.nan)
+        with warnings.catch_warnings():
+            # Columns without a finite value
+            warnings.simplefilter('ignore', RuntimeWarning)
+            low = np.nan_to_num(np.nanpercentile(finite, 0.1, axis=0))
+            high = np.nan_to_num(np.nanpercentile(finite, 99.9, axis=0))
+        span = high - low
+        padding = np.where(span > 0, span / 2, np.maximum(np.abs(low) / 2, 1.0))
+        self.low = low - padding
+        self.width = (span + 2 * padding) / self.bins
+
+    def add(self, values):
+        """
+        Add a chunk of values, NaN is ignored.
+
+        Args:
+            values (numpy.ndarray): Array of shape (n, columns)
+        """
+        if self.low is None:
+            self._set_range(values)
+        finite = np.isfinite(values)
+        self.posinf += np.sum(values == np.inf, axis=0)
+        self.minimum = np.minimum(self.minimum, np.min(values, axis=0, where=finite, initial=np.inf))
+        self.maximum = np.maximum(self.maximum, np.max(values, axis=0, where=finite, initial=-np.inf))
+
+        with np.errstate(invalid='ignore'):
+            index = np.clip(np.floor((values - self.low) / self.width), -1, self.bins) + 1
+        index = np.where(values == np.inf, np.nan, index)
+        valid = ~np.isnan(index)
+        flat = (index + np.arange(self.columns) * (self.bins + 2))[valid].astype(np.int64)
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """
+        Returns:
+            numpy.ndarray: Array of shape (len(percentiles), columns), NaN for columns without values
+        """
+        total = self.counts.sum(axis=1) + self.posinf
+        cumulative = np.cumsum(self.counts, axis=1)
+        rows = np.arange(self.columns)
+        result = np.empty((len(percentiles), self.columns))
+        for row, percentile in enumerate(percentiles):
+            target = np.maximum(percentile / 100 * total, 1)
+            position = np.minimum(np.sum(cumulative < target[:, np.newaxis], axis=1), self.bins + 1)
+            before = np.where(position > 0, cumulative[rows, position - 1], 0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                fraction = np.clip((target - before) / self.counts[rows, position], 0, 1)
+            value = self.low + (position - 1 + fraction) * self.width
+            value = np.clip(value, self.minimum, self.maximum)
+            value = np.where(target > total - self.posinf, np.inf, value)
+            result[row] = np.where(total > 0, value, np.nan)
+        return result
+
+
+def simulate(inputs, distributions, samples=100_000, months=PROJECTION_MONTHS, chunk_size=32_768,
+             seed=0, percentiles=PERCENTILES):
+    """
+    Simulate all three questions for uncertain inputs.
+
+    Args:
+        inputs (dict): Input values, keyed as in user_inputs.json. Inputs without a distribution keep their value
+        distributions (dict): Input key -> distribution spec (see draw() and spread_distributions())
+        samples (int): Number of samples
+        months (int): Number of months of the Question 3 projection
+        chunk_size (int): Most samples evaluated at once, bounds memory together with CHUNK_VALUES
+        seed (int): Random seed, the same seed gives the same results
+        percentiles (tuple): Percentiles to report
+
+    Returns:
+        dict: {
+            'samples': int,
+            'percentiles': tuple,
+            'q1_time_savings': array of len(percentiles),
+            'q2_runs_to_break_even': array of len(percentiles), inf where savings are not positive,
+            'q3_potential': array of shape (len(percentiles), months),
+            'q3_can_afford_probability': float
+        }
+    """
+    rng = np.random.default_rng(seed)
+    chunk_size = max(1, min(chunk_size, CHUNK_VALUES // months))
+    q1 = _StreamingPercentiles(1)
+    q2 = _StreamingPercentiles(1)
+    q3 = _StreamingPercentiles(months)
+    can_afford = 0
+
+    for start in range(0, samples, chunk_size):
+        size = min(chunk_size, samples - start)
+        columns = {key: inputs.get(key, 0) or 0 for key in INPUT_KEYS}
+        for key, spec in distributions.items():
+            columns[key] = draw(rng, spec, size)
+        results = calculate_all({key: np.broadcast_to(value, size) for key, value in columns.items()}, months)
+
+        q1.add(results['q1_time_savings'][:, np.newaxis])
+        # Without positive savings the investment is never recovered
+        savings = np.broadcast_to(np.asarray(columns['q2_time_savings_per_run'], dtype=float), size)
+        runs = np.where(savings > 0, results['q2_runs_to_break_even'], np.inf)
+        q2.add(runs[:, np.newaxis])
+        q3.add(results['q3_potential'])
+        can_afford += int(np.count_nonzero(results['q3_can_afford']))
+
+    return {
+        'samples': samples,
+        'percentiles': tuple(percentiles),
+        'q1_time_savings': q1.percentiles(percentiles)[:, 0],
+        'q2_runs_to_break_even': q2.percentiles(percentiles)[:, 0],
+        'q3_potential': q3.percentiles(percentiles),
+        'q3_can_afford_probability': can_afford / samples if samples else 0.0,
+    }
+
+
+@memoize(maxsize=32)
+def simulate_spread(inputs, distribution, spread, months=PROJECTION_MONTHS, samples=100_000):
+    """
+    Memoized simulate() of ±`spread` around the inputs, for the pages and the report.
+
+    Args:
+        inputs (tuple): Sorted (key, value) pairs of the input values
+        distribution (str): One of DISTRIBUTIONS
+        spread (float): Relative uncertainty of every input, 0 to 1
+        months (int): Number of months of the Question 3 projection
+        samples (int): Number of samples
+
+    Returns:
+        dict: As returned by simulate()
+    """
+    inputs = dict(inputs)
+    return simulate(inputs, spread_distributions(inputs, distribution, spread), samples, months)
+
+
+def simulate_inputs(inputs, months=PROJECTION_MONTHS):
+    """
+    Simulate the inputs with the uncertainty settings stored alongside them.
+
+    Args:
+        inputs (dict): Input values and settings, keyed as in user_inputs.json (see SETTINGS_KEYS)
+        months (int): Number of months of the Question 3 projection
+
+    Returns:
+        dict: As returned by simulate(), or None if the simulation is off
+    """
+    spread = float(inputs.get('simulation_spread') or 0)
+    if spread <= 0:
+        return None
+    distribution = inputs.get('simulation_distribution') or DEFAULT_DISTRIBUTION
+    values = tuple((key, float(inputs.get(key, 0) or 0)) for key in INPUT_KEYS)
+    return simulate_spread(values, distribution, spread / 100, months)
+
+
+def uncertainty_message(language, question, simulation, spread):
+    """
+    Describe the simulated range of a question's result.
+
+    Args:
+        language (str): Language code ('en', 'de', 'fr', 'lb')
+        question (str): Question key ('q1', 'q2' or 'q3')
+        simulation (dict): As returned by simulate() with the default percentiles
+        spread (float): Input uncertainty in percent
+
+    Returns:
+        str: Localized message
+    """
+    spread = format_number(spread, 0, language)
+    if question == 'q3':
+        probability = format_number(simulation['q3_can_afford_probability'] * 100, 0, language)
+        return get_text(language, 'simulation', 'q3_probability').format(spread=spread, probability=probability)
+    if question == 'q1':
+        low, median, high = (format_number(value, 2, language) for value in simulation['q1_time_savings'])
+    else:
+        low, median, high = (format_number(value, 0, language) if np.isfinite(value) else '∞'
+                             for value in simulation['q2_runs_to_break_even'])
+    return get_text(language, 'simulation', f'{question}_range').format(spread=spread, low=low, median=median, high=high)
+
+
+def simulation_band(simulation, result):
+    """
+    The (P10, P50, P90) band of a simulated result as hashable tuples, None without a simulation.
+    """
+    if simulation is None:
+        return None
+    percentiles = simulation[result]
+    if percentiles.ndim == 1:
+        return tuple(float(value) for value in percentiles)
+    return tuple(tuple(curve.tolist()) for curve in percentiles)
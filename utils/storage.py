@@ -0,0 +1,469 @@
+# storage.py
+"""
+Storage backends for user input values.
+
+utils.persistence provides the stable get_value/update_value/clear_all_data
+API on top of one of these backends. Every backend stores a flat dict of
+input values per namespace (a user or session id).
+"""
+
+import json
+import os
+import queue
+import shutil
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Errors a backend may raise when the underlying storage is unavailable
+STORAGE_ERRORS = (IOError, sqlite3.Error)
+
+
+def _default_file_mode():
+    """
+    Mode open() gives a new file under the process umask, e.g. 0o644.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Mode of a newly created data file; an existing file keeps its own mode
+DEFAULT_FILE_MODE = _default_file_mode()
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive lock on a file across processes.
+
+    The lock is taken on a separate '<path>.lock' file so the file itself
+    can be replaced atomically while the lock is held. It doesn't exclude
+    threads of the same process, hold a threading.Lock as well for that.
+
+    Args:
+        path (str): File to lock
+    """
+    with open(path + '.lock', 'a+') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class StorageBackend:
+    """
+    Interface of a storage backend.
+    """
+
+    def load(self, namespace):
+        """
+        Load all values of a namespace.
+
+        Args:
+            namespace (str): User or session id
+
+        Returns:
+            dict: Stored values, empty if nothing is stored. Must not be modified.
+        """
+        raise NotImplementedError
+
+    def update(self, namespace, values):
+        """
+        Store several values of a namespace in one write.
+
+        Args:
+            namespace (str): User or session id
+            values (dict): Key -> value to store
+        """
+        raise NotImplementedError
+
+    def replace(self, namespace, values):
+        """
+        Replace all values of a namespace.
+
+        Args:
+            namespace (str): User or session id
+            values (dict): Key -> value to store
+        """
+        raise NotImplementedError
+
+    def clear(self, namespace):
+        """
+        Delete all values of a namespace.
+
+        Args:
+            namespace (str): User or session id
+        """
+        raise NotImplementedError
+
+    def stored_namespace(self, namespace):
+        """
+        Get the namespace values of `namespace` are actually stored under.
+
+        Args:
+            namespace (str): User or session id
+
+        Returns:
+            str: `namespace`, or the shared namespace of a backend that doesn't separate them
+        """
+        return namespace
+
+    def get_stats(self):
+        """
+        Get backend specific counters.
+
+        Returns:
+            dict: Counter name -> value
+        """
+        return {}
+
+    def reset_stats(self):
+        """
+        Reset the counters returned by get_stats().
+        """
+
+
+class JsonFileBackend(StorageBackend):
+    """
+    Single JSON file shared by all namespaces.
+
+    Reads are served from an in-process cache keyed by the file's (mtime, size)
+    signature. Writes take a cross-process lock and replace the file atomically,
+    keeping its mode. A corrupted file is copied aside before it is overwritten.
+    """
+
+    _UNSET = object()
+
+    # All namespaces share the file, and are stored under this one
+    SHARED_NAMESPACE = 'default'
+
+    def __init__(self, path):
+        self.path = path
+        self._signature = self._UNSET
+        self._data = {}
+        self._stats = {'hits': 0, 'misses': 0}
+        self._cache_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def _file_signature(self):
+        """
+        Get the (mtime, size) signature of the data file, or None if it doesn't exist.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read_file(self, for_update=False):
+        """
+        Read and parse the data file, returning an empty dict if it is missing or corrupted.
+
+        Args:
+            for_update (bool): The result is written back. A corrupted file is then copied
+                aside first, and a file that can't be read raises IOError instead of
+                being overwritten
+        """
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+            error = f"expected an object, got {type(data).__name__}"
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            error = e
+        except IOError:
+            if for_update:
+                raise
+            return {}
+        if for_update:
+            backup_path = base_path = f"{self.path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+            number = 1
+            while os.path.exists(backup_path):
+                number += 1
+                backup_path = f"{base_path}-{number}"
+            shutil.copy2(self.path, backup_path)
+            print(f"Corrupted {self.path} ({error}) copied to {backup_path} before saving over it")
+        return {}
+
+    def _store_cache(self, data):
+        """
+        Replace the cached data after a write. Must be called while holding the file lock.
+        """
+        with self._cache_lock:
+            self._signature = self._file_signature()
+            self._data = data
+
+    def _invalidate_cache(self):
+        """
+        Drop the cached data so the next read goes to the file.
+        """
+        with self._cache_lock:
+            self._signature = self._UNSET
+            self._data = {}
+
+    @contextmanager
+    def _file_lock(self):
+        """
+        Hold an exclusive lock on the data file across threads and processes.
+        """
+        with self._write_lock:
+            with file_lock(self.path):
+                yield
+
+    def _atomic_write(self, data):
+        """
+        Write data via a fsync'ed temp file and an atomic rename,
+        so readers never see a partially written file.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            mode = stat.S_IMODE(os.stat(self.path).st_mode)
+        except FileNotFoundError:
+            mode = DEFAULT_FILE_MODE
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.user_inputs.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates the file readable by the owner only
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        if fcntl:
+            # Persist the rename itself (not supported for directories on Windows)
+            dir_fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def load(self, namespace):
+        signature = self._file_signature()
+        with self._cache_lock:
+            if signature == self._signature:
+                self._stats['hits'] += 1
+                return self._data
+            self._stats['misses'] += 1
+            data = self._read_file() if signature is not None else {}
+            self._signature = signature
+            self._data = data
+            return data
+
+    def update(self, namespace, values):
+        # Re-read under the lock so concurrent writers don't lose each other's updates
+        with self._file_lock():
+            data = self._read_file(for_update=True)
+            data.update(values)
+            self._atomic_write(data)
+            self._store_cache(data)
+
+    def replace(self, namespace, values):
+        with self._file_lock():
+            self._atomic_write(values)
+            self._store_cache(dict(values))
+
+    def clear(self, namespace):
+        with self._file_lock():
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        self._invalidate_cache()
+
+    def stored_namespace(self, namespace):
+        return self.SHARED_NAMESPACE
+
+    def get_stats(self):
+        with self._cache_lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._cache_lock:
+            self._stats = {'hits': 0, 'misses': 0}
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    SQLite database in WAL mode with one row per (namespace, key).
+
+    Connections are kept in a per-process pool and shared between threads;
+    all statements are constant, parameterized SQL so sqlite3 reuses its
+    prepared statements. Reads are cached per namespace: a write drops its
+    namespace, and writes by other connections and processes are detected with
+    `PRAGMA data_version` on a dedicated connection, which drops the whole
+    cache.
+    """
+
+    _SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS user_inputs ('
+        'namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, '
+        'PRIMARY KEY (namespace, key)) WITHOUT ROWID'
+    )
+    _SELECT = 'SELECT key, value FROM user_inputs WHERE namespace = ?'
+    _UPSERT = (
+        'INSERT INTO user_inputs (namespace, key, value) VALUES (?, ?, ?) '
+        'ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value'
+    )
+    _DELETE = 'DELETE FROM user_inputs WHERE namespace = ?'
+
+    def __init__(self, path, pool_size=8, timeout=5.0):
+        self.path = path
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._created = 0
+        self._pool_lock = threading.Lock()
+        self._stats = {'hits': 0, 'queries': 0, 'writes': 0, 'connections': 0}
+        self._cache = {}
+        self._data_version = None
+        self._cache_lock = threading.Lock()
+        with self._connection() as conn:
+            conn.execute(self._SCHEMA)
+        # Only reads data_version, which changes whenever any other connection commits
+        self._monitor = self._connect()
+
+    def _current_data_version(self):
+        """
+        Must be called while holding the cache lock.
+        """
+        return self._monitor.execute('PRAGMA data_version').fetchone()[0]
+
+    def _written(self, namespace):
+        """
+        Drop the cached values of a namespace after writing it, and count the write.
+        """
+        with self._cache_lock:
+            self._cache.pop(namespace, None)
+            self._stats['writes'] += 1
+
+    def _connect(self):
+        """
+        Open a new connection configured for concurrent use.
+        """
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False,
+                               isolation_level=None, cached_statements=32)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """
+        Borrow a connection from the pool, opening one if the pool isn't full yet.
+
+        Raises:
+            sqlite3.OperationalError: If no connection could be opened, or none was returned
+                to the full pool within the timeout
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_create = self._created < self._pool.maxsize
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    conn = self._connect()
+                except BaseException:
+                    # Free the slot, or failed attempts would use up the pool for good
+                    with self._pool_lock:
+                        self._created -= 1
+                    raise
+                with self._cache_lock:
+                    self._stats['connections'] += 1
+            else:
+                try:
+                    conn = self._pool.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError(
+                        f"No database connection became free within {self.timeout} s") from None
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def load(self, namespace):
+        with self._cache_lock:
+            version = self._current_data_version()
+            if version != self._data_version:
+                self._cache = {}
+                self._data_version = version
+            elif namespace in self._cache:
+                self._stats['hits'] += 1
+                return self._cache[namespace]
+        with self._connection() as conn:
+            rows = conn.execute(self._SELECT, (namespace,)).fetchall()
+        data = {key: json.loads(value) for key, value in rows}
+        with self._cache_lock:
+            self._stats['queries'] += 1
+            # A commit since the version was read invalidates this result at the next load
+            if version == self._data_version:
+                self._cache[namespace] = data
+        return data
+
+    def update(self, namespace, values):
+        rows = [(namespace, key, json.dumps(value)) for key, value in values.items()]
+        with self._connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany(self._UPSERT, rows)
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        self._written(namespace)
+
+    def replace(self, namespace, values):
+        rows = [(namespace, key, json.dumps(value)) for key, value in values.items()]
+        with self._connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(self._DELETE, (namespace,))
+                conn.executemany(self._UPSERT, rows)
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        self._written(namespace)
+
+    def clear(self, namespace):
+        with self._connection() as conn:
+            conn.execute(self._DELETE, (namespace,))
+        self._written(namespace)
+
+    def get_stats(self):
+        with self._cache_lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._cache_lock:
+            self._stats = {'hits': 0, 'queries': 0, 'writes': 0, 'connections': self._created}